@@ -0,0 +1,183 @@
+"""
+CODEF 게이트웨이 비동기 서버 (testflask.py 와 같은 라우트)
+
+Flask 서버는 요청마다 스레드 하나가 upstream 응답을 기다리며 묶이지만,
+이 서버는 httpx.AsyncClient 와 asyncio.sleep 을 사용해 느린 CODEF 호출 수천 개를
+한 프로세스의 이벤트 루프에서 동시에 기다린다.
+
+실행:
+    python async_gateway.py [--host 0.0.0.0] [--port 5000] [--workers 1]
+"""
+import argparse
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # orjson 은 선택 의존성
+    orjson = None
+
+# 라우트가 반환하는 JSON 응답 클래스 (orjson 이 있으면 ORJSONResponse)
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# 검색 서버와 같이 쓰는 지표/로그/지연 기록 모듈 (Back/common, codef_pipeline 도 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from codef_async import AsyncCodefClient
+from codef_pipeline import AsyncRunner, CodefPipeline, PipelineStats
+from codef_result_cache import ResultCache
+import codef_routes
+
+from metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware  # noqa: E402
+from service_log import AccessLog, setup_logging  # noqa: E402
+import codef_metrics  # noqa: E402
+
+# .env 파일 로드
+load_dotenv()
+
+# JSON 한 줄 로그 (요청 로그는 표본 추출)
+logger = setup_logging('codef-gateway')
+
+# 환경변수에서 설정 로드
+CLIENT_ID = os.getenv('CODEF_CLIENT_ID')
+CLIENT_SECRET = os.getenv('CODEF_CLIENT_SECRET')
+PUBLIC_KEY = os.getenv('CODEF_PUBLIC_KEY')
+
+# 더미 모드 설정
+USE_DUMMY_MODE = os.getenv('USE_CODEF_DUMMY', 'true').lower() == 'true'
+
+# 환경변수 검증 (더미 모드가 아닐 때만)
+if not USE_DUMMY_MODE and not all([CLIENT_ID, CLIENT_SECRET, PUBLIC_KEY]):
+    raise Exception("필요한 환경변수가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+
+# 다계좌 잔고 조회 동시 실행 수 (요청당 최대 계좌 수는 codef_routes.MAX_BALANCE_ACCOUNTS)
+BALANCE_FANOUT = int(os.getenv('BALANCE_FANOUT', '8'))
+
+codef = AsyncCodefClient.from_env(CLIENT_ID, CLIENT_SECRET)
+
+# 계정 연동 파이프라인 단계별 처리 시간과 연동 후 첫 포트폴리오까지의 시간
+pipeline_stats = PipelineStats()
+
+# 잔고/계좌 목록 조회 결과 캐시 (testflask.py 와 같은 설정)
+result_cache = ResultCache(
+    max_entries=int(os.getenv('CODEF_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('CODEF_CACHE_TTL', '30'))
+)
+
+# upstream 호출 시간, 토큰 발급 수, 캐시/파이프라인 집계를 /metrics 에 연결
+codef_metrics.register(codef, result_cache, pipeline_stats)
+
+# 계정 생성/계좌 목록/잔고 조회 단계 (testflask.py 와 같은 구현을 이벤트 루프에서 실행)
+pipeline = CodefPipeline(PUBLIC_KEY, result_cache, pipeline_stats, dummy_mode=USE_DUMMY_MODE)
+runner = AsyncRunner(codef, BALANCE_FANOUT)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await codef.aclose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=DefaultJSONResponse)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# 라우트별 처리 시간 (CORS 처리까지 포함하도록 가장 바깥에 추가)
+app.add_middleware(MetricsMiddleware, access_log=AccessLog(logger))
+
+
+def error(message, status_code, **extra):
+    return DefaultJSONResponse({'error': message, **extra}, status_code=status_code)
+
+
+async def respond(request, route):
+    """공용 라우트 처리(codef_routes)를 요청 본문으로 실행해 JSON 응답으로 변환"""
+    try:
+        data = await request.json()
+    except Exception as e:
+        return error(str(e), 500)
+
+    body, status = await runner.run(route(pipeline, data))
+    return DefaultJSONResponse(body, status_code=status)
+
+
+@app.post('/create_account')
+async def create_account(request: Request):
+    return await respond(request, codef_routes.create_account)
+
+
+@app.delete('/delete_account')
+async def delete_account(request: Request):
+    return await respond(request, codef_routes.delete_account)
+
+
+@app.post('/stock/account-list')
+async def get_stock_account_list(request: Request):
+    return await respond(request, codef_routes.get_stock_account_list)
+
+
+@app.post('/stock/balance')
+async def stock_balance(request: Request):
+    return await respond(request, codef_routes.stock_balance)
+
+
+@app.post('/stock/balances')
+async def stock_balances(request: Request):
+    """여러 계좌 잔고를 동시에 조회해 하나의 포트폴리오로 합쳐 반환 (testflask.py 와 같은 응답)"""
+    return await respond(request, codef_routes.stock_balances)
+
+
+@app.post('/stock/create-and-list')
+async def create_account_and_list(request: Request):
+    return await respond(request, codef_routes.create_account_and_list)
+
+
+@app.get('/cache/status')
+async def get_cache_status():
+    return result_cache.stats()
+
+
+@app.get('/pipeline/status')
+async def get_pipeline_status():
+    return pipeline_stats.snapshot()
+
+
+@app.get('/metrics')
+async def get_metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+# 더미 모드 상태 확인 및 제어 엔드포인트
+@app.get('/dummy-mode/status')
+async def get_dummy_mode_status():
+    return codef_routes.dummy_mode_status(pipeline)
+
+
+@app.post('/dummy-mode/toggle')
+async def toggle_dummy_mode():
+    return codef_routes.toggle_dummy_mode(pipeline)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CODEF 게이트웨이 비동기 서버')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_CONCURRENCY', '1')))
+    args = parser.parse_args()
+
+    logger.info(f"비동기 서버 시작 - 더미 모드: {'활성화' if USE_DUMMY_MODE else '비활성화'}")
+    if args.workers > 1:
+        uvicorn.run('async_gateway:app', host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,186 @@
+"""
+CODEF API 비동기 클라이언트 (async_gateway 용)
+
+CodefClient 와 같은 규칙(타임아웃, 조회성 호출만 재시도, 토큰 캐시, 401 시 한 번 재발급)을
+httpx.AsyncClient 위에서 구현해 upstream 응답을 기다리는 동안 이벤트 루프를 막지 않는다.
+"""
+import asyncio
+import os
+import time
+
+import httpx
+
+from codef_client import (
+    CODEF_OAUTH_URL, CODEF_API_URL, ENDPOINT_NAMES, TOKEN_PATH, RETRY_STATUS, is_token_rejected
+)
+
+
+class AsyncTokenManager:
+    """TokenManager 의 asyncio 버전 (이벤트 루프 하나에서 공유)
+
+    - 만료 refresh_margin 초 전까지는 캐시된 토큰을 그대로 반환
+    - 만료 refresh_ahead 초 전(최대 토큰 수명의 절반)부터는 토큰을 반환하면서 백그라운드 갱신 태스크를 한 번만 시작
+    - 토큰이 없으면 asyncio.Lock 으로 발급을 한 번만 수행하고 대기 중인 요청은 결과를 공유
+    """
+
+    def __init__(self, client, refresh_margin=60, refresh_ahead=600):
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self.refresh_ahead = refresh_ahead
+        self.fetch_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task = None
+
+    def _usable(self, now):
+        return self._token is not None and now < self._expires_at - self.refresh_margin
+
+    async def _fetch(self):
+        # self._lock 을 잡은 상태에서 호출
+        try:
+            token_data = await self.client.request_token()
+        except Exception:
+            self.error_count += 1
+            raise
+        if 'access_token' not in token_data:
+            self.error_count += 1
+            raise Exception("토큰 발급 실패: " + str(token_data))
+
+        self._token = token_data['access_token']
+        lifetime = float(token_data.get('expires_in', 3600))
+        self._expires_at = time.monotonic() + lifetime
+        # 수명이 짧은 토큰은 발급 직후부터 매 요청이 갱신을 시작하지 않도록 수명의 절반까지만 당긴다
+        self._refresh_at = self._expires_at - min(self.refresh_ahead, lifetime / 2)
+        self.fetch_count += 1
+        self.last_error = None
+        return self._token
+
+    async def get(self):
+        """유효한 액세스 토큰 반환 (발급 실패 시 예외)"""
+        now = time.monotonic()
+        if self._usable(now):
+            if now >= self._refresh_at and self._refresh_task is None:
+                self._refresh_task = asyncio.create_task(self._background_refresh())
+            return self._token
+
+        async with self._lock:
+            # 잠금을 기다리는 동안 다른 요청이 이미 발급했을 수 있다
+            if self._usable(time.monotonic()):
+                return self._token
+            return await self._fetch()
+
+    def invalidate(self, token):
+        """upstream 이 거부한 토큰을 버린다 (이미 새 토큰으로 바뀌었으면 무시)"""
+        if self._token == token:
+            self._token = None
+            self._expires_at = 0.0
+            self._refresh_at = 0.0
+
+    async def _background_refresh(self):
+        try:
+            async with self._lock:
+                if time.monotonic() >= self._refresh_at:
+                    await self._fetch()
+        except Exception as e:
+            # 현재 토큰은 아직 유효하므로 다음 요청에서 다시 시도
+            self.last_error = str(e)
+        finally:
+            self._refresh_task = None
+
+
+class AsyncCodefClient:
+    """CODEF 호출용 비동기 커넥션 풀 클라이언트"""
+
+    def __init__(self, client_id, client_secret,
+                 oauth_url=CODEF_OAUTH_URL, api_url=CODEF_API_URL,
+                 pool_size=100, connect_timeout=3.05, read_timeout=30.0,
+                 max_retries=2, backoff=0.3):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.oauth_url = oauth_url.rstrip('/')
+        self.api_url = api_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        # 이벤트 루프 하나가 공유하는 커넥션 풀 (pool_size 를 넘는 요청은 풀 자리를 기다린다)
+        self.http = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.tokens = AsyncTokenManager(self)
+        self.on_call = None
+
+    @classmethod
+    def from_env(cls, client_id, client_secret):
+        """환경변수(CODEF_ASYNC_POOL_SIZE 등)로 설정한 클라이언트 생성"""
+        return cls(
+            client_id, client_secret,
+            pool_size=int(os.getenv('CODEF_ASYNC_POOL_SIZE', '100')),
+            connect_timeout=float(os.getenv('CODEF_CONNECT_TIMEOUT', '3.05')),
+            read_timeout=float(os.getenv('CODEF_READ_TIMEOUT', '30')),
+            max_retries=int(os.getenv('CODEF_MAX_RETRIES', '2')),
+            backoff=float(os.getenv('CODEF_RETRY_BACKOFF', '0.3')),
+        )
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    def _observe(self, path, started, outcome):
+        if self.on_call is not None:
+            self.on_call(ENDPOINT_NAMES.get(path, 'other'), time.perf_counter() - started, outcome)
+
+    async def _request(self, base_url, path, idempotent, **kwargs):
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            started = time.perf_counter()
+            try:
+                response = await self.http.post(base_url + path, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                self._observe(path, started, type(e).__name__)
+                if last:
+                    raise
+            else:
+                self._observe(path, started, response.status_code)
+                if response.status_code not in RETRY_STATUS or last:
+                    return response
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+
+    async def request_token(self):
+        """client credentials 토큰 발급 응답(dict)"""
+        response = await self._request(
+            self.oauth_url, TOKEN_PATH,
+            idempotent=True,
+            auth=(self.client_id, self.client_secret),  # Basic Auth
+            data={'grant_type': 'client_credentials'},
+        )
+        return response.json()
+
+    async def access_token(self):
+        """캐시된 액세스 토큰 (필요할 때만 발급)"""
+        return await self.tokens.get()
+
+    async def post(self, path, payload, access_token=None, idempotent=False):
+        """CODEF API 호출 (상태를 바꾸는 호출은 idempotent=False)
+
+        캐시된 토큰이 거부되면 새 토큰으로 한 번만 다시 호출한다.
+        """
+        if access_token is None:
+            access_token = await self.tokens.get()
+
+        for attempt in range(2):
+            response = await self._request(
+                self.api_url, path,
+                idempotent=idempotent,
+                headers={'Authorization': f'Bearer {access_token}'},
+                json=payload,
+            )
+            if attempt == 1 or not is_token_rejected(response):
+                return response
+            self.tokens.invalidate(access_token)
+            access_token = await self.tokens.get()
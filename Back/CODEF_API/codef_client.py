@@ -0,0 +1,227 @@
+"""
+CODEF API 공용 클라이언트
+
+- requests.Session 하나를 공유해 oauth.codef.io / development.codef.io 연결을 keep-alive 로 재사용
+- 모든 호출에 connect/read timeout 적용
+- 조회성(멱등) 호출만 연결 오류/5xx 에서 지수 백오프로 재시도
+- 액세스 토큰은 만료 직전까지 캐시하고 만료가 가까워지면 백그라운드에서 한 번만 갱신
+- CODEF_OAUTH_URL / CODEF_API_URL 로 로컬 대체 서버를 가리킬 수 있음
+- on_call 콜백으로 upstream 호출(재시도 포함)마다 (경로 이름, 소요 초, 상태 코드 또는 오류 이름) 를 받을 수 있음
+"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CODEF_OAUTH_URL = os.getenv('CODEF_OAUTH_URL', 'https://oauth.codef.io')
+CODEF_API_URL = os.getenv('CODEF_API_URL', 'https://development.codef.io')
+
+# CODEF API 경로
+TOKEN_PATH = '/oauth/token'
+ACCOUNT_CREATE_PATH = '/v1/account/create'
+ACCOUNT_DELETE_PATH = '/v1/account/delete'
+STOCK_ACCOUNT_LIST_PATH = '/v1/kr/stock/a/account/account-list'
+STOCK_BALANCE_PATH = '/v1/kr/stock/a/account/balance-inquiry'
+
+# 지표/로그에 쓰는 CODEF 경로 이름
+ENDPOINT_NAMES = {
+    TOKEN_PATH: 'token',
+    ACCOUNT_CREATE_PATH: 'create',
+    ACCOUNT_DELETE_PATH: 'delete',
+    STOCK_ACCOUNT_LIST_PATH: 'list',
+    STOCK_BALANCE_PATH: 'balance',
+}
+
+# 재시도할 응답 상태 코드
+RETRY_STATUS = frozenset({502, 503, 504})
+
+
+class TokenManager:
+    """client credentials 액세스 토큰 캐시 (스레드 안전)
+
+    - 만료 refresh_margin 초 전까지는 캐시된 토큰을 그대로 반환
+    - 만료 refresh_ahead 초 전(최대 토큰 수명의 절반)부터는 토큰을 반환하면서 백그라운드 갱신을 한 번만 시작
+    - 토큰이 없거나 거의 만료되었으면 잠금을 잡고 발급, 동시에 들어온 요청은 그 결과를 공유
+    """
+
+    def __init__(self, client, refresh_margin=60, refresh_ahead=600):
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self.refresh_ahead = refresh_ahead
+        self.fetch_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_flag_lock = threading.Lock()
+        self._refreshing = False
+
+    def _usable(self, now):
+        return self._token is not None and now < self._expires_at - self.refresh_margin
+
+    def _fetch(self):
+        # self._lock 을 잡은 상태에서 호출
+        try:
+            token_data = self.client.request_token()
+        except Exception:
+            self.error_count += 1
+            raise
+        if 'access_token' not in token_data:
+            self.error_count += 1
+            raise Exception("토큰 발급 실패: " + str(token_data))
+
+        self._token = token_data['access_token']
+        lifetime = float(token_data.get('expires_in', 3600))
+        self._expires_at = time.monotonic() + lifetime
+        # 수명이 짧은 토큰은 발급 직후부터 매 요청이 갱신을 시작하지 않도록 수명의 절반까지만 당긴다
+        self._refresh_at = self._expires_at - min(self.refresh_ahead, lifetime / 2)
+        self.fetch_count += 1
+        self.last_error = None
+        return self._token
+
+    def get(self):
+        """유효한 액세스 토큰 반환 (발급 실패 시 예외)"""
+        now = time.monotonic()
+        token = self._token
+        if self._usable(now):
+            if now >= self._refresh_at:
+                self._refresh_in_background()
+            return token
+
+        with self._lock:
+            # 잠금을 기다리는 동안 다른 요청이 이미 발급했을 수 있다
+            if self._usable(time.monotonic()):
+                return self._token
+            return self._fetch()
+
+    def invalidate(self, token):
+        """upstream 이 거부한 토큰을 버린다 (이미 새 토큰으로 바뀌었으면 무시)"""
+        with self._lock:
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+                self._refresh_at = 0.0
+
+    def _refresh_in_background(self):
+        # 발급 중인 self._lock 을 기다리지 않도록 별도 잠금으로 중복 시작만 막는다
+        with self._refresh_flag_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name='codef-token-refresh', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            with self._lock:
+                if time.monotonic() >= self._refresh_at:
+                    self._fetch()
+        except Exception as e:
+            # 현재 토큰은 아직 유효하므로 다음 요청에서 다시 시도
+            self.last_error = str(e)
+        finally:
+            self._refreshing = False
+
+
+def is_token_rejected(response):
+    """upstream 이 액세스 토큰을 거부한 응답인지 여부"""
+    return response.status_code == 401 or b'invalid_token' in response.content[:200]
+
+
+class CodefClient:
+    """CODEF 호출용 커넥션 풀 클라이언트 (스레드 간 공유 가능)"""
+
+    def __init__(self, client_id, client_secret,
+                 oauth_url=CODEF_OAUTH_URL, api_url=CODEF_API_URL,
+                 pool_size=10, connect_timeout=3.05, read_timeout=30.0,
+                 max_retries=2, backoff=0.3):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.oauth_url = oauth_url.rstrip('/')
+        self.api_url = api_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.tokens = TokenManager(self)
+        self.on_call = None
+
+    @classmethod
+    def from_env(cls, client_id, client_secret):
+        """환경변수(CODEF_POOL_SIZE 등)로 설정한 클라이언트 생성"""
+        return cls(
+            client_id, client_secret,
+            pool_size=int(os.getenv('CODEF_POOL_SIZE', '10')),
+            connect_timeout=float(os.getenv('CODEF_CONNECT_TIMEOUT', '3.05')),
+            read_timeout=float(os.getenv('CODEF_READ_TIMEOUT', '30')),
+            max_retries=int(os.getenv('CODEF_MAX_RETRIES', '2')),
+            backoff=float(os.getenv('CODEF_RETRY_BACKOFF', '0.3')),
+        )
+
+    def _observe(self, path, started, outcome):
+        if self.on_call is not None:
+            self.on_call(ENDPOINT_NAMES.get(path, 'other'), time.perf_counter() - started, outcome)
+
+    def _request(self, base_url, path, idempotent, **kwargs):
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            started = time.perf_counter()
+            try:
+                response = self.session.post(base_url + path, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._observe(path, started, type(e).__name__)
+                if last:
+                    raise
+            else:
+                self._observe(path, started, response.status_code)
+                if response.status_code not in RETRY_STATUS or last:
+                    return response
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def request_token(self):
+        """client credentials 토큰 발급 응답(dict)"""
+        response = self._request(
+            self.oauth_url, TOKEN_PATH,
+            idempotent=True,
+            auth=(self.client_id, self.client_secret),  # Basic Auth
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            data={'grant_type': 'client_credentials'},
+        )
+        return response.json()
+
+    def access_token(self):
+        """캐시된 액세스 토큰 (필요할 때만 발급)"""
+        return self.tokens.get()
+
+    def post(self, path, payload, access_token=None, idempotent=False):
+        """CODEF API 호출 (계정 생성/삭제처럼 상태를 바꾸는 호출은 idempotent=False)
+
+        캐시된 토큰이 거부되면 새 토큰으로 한 번만 다시 호출한다.
+        """
+        if access_token is None:
+            access_token = self.tokens.get()
+
+        for attempt in range(2):
+            response = self._request(
+                self.api_url, path,
+                idempotent=idempotent,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Authorization': f'Bearer {access_token}'
+                },
+                json=payload,
+            )
+            if attempt == 1 or not is_token_rejected(response):
+                return response
+            self.tokens.invalidate(access_token)
+            access_token = self.tokens.get()
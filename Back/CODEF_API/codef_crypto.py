@@ -0,0 +1,56 @@
+"""
+CODEF 비밀번호 RSA 암호화
+
+공개키는 기동 시 한 번만 파싱해 두고 요청마다 PKCS1 v1.5 암호화만 수행한다.
+실패하면 None 대신 EncryptionError 를 던져 평문/None 이 upstream 으로 전달되지 않게 한다.
+"""
+import base64
+
+from Crypto.PublicKey import RSA
+from Crypto.Cipher import PKCS1_v1_5 as Cipher_PKCS1_v1_5
+
+
+class EncryptionError(Exception):
+    """암호화 실패 (HTTP 상태 코드와 오류 코드 포함)"""
+
+    def __init__(self, message, code='ENCRYPTION_FAILED', status=500):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+
+    def to_dict(self):
+        return {
+            'error': '비밀번호 암호화 실패',
+            'code': self.code,
+            'detail': self.message
+        }
+
+
+class RSAEncryptor:
+    """base64 DER 공개키로 만든 재사용 가능한 암호화기 (스레드 간 공유 가능)"""
+
+    def __init__(self, public_key):
+        if not public_key:
+            raise EncryptionError('공개키가 설정되지 않았습니다.', code='ENCRYPTION_KEY_MISSING')
+        try:
+            key = RSA.importKey(base64.b64decode(public_key))
+        except (ValueError, IndexError, TypeError) as e:
+            raise EncryptionError(f'공개키를 읽을 수 없습니다: {e}', code='ENCRYPTION_KEY_INVALID')
+
+        self._cipher = Cipher_PKCS1_v1_5.new(key)
+        # PKCS1 v1.5 로 한 번에 암호화할 수 있는 최대 바이트 수
+        self.max_length = key.size_in_bytes() - 11
+
+    def encrypt(self, data):
+        """문자열을 암호화해 base64 문자열로 반환"""
+        if not isinstance(data, str) or not data:
+            raise EncryptionError('암호화할 값이 비어 있거나 문자열이 아닙니다.',
+                                  code='ENCRYPTION_INPUT_INVALID', status=400)
+
+        raw = data.encode()
+        if len(raw) > self.max_length:
+            raise EncryptionError('암호화할 값이 너무 깁니다.',
+                                  code='ENCRYPTION_INPUT_INVALID', status=400)
+
+        return base64.b64encode(self._cipher.encrypt(raw)).decode('utf-8')
@@ -0,0 +1,106 @@
+"""
+CODEF 더미 모드 데이터 (동기/비동기 게이트웨이 공용)
+"""
+import asyncio
+import os
+import time
+
+from codef_payloads import normalize_numbers
+
+# 더미 모드에서 API 호출을 흉내 내는 지연 시간(초)
+DUMMY_DELAY = float(os.getenv('CODEF_DUMMY_DELAY', '0.5'))
+
+# 더미 데이터 정의
+DUMMY_ACCOUNT_LISTS = {
+    '0247': ['20901920648'],  # NH투자증권
+    '1247': ['20901920648'],  # NH투자증권 모바일증권 나무  
+    '0240': ['716229952301']  # 삼성증권
+}
+
+DUMMY_BALANCE_DATA = {
+    '20901920648': {
+        'result': {
+            'code': 'CF-00000',
+            'message': '성공'
+        },
+        'data': {
+            'resAccount': '20901920648',
+            'resAccountName': 'NH투자증권 계좌',
+            'rsTotAmt': '1,250,000',
+            'resDepositReceived': '150,000',
+            'resItemList': [
+                {
+                    'resIsName': '삼성전자',
+                    'resPrice': '72,500',
+                    'resQuantity': '10',
+                    'resAmount': '725,000',
+                    'resAvailQuantity': '10'
+                },
+                {
+                    'resIsName': 'LG에너지솔루션',
+                    'resPrice': '425,000',
+                    'resQuantity': '1',
+                    'resAmount': '425,000', 
+                    'resAvailQuantity': '1'
+                }
+            ]
+        }
+    },
+    '716229952301': {
+        'result': {
+            'code': 'CF-00000',
+            'message': '성공'
+        },
+        'data': {
+            'resAccount': '716229952301',
+            'resAccountName': '삼성증권 계좌',
+            'rsTotAmt': '2,340,000',
+            'resDepositReceived': '340,000',
+            'resItemList': [
+                {
+                    'resIsName': 'SK하이닉스',
+                    'resPrice': '125,000',
+                    'resQuantity': '8', 
+                    'resAmount': '1,000,000',
+                    'resAvailQuantity': '8'
+                },
+                {
+                    'resIsName': 'NAVER',
+                    'resPrice': '200,000',
+                    'resQuantity': '5',
+                    'resAmount': '1,000,000',
+                    'resAvailQuantity': '5'
+                }
+            ]
+        }
+    }
+}
+
+
+# 실제 응답과 같은 모양이 되도록 금액/수량 필드를 숫자로 변환
+for _balance in DUMMY_BALANCE_DATA.values():
+    normalize_numbers(_balance)
+
+
+def dummy_balance(account):
+    """해당 계좌의 더미 잔고 데이터, 없으면 기본 데이터"""
+    return DUMMY_BALANCE_DATA.get(account, DUMMY_BALANCE_DATA['20901920648'])
+
+
+def dummy_account_list(organization):
+    """증권사에 따른 더미 계좌 목록"""
+    return DUMMY_ACCOUNT_LISTS.get(organization, ['20901920648'])
+
+
+def dummy_connected_id():
+    return f'dummy_conn_{int(time.time())}'
+
+
+def simulate_api_delay():
+    """API 호출을 시뮬레이션하기 위한 지연"""
+    time.sleep(DUMMY_DELAY)
+
+
+async def simulate_api_delay_async():
+    """이벤트 루프를 막지 않는 simulate_api_delay"""
+    await asyncio.sleep(DUMMY_DELAY)
@@ -0,0 +1,67 @@
+"""
+CODEF 게이트웨이 지표 (testflask.py / async_gateway.py 공용)
+
+Back/common/metrics.py 의 기본 레지스트리에 다음을 등록한다.
+
+- codef_upstream_duration_seconds{endpoint,outcome}: upstream 호출 시간 (재시도는 호출마다 기록)
+- codef_token_fetches_total / codef_token_errors_total: 액세스 토큰 발급/실패 횟수
+- codef_result_cache_*: 잔고/계좌 목록 결과 캐시 크기, 적중/미스/병합 수, 적중률
+- codef_pipeline_*: 계정 연동 수, 잔고 미리 조회 결과, 단계별 p50/p99
+- log_records_dropped_total: 로그 큐가 가득 차 버린 레코드 수
+
+게이트웨이는 이 모듈을 import 하기 전에 Back/common 을 sys.path 에 넣는다.
+"""
+from metrics import REGISTRY
+from service_log import dropped_count
+
+UPSTREAM_DURATION = REGISTRY.histogram(
+    'codef_upstream_duration_seconds', 'CODEF upstream 호출 시간 (재시도 포함 호출마다)',
+    ('endpoint', 'outcome')
+)
+
+
+def observe_upstream(endpoint, seconds, outcome):
+    """CodefClient/AsyncCodefClient.on_call 콜백 (outcome 은 상태 코드 또는 예외 이름)"""
+    UPSTREAM_DURATION.observe(seconds, endpoint, str(outcome))
+
+
+def _stage_quantiles(pipeline_stats):
+    values = {}
+    for stage, snapshot in pipeline_stats.snapshot()['stages'].items():
+        for quantile, key in (('0.5', 'p50Ms'), ('0.99', 'p99Ms')):
+            if snapshot[key] is not None:
+                values[(stage, quantile)] = snapshot[key] / 1000
+    return values
+
+
+def register(codef, result_cache, pipeline_stats):
+    """게이트웨이 객체들을 지표에 연결 (프로세스마다 한 번 호출)"""
+    codef.on_call = observe_upstream
+
+    REGISTRY.callback('codef_token_fetches_total', '액세스 토큰 발급 횟수',
+                      lambda: codef.tokens.fetch_count, kind='counter')
+    REGISTRY.callback('codef_token_errors_total', '액세스 토큰 발급 실패 횟수',
+                      lambda: codef.tokens.error_count, kind='counter')
+
+    REGISTRY.callback('codef_result_cache_entries', '결과 캐시 항목 수',
+                      lambda: result_cache.stats()['size'])
+    REGISTRY.callback('codef_result_cache_lookups_total', '결과 캐시 조회 수 (hit/miss/coalesced)',
+                      lambda: {('hit',): result_cache.hits, ('miss',): result_cache.misses,
+                               ('coalesced',): result_cache.coalesced},
+                      labels=('result',), kind='counter')
+    REGISTRY.callback('codef_result_cache_evictions_total', '결과 캐시에서 밀려난 항목 수',
+                      lambda: result_cache.evictions, kind='counter')
+    REGISTRY.callback('codef_result_cache_hit_ratio', '결과 캐시 적중률',
+                      lambda: result_cache.stats()['hitRatio'])
+
+    REGISTRY.callback('codef_pipeline_links_total', '계정 연동 수',
+                      lambda: pipeline_stats.links, kind='counter')
+    REGISTRY.callback('codef_pipeline_prefetch_total', '연동 후 잔고 미리 조회 수 (success/failure)',
+                      lambda: {('success',): pipeline_stats.prefetched - pipeline_stats.prefetch_failures,
+                               ('failure',): pipeline_stats.prefetch_failures},
+                      labels=('result',), kind='counter')
+    REGISTRY.callback('codef_pipeline_stage_seconds', '연동 단계별 최근 처리 시간 분위수',
+                      lambda: _stage_quantiles(pipeline_stats), labels=('stage', 'quantile'))
+
+    REGISTRY.callback('log_records_dropped_total', '로그 큐가 가득 차 버린 레코드 수',
+                      dropped_count, kind='counter')
@@ -0,0 +1,156 @@
+"""
+CODEF 요청 payload 생성과 응답 해석 (동기/비동기 게이트웨이 공용)
+
+HTTP 클라이언트나 웹 프레임워크에 의존하지 않는 순수 함수만 둔다.
+"""
+import json
+import re
+import urllib.parse
+
+try:
+    import orjson
+except ImportError:  # orjson 은 선택 의존성
+    orjson = None
+
+SUCCESS_CODE = 'CF-00000'
+
+# 천 단위 구분자가 들어간 문자열로 내려오는 금액/수량 필드 (숫자로 변환해 응답)
+# 계좌번호(resAccount)처럼 숫자처럼 보이는 식별자는 포함하지 않는다
+NUMERIC_FIELDS = frozenset({
+    'rsTotAmt', 'rsTotValAmt', 'rsCurValAmt', 'resAccountTotalAmt', 'resAccountBalance',
+    'resDepositReceived', 'resDepositReceivedD1', 'resDepositReceivedD2', 'resDepositReceivedF',
+    'resCashBalance', 'resPrice', 'resCurrentPrice', 'resAmount', 'resQuantity',
+    'resAvailQuantity', 'resValuationAmt', 'resValuationPL', 'resEvaluation',
+    'resAvgPresentAmt', 'resPurchaseAmount', 'resEarningsRate',
+})
+
+_DECIMAL = re.compile(r'[+-]?\d+(?:\.\d+)?', re.ASCII)
+
+# 라우트별 필수 필드
+CREATE_ACCOUNT_FIELDS = ('id', 'password', 'organization')
+ACCOUNT_LIST_FIELDS = ('organization', 'connectedId')
+BALANCE_FIELDS = ('organization', 'connectedId', 'account', 'account_password')
+
+
+def missing_field(data, fields):
+    """data 에 없는 첫 번째 필수 필드 이름 (모두 있으면 None)"""
+    for field in fields:
+        if field not in data:
+            return field
+    return None
+
+
+def to_number(value):
+    """'1,250,000' / '-3.5' 같은 숫자 문자열을 int/float 로, 그 외 값은 그대로 반환"""
+    if not isinstance(value, str):
+        return value
+    text = value.replace(',', '')
+    if text.isdigit() and text.isascii():
+        return int(text)
+    if _DECIMAL.fullmatch(text):
+        return float(text) if '.' in text else int(text)
+    return value
+
+
+def normalize_numbers(obj):
+    """NUMERIC_FIELDS 값을 제자리에서 숫자로 변환 (중첩된 dict/list 포함)"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in NUMERIC_FIELDS:
+                obj[key] = to_number(value)
+            elif isinstance(value, (dict, list)):
+                normalize_numbers(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            normalize_numbers(value)
+    return obj
+
+
+def unquote_bytes(body):
+    """%XX 퍼센트 인코딩을 푼 bytes (str 로 디코딩하지 않고 bytes 그대로 처리)"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if b'%' not in body:
+        return body
+    return urllib.parse.unquote_to_bytes(body)
+
+
+def decode_response(body):
+    """퍼센트 인코딩된 CODEF 응답 본문(bytes)을 dict 로 변환
+
+    문자열 디코딩(response.text) 없이 bytes 를 한 번만 unquote 해서 바로 파싱하고,
+    금액/수량 필드는 숫자로 바꿔 둔다.
+    """
+    raw = unquote_bytes(body)
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return normalize_numbers(data)
+
+
+def dumps(obj):
+    """obj 를 UTF-8 JSON bytes 로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def is_success(result):
+    return result.get('result', {}).get('code') == SUCCESS_CODE
+
+
+def extract_account_list(result):
+    """계좌 목록 조회 응답에서 계좌번호 목록 추출 (단일/여러 계좌 모두 처리)"""
+    data = result.get('data')
+    if not data:
+        return []
+    if isinstance(data, list):
+        # 여러 계좌인 경우
+        return [account['resAccount'] for account in data if 'resAccount' in account]
+    # 단일 계좌인 경우
+    return [data['resAccount']] if 'resAccount' in data else []
+
+
+def create_account_payload(data, encrypted_password):
+    return {
+        'accountList': [
+            {
+                'countryCode': "KR",
+                'businessType': 'ST',
+                'organization': data['organization'],
+                'loginType': '1',
+                'clientType': 'A',
+                'id': data['id'],
+                'password': encrypted_password
+            }
+        ]
+    }
+
+
+def delete_account_payload(data):
+    return {
+        'accountList': [{
+            'countryCode': 'KR',
+            'businessType': 'ST',
+            'clientType': 'A',
+            'organization': data['organization'],  # 클라이언트에서 전달받은 기관코드 사용
+            'loginType': '1'
+        }],
+        'connectedId': data['connectedId']
+    }
+
+
+def account_list_payload(organization, connected_id):
+    return {
+        'organization': organization,
+        'connectedId': connected_id
+    }
+
+
+def balance_payload(data, encrypted_password):
+    return {
+        'organization': data['organization'],
+        'connectedId': data['connectedId'],
+        'account': data['account'],
+        'account_password': encrypted_password,
+        'id': data.get('id', ''),  # 선택적 필드
+        'add_password': data.get('add_password', '')  # 선택적 필드
+    }
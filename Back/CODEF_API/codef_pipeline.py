@@ -0,0 +1,446 @@
+"""
+증권 계정 연동 파이프라인 (계정 생성 → 계좌 목록 → 잔고 미리 조회)
+
+동기(testflask.py) / 비동기(async_gateway.py) 게이트웨이가 같은 단계 구현을 쓰도록
+단계는 HTTP 클라이언트와 무관한 제너레이터로 작성한다. 토큰 발급, upstream 호출, 더미 지연,
+캐시 조회, 동시 실행이 필요한 자리에서는 연산(AccessToken, Post, Cached, Gather ...)을 yield 하고,
+게이트웨이별 어댑터가 그 연산을 실행해 결과를 yield 자리로 돌려준다 (실패하면 그 자리에서 예외).
+단계별 처리 시간은 Back/common/latency.py 의 LatencyRecorder 로 기록하므로
+게이트웨이는 이 모듈을 import 하기 전에 Back/common 을 sys.path 에 넣는다.
+
+- CodefPipeline: 계정 생성/계좌 목록/잔고 조회 단계와 연동 흐름(link_brokerage_account)
+- SyncRunner: Flask 용 어댑터 (CodefClient + 공용 스레드 풀)
+- AsyncRunner: FastAPI 용 어댑터 (AsyncCodefClient + asyncio 태스크)
+- link_balance_requests: 연동 요청과 계좌 목록으로 계좌별 잔고 조회 요청 생성
+- FirstPortfolioTimer: 연동 시작부터 첫 잔고(포트폴리오)가 준비될 때까지의 시간 기록
+- PipelineStats: 단계별 처리 시간(p50/p99)과 미리 조회 결과 집계
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from codef_client import ACCOUNT_CREATE_PATH, STOCK_ACCOUNT_LIST_PATH, STOCK_BALANCE_PATH
+from codef_crypto import RSAEncryptor, EncryptionError
+from codef_dummy import dummy_balance, simulate_api_delay, simulate_api_delay_async
+from codef_payloads import (
+    BALANCE_FIELDS, CREATE_ACCOUNT_FIELDS,
+    account_list_payload, balance_payload, create_account_payload,
+    decode_response, extract_account_list, is_success, missing_field
+)
+from codef_result_cache import account_list_key, balance_key, force_refresh_requested
+from latency import LatencyRecorder
+
+logger = logging.getLogger('codef-gateway')
+
+# 파이프라인 단계 이름
+STAGE_CREATE = 'create'
+STAGE_LIST = 'list'
+STAGE_BALANCE = 'balance'
+TIME_TO_FIRST_PORTFOLIO = 'timeToFirstPortfolio'
+
+# 단계가 yield 하는 연산과 어댑터가 돌려주는 값
+AccessToken = namedtuple('AccessToken', ())  # 캐시된 액세스 토큰
+Post = namedtuple('Post', ('path', 'payload', 'access_token', 'idempotent'), defaults=(False,))  # upstream 응답
+DummyDelay = namedtuple('DummyDelay', ())  # 더미 모드 지연 (None)
+Cached = namedtuple('Cached', ('cache', 'key', 'load', 'force_refresh'))  # 캐시 결과 또는 load() 단계 결과
+Gather = namedtuple('Gather', ('flows',))  # 단계들을 동시에 실행한 결과 목록 (순서 유지)
+Spawn = namedtuple('Spawn', ('flows',))  # 단계들을 백그라운드에서 시작한 핸들
+Join = namedtuple('Join', ('handle',))  # Spawn 한 단계들의 결과 목록 (순서 유지)
+
+
+class PipelineStats:
+    """연동 파이프라인 계측 (스레드 안전)"""
+
+    def __init__(self, size=1024):
+        self.stages = {
+            name: LatencyRecorder(size)
+            for name in (STAGE_CREATE, STAGE_LIST, STAGE_BALANCE, TIME_TO_FIRST_PORTFOLIO)
+        }
+        self.links = 0
+        self.prefetched = 0
+        self.prefetch_failures = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        self.stages[stage].record(seconds)
+
+    def count(self, prefetched=0, failures=0, links=0):
+        with self._lock:
+            self.links += links
+            self.prefetched += prefetched
+            self.prefetch_failures += failures
+
+    def snapshot(self):
+        return {
+            'links': self.links,
+            'prefetched': self.prefetched,
+            'prefetchFailures': self.prefetch_failures,
+            'stages': {name: recorder.snapshot() for name, recorder in self.stages.items()},
+        }
+
+
+class FirstPortfolioTimer:
+    """연동 하나에서 처음 성공한 잔고 조회 시점까지의 시간을 한 번만 기록"""
+
+    def __init__(self, stats, started):
+        self.stats = stats
+        self.started = started
+        self._done = False
+        self._lock = threading.Lock()
+
+    def balance_done(self, balance_started, result):
+        body, status = result
+        success = status == 200 and is_success(body)
+        now = time.perf_counter()
+        self.stats.record(STAGE_BALANCE, now - balance_started)
+        self.stats.count(prefetched=1, failures=0 if success else 1)
+        if not success:
+            return
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        self.stats.record(TIME_TO_FIRST_PORTFOLIO, now - self.started)
+
+
+def link_balance_requests(data, connected_id, accounts):
+    """연동 요청(data)의 계좌 비밀번호로 계좌별 잔고 조회 요청 목록 생성
+
+    계좌 비밀번호(account_password)가 없으면 잔고를 미리 조회할 수 없으므로 빈 목록.
+    """
+    if not data.get('account_password'):
+        return []
+    return [
+        {
+            'organization': data['organization'],
+            'connectedId': connected_id,
+            'account': account,
+            'account_password': data['account_password'],
+            'add_password': data.get('add_password', ''),
+        }
+        for account in accounts
+    ]
+
+
+class CodefPipeline:
+    """게이트웨이 공용 CODEF 호출 단계 (결과 캐시, 계측, 암호화기, 더미 모드 상태를 가짐)
+
+    단계 메서드는 모두 제너레이터이며 SyncRunner.run / AsyncRunner.run 으로 실행한다.
+    결과는 (응답 dict, 상태 코드) 이고, 비밀번호 암호화 실패는 EncryptionError 로 올린다.
+    """
+
+    def __init__(self, public_key, result_cache, stats, dummy_mode=False):
+        self.result_cache = result_cache
+        self.stats = stats
+        self.dummy_mode = dummy_mode
+
+        # 공개키는 기동 시 한 번만 파싱 (더미 모드에서는 키가 없어도 기동하고, 실제 호출 시 오류 반환)
+        try:
+            self._encryptor = RSAEncryptor(public_key)
+            self._encryptor_error = None
+        except EncryptionError as e:
+            if not dummy_mode:
+                raise
+            self._encryptor = None
+            self._encryptor_error = e
+
+    def encrypt_password(self, password):
+        """비밀번호를 CODEF 공개키로 암호화 (실패 시 EncryptionError)"""
+        if self._encryptor is None:
+            raise self._encryptor_error
+        return self._encryptor.encrypt(password)
+
+    def access_token(self):
+        """만료 전까지 캐시된 토큰을 재사용 (동시 요청도 발급은 한 번, 실패하면 None)"""
+        try:
+            return (yield AccessToken())
+
+        except Exception as e:
+            logger.warning('토큰 발급 오류', extra={'fields': {'error': str(e)}})
+            return None
+
+    def create_account(self, data):
+        """계정 생성 API 응답을 (응답 dict, 상태 코드) 로 반환"""
+        # 액세스 토큰 발급
+        access_token = yield from self.access_token()
+        if not access_token:
+            return {
+                'error': '토큰 발급 실패'
+            }, 500
+
+        # 필수 필드 확인
+        field = missing_field(data, CREATE_ACCOUNT_FIELDS)
+        if field:
+            return {
+                'error': f'필수 필드가 누락되었습니다: {field}'
+            }, 400
+
+        # 비밀번호 암호화 후 API 요청
+        payload = create_account_payload(data, self.encrypt_password(data['password']))
+        response = yield Post(ACCOUNT_CREATE_PATH, payload, access_token)
+        return decode_response(response.content), 200
+
+    def create_connected_account(self, data):
+        """계정 생성 단계: 생성된 connectedId 를 (응답 dict, 상태 코드) 로 반환"""
+        create_result, status = yield from self.create_account(data)
+        if status != 200:
+            return create_result, status
+
+        # 계정 생성 실패 시
+        if not is_success(create_result):
+            return create_result, 400  # 400 등 클라이언트 에러로 반환
+
+        # connectedId 추출
+        connected_id = create_result.get('data', {}).get('connectedId')
+        if not connected_id:
+            logger.warning('계정 생성 응답에 connectedId 없음',
+                           extra={'fields': {'code': create_result.get('result', {}).get('code')}})
+            return {
+                'error': 'connectedId를 찾을 수 없습니다.',
+                'detail': create_result
+            }, 500
+
+        return {'connectedId': connected_id}, 200
+
+    def load_account_list(self, organization, connected_id):
+        """계좌 목록 조회 API 응답을 (응답 dict, 상태 코드) 로 반환"""
+        access_token = yield from self.access_token()
+        if not access_token:
+            return {
+                'error': '토큰 발급 실패'
+            }, 500
+
+        payload = account_list_payload(organization, connected_id)
+        response = yield Post(STOCK_ACCOUNT_LIST_PATH, payload, access_token, idempotent=True)
+        return decode_response(response.content), 200
+
+    def list_connected_accounts(self, organization, connected_id, force_refresh=False):
+        """계좌 목록 단계: 캐시를 거쳐 계좌 목록 조회 응답을 (응답 dict, 상태 코드) 로 반환
+
+        같은 계정의 동시 요청은 upstream 호출 하나로 합친다.
+        """
+        return (yield Cached(
+            self.result_cache,
+            account_list_key(organization, connected_id),
+            lambda: self.load_account_list(organization, connected_id),
+            force_refresh
+        ))
+
+    def load_stock_balance(self, data):
+        """잔고 조회 API 응답을 (응답 dict, 상태 코드) 로 반환"""
+        try:
+            access_token = yield from self.access_token()
+            if not access_token:
+                return {
+                    'error': '토큰 발급 실패'
+                }, 500
+
+            # 계좌 비밀번호 암호화 후 API 요청
+            payload = balance_payload(data, self.encrypt_password(data['account_password']))
+            response = yield Post(STOCK_BALANCE_PATH, payload, access_token, idempotent=True)
+            return decode_response(response.content), 200
+
+        except EncryptionError as e:
+            return e.to_dict(), e.status
+
+        except Exception as e:
+            return {
+                'error': str(e)
+            }, 500
+
+    def fetch_stock_balance(self, data):
+        """잔고 조회 단계: 계좌 하나의 잔고 조회 결과를 (응답 dict, 상태 코드) 로 반환
+
+        짧은 TTL 캐시 확인 후 없으면 API 요청 (같은 계좌의 동시 요청은 한 번만 호출).
+        """
+        # 더미 모드가 활성화된 경우
+        if self.dummy_mode:
+            try:
+                account = data.get('account', '20901920648')
+
+                # API 호출 시뮬레이션을 위한 지연
+                yield DummyDelay()
+
+                # 해당 계좌의 더미 데이터 반환, 없으면 기본 데이터
+                return dummy_balance(account), 200
+
+            except Exception as e:
+                return {
+                    'error': f'더미 모드 에러: {str(e)}'
+                }, 500
+
+        try:
+            # 필수 필드 확인
+            field = missing_field(data, BALANCE_FIELDS)
+            if field:
+                return {
+                    'error': f'필수 필드가 누락되었습니다: {field}'
+                }, 400
+
+            return (yield Cached(
+                self.result_cache,
+                balance_key(data),
+                lambda: self.load_stock_balance(data),
+                force_refresh_requested(data)
+            ))
+
+        except Exception as e:
+            return {
+                'error': str(e)
+            }, 500
+
+    def fetch_stock_balances(self, accounts):
+        """여러 계좌의 잔고 조회 결과 목록 (어댑터의 동시 실행 한도 안에서 동시에 조회)"""
+        return (yield Gather([self.fetch_stock_balance(account) for account in accounts]))
+
+    def _prefetch_balance(self, balance_request, timer):
+        started = time.perf_counter()
+        result = yield from self.fetch_stock_balance(balance_request)
+        timer.balance_done(started, result)
+        return result
+
+    def prefetch_balances(self, balance_requests, timer):
+        """잔고 조회 단계: 계좌별 잔고 조회를 백그라운드에서 바로 시작
+
+        결과는 result_cache 에 채워지므로 연동 직후 첫 /stock/balance 요청은 캐시 적중이거나
+        진행 중인 조회에 합류한다. Join 으로 기다릴 수 있는 핸들 반환 (요청이 없으면 None).
+        """
+        if not balance_requests:
+            return None
+        return (yield Spawn([
+            self._prefetch_balance(balance_request, timer) for balance_request in balance_requests
+        ]))
+
+    def link_brokerage_account(self, data):
+        """증권 계정 연동: 계정 생성 → 계좌 목록 → 계좌별 잔고 미리 조회
+
+        (응답 dict, 상태 코드, 미리 조회 핸들) 반환. 잔고 조회는 기다리지 않는다.
+        """
+        started = time.perf_counter()
+
+        body, status = yield from self.create_connected_account(data)
+        self.stats.record(STAGE_CREATE, time.perf_counter() - started)
+        if status != 200:
+            return body, status, None
+        connected_id = body['connectedId']
+
+        list_started = time.perf_counter()
+        list_result, status = yield from self.list_connected_accounts(data['organization'], connected_id)
+        self.stats.record(STAGE_LIST, time.perf_counter() - list_started)
+
+        # 계좌 목록 추출 (목록 조회가 실패해도 연동 자체는 성공으로 응답)
+        account_list = extract_account_list(list_result) if status == 200 and is_success(list_result) else []
+
+        balance_requests = link_balance_requests(data, connected_id, account_list)
+        prefetch = yield from self.prefetch_balances(balance_requests, FirstPortfolioTimer(self.stats, started))
+        self.stats.count(links=1)
+
+        return {
+            'connectedId': connected_id,
+            'accountList': account_list
+        }, 200, prefetch
+
+
+class SyncRunner:
+    """Flask 게이트웨이용 어댑터: 연산을 CodefClient 와 공용 스레드 풀로 실행
+
+    요청 스레드에서 run 을 호출하고, Gather/Spawn 한 단계는 executor 의 작업 스레드에서 실행한다
+    (동시 upstream 호출 수는 executor 크기로 제한).
+    """
+
+    def __init__(self, codef, executor):
+        self.codef = codef
+        self.executor = executor
+
+    def run(self, flow):
+        """단계 제너레이터를 끝까지 실행해 반환값을 돌려준다"""
+        value = error = None
+        while True:
+            try:
+                op = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = self._perform(op), None
+            except Exception as e:
+                value, error = None, e
+
+    def _perform(self, op):
+        kind = type(op)
+        if kind is AccessToken:
+            return self.codef.access_token()
+        if kind is Post:
+            return self.codef.post(op.path, op.payload, op.access_token, idempotent=op.idempotent)
+        if kind is DummyDelay:
+            return simulate_api_delay()
+        if kind is Cached:
+            return op.cache.get_or_load(op.key, lambda: self.run(op.load()), force_refresh=op.force_refresh)
+        if kind is Gather:
+            return list(self.executor.map(self.run, op.flows))
+        if kind is Spawn:
+            return [self.executor.submit(self.run, flow) for flow in op.flows]
+        if kind is Join:
+            return [future.result() for future in op.handle]
+        raise TypeError(f'알 수 없는 연산입니다: {op!r}')
+
+
+class AsyncRunner:
+    """비동기 게이트웨이용 어댑터: 연산을 AsyncCodefClient 와 asyncio 태스크로 실행
+
+    Gather/Spawn 한 단계는 한 번에 최대 fanout 개씩 동시에 실행한다.
+    """
+
+    def __init__(self, codef, fanout):
+        self.codef = codef
+        self.fanout = fanout
+        # 응답을 먼저 보낸 뒤에도 미리 조회 태스크가 끝까지 실행되도록 참조를 보관
+        self._tasks = set()
+
+    async def run(self, flow):
+        """단계 제너레이터를 끝까지 실행해 반환값을 돌려준다"""
+        value = error = None
+        while True:
+            try:
+                op = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = await self._perform(op), None
+            except Exception as e:
+                value, error = None, e
+
+    async def _gather(self, flows):
+        """단계를 최대 fanout 개씩 동시에 실행하고 결과를 순서대로 반환"""
+        semaphore = asyncio.Semaphore(self.fanout)
+
+        async def run(flow):
+            async with semaphore:
+                return await self.run(flow)
+
+        return await asyncio.gather(*(run(flow) for flow in flows))
+
+    async def _perform(self, op):
+        kind = type(op)
+        if kind is AccessToken:
+            return await self.codef.access_token()
+        if kind is Post:
+            return await self.codef.post(op.path, op.payload, op.access_token, idempotent=op.idempotent)
+        if kind is DummyDelay:
+            return await simulate_api_delay_async()
+        if kind is Cached:
+            return await op.cache.aget_or_load(
+                op.key, lambda: self.run(op.load()), force_refresh=op.force_refresh
+            )
+        if kind is Gather:
+            return await self._gather(op.flows)
+        if kind is Spawn:
+            task = asyncio.create_task(self._gather(op.flows))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return task
+        if kind is Join:
+            # 기다리던 요청이 취소되어도 미리 조회는 계속해서 캐시를 채운다
+            return await asyncio.shield(op.handle)
+        raise TypeError(f'알 수 없는 연산입니다: {op!r}')
@@ -0,0 +1,87 @@
+"""
+여러 증권 계좌 잔고를 하나의 포트폴리오로 합치는 도우미
+"""
+from codef_payloads import is_success
+
+
+def parse_number(value):
+    """'1,250,000' 같은 CODEF 금액/수량 문자열을 숫자로 변환 (변환 불가 시 0)"""
+    if isinstance(value, (int, float)):
+        return value
+    if not value:
+        return 0
+    text = str(value).replace(',', '').strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return 0
+    return int(number) if number.is_integer() else number
+
+
+def _item_list(data):
+    items = data.get('resItemList') or []
+    return items if isinstance(items, list) else [items]
+
+
+def merge_balances(results):
+    """계좌별 잔고 조회 결과를 종목명 기준으로 합산
+
+    results: [{'account': ..., 'organization': ..., 'success': bool, 'data': {...}}, ...]
+    """
+    total_amount = 0
+    deposit_received = 0
+    holdings = {}
+
+    for result in results:
+        if not result.get('success'):
+            continue
+        data = result.get('data') or {}
+        total_amount += parse_number(data.get('rsTotAmt'))
+        deposit_received += parse_number(data.get('resDepositReceived'))
+
+        for item in _item_list(data):
+            name = item.get('resIsName')
+            if not name:
+                continue
+            holding = holdings.setdefault(name, {
+                'resIsName': name,
+                'resPrice': parse_number(item.get('resPrice')),
+                'resQuantity': 0,
+                'resAvailQuantity': 0,
+                'resAmount': 0,
+                'accounts': []
+            })
+            holding['resQuantity'] += parse_number(item.get('resQuantity'))
+            holding['resAvailQuantity'] += parse_number(item.get('resAvailQuantity'))
+            holding['resAmount'] += parse_number(item.get('resAmount'))
+            holding['accounts'].append(result.get('account'))
+
+    return {
+        'rsTotAmt': total_amount,
+        'resDepositReceived': deposit_received,
+        'resItemList': sorted(holdings.values(), key=lambda h: -h['resAmount'])
+    }
+
+
+def build_portfolio(requests, responses):
+    """계좌별 잔고 조회 요청과 (응답 dict, 상태 코드) 목록으로 다계좌 응답 생성
+
+    실패한 계좌는 accounts 목록에 오류로 표시하고 나머지 계좌로 포트폴리오를 만든다.
+    """
+    results = []
+    for account, (body, status) in zip(requests, responses):
+        result = {
+            'organization': account.get('organization'),
+            'account': account.get('account')
+        }
+        if status == 200 and is_success(body):
+            result.update(success=True, data=body.get('data', {}))
+        else:
+            result.update(success=False, status=status, error=body)
+        results.append(result)
+
+    return {
+        'accounts': results,
+        'portfolio': merge_balances(results),
+        'failedCount': sum(1 for r in results if not r['success'])
+    }
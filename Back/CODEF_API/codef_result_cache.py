@@ -0,0 +1,222 @@
+"""
+잔고/계좌 목록 조회 결과 캐시 (LRU + TTL)
+
+- 해석이 끝난 (응답 dict, 상태 코드) 를 짧은 TTL 동안 메모리에만 보관 (디스크에 쓰지 않음)
+- 키는 connectedId/계좌 기준이며, 비밀번호는 프로세스마다 새로 만드는 비밀키의 HMAC 으로만 키에 넣는다
+- 같은 키의 동시 조회는 upstream 호출 하나로 합친다 (스레드/asyncio 모두 지원)
+- 성공 응답(CF-00000)만 캐시하고, force_refresh 요청은 캐시를 건너뛰고 새로 조회해 덮어쓴다
+- 계정 삭제(invalidate) 전에 시작된 조회는 끝나도 결과를 캐시에 넣지 않는다 (connectedId 별 세대 번호)
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from codef_payloads import is_success
+
+# 비밀번호 지문용 비밀키 (프로세스 밖으로 나가지 않고 재시작하면 바뀐다)
+_FINGERPRINT_KEY = secrets.token_bytes(32)
+
+
+def password_fingerprint(password):
+    """평문 비밀번호 대신 캐시 키에 넣는 HMAC-SHA256 지문"""
+    if not password:
+        return ''
+    return hmac.new(_FINGERPRINT_KEY, str(password).encode(), hashlib.sha256).hexdigest()
+
+
+def balance_key(data):
+    """계좌 하나의 잔고 조회 캐시 키 (같은 비밀번호로 요청한 경우에만 재사용)"""
+    return (
+        'balance', data['connectedId'], data['organization'], data['account'],
+        password_fingerprint(data['account_password']),
+        password_fingerprint(data.get('add_password')),
+    )
+
+
+def account_list_key(organization, connected_id):
+    return ('account-list', connected_id, organization)
+
+
+def force_refresh_requested(data):
+    """요청 본문의 force_refresh 플래그 (true/"true"/1)"""
+    value = data.get('force_refresh', False) if isinstance(data, dict) else False
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def cacheable(result):
+    body, status = result
+    return status == 200 and isinstance(body, dict) and is_success(body)
+
+
+def _retrieve_exception(task):
+    # 기다리던 요청이 모두 취소되어도 "예외를 가져가지 않음" 경고가 뜨지 않도록 표시
+    if not task.cancelled():
+        task.exception()
+
+
+class ResultCache:
+    """스레드 안전한 LRU + TTL 결과 캐시 (동시 조회 병합 포함)"""
+
+    def __init__(self, max_entries=1024, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._async_inflight = {}
+        # connectedId → invalidate 횟수 (조회 시작 시점과 다르면 저장하지 않음)
+        # 진행 중인 조회가 있는 connectedId 만 보관하므로 크기는 동시 조회 수를 넘지 않는다
+        self._generations = {}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _lookup(self, key):
+        # 잠금을 잡은 상태에서 호출
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _generation(self, key):
+        # 잠금을 잡은 상태에서 호출
+        return self._generations.get(key[1], 0)
+
+    def _loading(self, connected_id):
+        # 잠금을 잡은 상태에서 호출, connectedId 의 조회가 진행 중인지
+        return any(key[1] == connected_id for inflight in (self._inflight, self._async_inflight) for key in inflight)
+
+    def _finish(self, inflight, key):
+        # 잠금을 잡은 상태에서 호출: 진행 중 표시를 지우고, 마지막 조회였으면 세대 번호도 지운다
+        inflight.pop(key, None)
+        connected_id = key[1]
+        if connected_id in self._generations and not self._loading(connected_id):
+            del self._generations[connected_id]
+
+    def _store(self, key, result, generation):
+        if not self.enabled or not cacheable(result):
+            return
+        with self._lock:
+            if self._generation(key) != generation:
+                # 조회하는 동안 계정이 삭제되었으면 이전 결과를 다시 넣지 않는다
+                return
+            self._entries[key] = (result, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _check(self, key, force_refresh):
+        # 잠금을 잡은 상태에서 호출, 캐시 적중이면 결과 반환
+        if force_refresh or not self.enabled:
+            return None
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def get_or_load(self, key, loader, force_refresh=False):
+        """캐시된 결과를 반환하거나 loader() 로 조회 (같은 키의 동시 호출은 한 번만 조회)"""
+        with self._lock:
+            result = self._check(key, force_refresh)
+            if result is not None:
+                return result
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                generation = self._generation(key)
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = loader()
+            self._store(key, result, generation)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._finish(self._inflight, key)
+
+    async def aget_or_load(self, key, loader, force_refresh=False):
+        """get_or_load 의 asyncio 버전 (loader 는 코루틴 함수)
+
+        조회는 캐시가 소유한 태스크에서 실행하고 처음 요청한 쪽도 기다리기만 하므로,
+        어느 요청이 취소되어도 같은 키를 기다리는 다른 요청은 결과를 받는다.
+        """
+        with self._lock:
+            result = self._check(key, force_refresh)
+            if result is not None:
+                return result
+            task = self._async_inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._aload(key, loader, self._generation(key)))
+                task.add_done_callback(_retrieve_exception)
+                self._async_inflight[key] = task
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def _aload(self, key, loader, generation):
+        try:
+            result = await loader()
+            self._store(key, result, generation)
+            return result
+        finally:
+            with self._lock:
+                self._finish(self._async_inflight, key)
+
+    def invalidate(self, connected_id):
+        """connectedId 의 캐시 항목을 모두 제거하고 진행 중인 조회도 저장하지 않게 한다 (계정 삭제 시)"""
+        with self._lock:
+            # 진행 중인 조회가 없으면 세대 번호를 남길 필요가 없다 (이후 조회는 삭제 뒤에 시작됨)
+            if self._loading(connected_id):
+                self._generations[connected_id] = self._generations.get(connected_id, 0) + 1
+            for key in [key for key in self._entries if key[1] == connected_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            'size': size,
+            'maxEntries': self.max_entries,
+            'ttlSeconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'hitRatio': round(self.hits / total, 4) if total else None,
+        }
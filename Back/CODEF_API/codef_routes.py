@@ -0,0 +1,197 @@
+"""
+CODEF 게이트웨이 라우트 처리 (testflask.py / async_gateway.py 공용)
+
+라우트마다 요청 본문(dict)을 받아 (응답 dict, 상태 코드) 를 돌려주는 제너레이터를 둔다.
+검증, 오류 메시지와 상태 코드, 더미 모드 분기는 여기에서만 정하고,
+게이트웨이는 요청 본문을 읽고 SyncRunner / AsyncRunner 로 실행한 결과를 JSON 으로 쓰기만 한다.
+"""
+import logging
+import os
+
+from codef_client import ACCOUNT_DELETE_PATH
+from codef_crypto import EncryptionError
+from codef_dummy import dummy_account_list, dummy_connected_id
+from codef_payloads import (
+    ACCOUNT_LIST_FIELDS, decode_response, delete_account_payload,
+    extract_account_list, is_success, missing_field
+)
+from codef_pipeline import DummyDelay, Join, Post, link_balance_requests
+from codef_portfolio import build_portfolio
+from codef_result_cache import force_refresh_requested
+
+logger = logging.getLogger('codef-gateway')
+
+# 다계좌 잔고 조회 요청당 최대 계좌 수
+MAX_BALANCE_ACCOUNTS = int(os.getenv('MAX_BALANCE_ACCOUNTS', '50'))
+
+
+def create_account(pipeline, data):
+    """POST /create_account: 계정 생성 API 응답"""
+    try:
+        return (yield from pipeline.create_account(data))
+
+    except EncryptionError as e:
+        return e.to_dict(), e.status
+
+    except Exception as e:
+        return {
+            'error': str(e)
+        }, 500
+
+
+def delete_account(pipeline, data):
+    """DELETE /delete_account: 계정 삭제 (성공하면 그 connectedId 의 캐시 결과를 비움)"""
+    try:
+        access_token = yield from pipeline.access_token()
+
+        # 필수 파라미터 검증
+        if 'connectedId' not in data:
+            return {
+                'error': 'connectedId가 필요합니다.'
+            }, 400
+
+        if 'organization' not in data:
+            return {
+                'error': '기관코드(organization)가 필요합니다.'
+            }, 400
+
+        response = yield Post(ACCOUNT_DELETE_PATH, delete_account_payload(data), access_token)
+
+        if not response.content:
+            logger.warning('계정 삭제 응답이 비어 있음', extra={'fields': {'status': response.status_code}})
+            return {
+                'error': 'API 응답이 비어있습니다.',
+                'status_code': response.status_code
+            }, 500
+
+        # 삭제에 성공한 계정의 캐시된 잔고/계좌 목록은 더 이상 돌려주지 않는다
+        response_data = decode_response(response.content)
+        if is_success(response_data):
+            pipeline.result_cache.invalidate(data['connectedId'])
+
+        return response_data, 200
+
+    except Exception as e:
+        logger.exception('계정 삭제 오류')
+        return {
+            'error': str(e)
+        }, 500
+
+
+def get_stock_account_list(pipeline, data):
+    """POST /stock/account-list: 연결된 계정의 계좌번호 목록"""
+    try:
+        # 필수 필드 확인
+        field = missing_field(data, ACCOUNT_LIST_FIELDS)
+        if field:
+            return {
+                'error': f'필수 필드가 누락되었습니다: {field}'
+            }, 400
+
+        # 짧은 TTL 캐시 확인 후 없으면 API 요청 (같은 계정의 동시 요청은 한 번만 호출)
+        response_data, status = yield from pipeline.list_connected_accounts(
+            data['organization'], data['connectedId'], force_refresh_requested(data)
+        )
+        if status != 200:
+            return response_data, status
+
+        if is_success(response_data):
+            return {'accountList': extract_account_list(response_data)}, 200
+
+        return response_data, 200
+
+    except Exception as e:
+        return {
+            'error': str(e)
+        }, 500
+
+
+def stock_balance(pipeline, data):
+    """POST /stock/balance: 계좌 하나의 잔고"""
+    return (yield from pipeline.fetch_stock_balance(data))
+
+
+def stock_balances(pipeline, data):
+    """POST /stock/balances: 여러 계좌 잔고를 동시에 조회해 하나의 포트폴리오로 합쳐 반환
+
+    요청: {"accounts": [{"organization", "connectedId", "account", "account_password", ...}, ...]}
+    실패한 계좌는 accounts 목록에 오류로 표시하고 나머지 계좌로 포트폴리오를 만든다.
+    """
+    try:
+        accounts = data.get('accounts') if isinstance(data, dict) else None
+        if not isinstance(accounts, list) or not accounts:
+            return {
+                'error': 'accounts 목록이 필요합니다.'
+            }, 400
+        if len(accounts) > MAX_BALANCE_ACCOUNTS:
+            return {
+                'error': f'한 번에 조회할 수 있는 계좌는 최대 {MAX_BALANCE_ACCOUNTS}개입니다.'
+            }, 400
+
+        # 동시 upstream 호출 수는 어댑터의 동시 실행 한도(BALANCE_FANOUT)로 제한
+        responses = yield from pipeline.fetch_stock_balances(accounts)
+
+        return build_portfolio(accounts, responses), 200
+
+    except Exception as e:
+        return {
+            'error': str(e)
+        }, 500
+
+
+def create_account_and_list(pipeline, data):
+    """POST /stock/create-and-list: 계정 연동 후 계좌 목록 (with_portfolio 면 포트폴리오까지)"""
+    # 더미 모드가 활성화된 경우
+    if pipeline.dummy_mode:
+        try:
+            organization = data.get('organization', '0247')
+
+            # API 호출 시뮬레이션을 위한 지연
+            yield DummyDelay()
+
+            # 증권사에 따른 더미 계좌 목록 반환
+            return {
+                'connectedId': dummy_connected_id(),
+                'accountList': dummy_account_list(organization)
+            }, 200
+
+        except Exception as e:
+            return {
+                'error': f'더미 모드 에러: {str(e)}'
+            }, 500
+
+    try:
+        body, status, prefetch = yield from pipeline.link_brokerage_account(data)
+        if status != 200:
+            return body, status
+
+        # with_portfolio 요청이면 미리 조회 중인 잔고를 기다려 포트폴리오까지 한 번에 반환
+        if data.get('with_portfolio') and prefetch is not None:
+            balance_requests = link_balance_requests(data, body['connectedId'], body['accountList'])
+            body.update(build_portfolio(balance_requests, (yield Join(prefetch))))
+        return body, 200
+
+    except EncryptionError as e:
+        return e.to_dict(), e.status
+
+    except Exception as e:
+        return {
+            'error': str(e)
+        }, 500
+
+
+def dummy_mode_status(pipeline):
+    """GET /dummy-mode/status 응답 (제너레이터가 아닌 일반 함수)"""
+    return {
+        'dummyMode': pipeline.dummy_mode,
+        'message': '더미 모드가 활성화되어 있습니다.' if pipeline.dummy_mode else 'Codef API가 정상 작동중입니다.'
+    }
+
+
+def toggle_dummy_mode(pipeline):
+    """POST /dummy-mode/toggle: 더미 모드를 켜거나 끄고 바뀐 상태 반환 (일반 함수)"""
+    pipeline.dummy_mode = not pipeline.dummy_mode
+    return {
+        'dummyMode': pipeline.dummy_mode,
+        'message': f'더미 모드가 {"활성화" if pipeline.dummy_mode else "비활성화"}되었습니다.'
+    }
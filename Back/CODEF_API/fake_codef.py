@@ -0,0 +1,404 @@
+"""
+로컬 CODEF 대체 서버 (부하 테스트/개발용)
+
+실제 CODEF 와 같은 경로와 응답 형식(퍼센트 인코딩된 JSON)으로 응답하고,
+연결 ID/계좌마다 결정적으로 생성한 임의 크기의 포트폴리오를 돌려준다.
+경로별 지연 분포, 오류율, 토큰별 호출 한도를 설정할 수 있어 네트워크 없이
+게이트웨이(testflask.py / async_gateway.py) 용량을 측정할 수 있다.
+
+실행:
+    python fake_codef.py --port 9000 --holdings 5-40 \\
+        --latency lognormal:0.3,0.4 --latency balance=lognormal:0.8,0.5 \\
+        --error-rate 0.01 --rate-limit 50
+
+게이트웨이 설정 (기동할 때마다 새로 만들어 출력하는 공개키 사용):
+    CODEF_OAUTH_URL=http://127.0.0.1:9000 CODEF_API_URL=http://127.0.0.1:9000
+    CODEF_PUBLIC_KEY=<출력된 값> USE_CODEF_DUMMY=false
+
+지연 분포 형식:
+    0.3                  고정 0.3초
+    uniform:0.1,0.5      0.1~0.5초 균등
+    normal:0.3,0.05      평균 0.3초, 표준편차 0.05초 (0 미만은 0)
+    lognormal:0.3,0.4    중앙값 0.3초, 로그 표준편차 0.4
+경로별 지정은 token/create/delete/list/balance=<분포>.
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import secrets
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Crypto.Cipher import PKCS1_v1_5
+from Crypto.PublicKey import RSA
+
+from codef_client import ENDPOINT_NAMES
+
+# 경로 → 지연/통계에 쓰는 짧은 이름 (게이트웨이 지표와 같은 이름)
+ROUTES = ENDPOINT_NAMES
+
+# 합성 포트폴리오 종목명 (부족하면 '종목N' 으로 채움)
+STOCK_NAMES = (
+    '삼성전자', 'SK하이닉스', 'LG에너지솔루션', '삼성바이오로직스', '현대차', '기아', '셀트리온',
+    'NAVER', '카카오', 'POSCO홀딩스', 'KB금융', '신한지주', 'LG화학', '삼성SDI', '현대모비스',
+    '삼성물산', 'SK이노베이션', 'LG전자', '한국전력', 'KT&G', '하나금융지주', '삼성생명',
+    'HD현대중공업', '크래프톤', '엔씨소프트', 'SK텔레콤', 'KT', '대한항공', '한화에어로스페이스',
+    '두산에너빌리티', '에코프로비엠', '에코프로', '포스코퓨처엠', '삼성전기', 'LG이노텍',
+)
+
+TOKEN_TTL = 604799
+
+ERROR_CODE = 'CF-09999'
+RATE_LIMIT_CODE = 'CF-00015'
+INVALID_PASSWORD_CODE = 'CF-12100'
+
+
+class Latency:
+    """지연 시간 분포 (초)"""
+
+    def __init__(self, kind='fixed', a=0.0, b=0.0):
+        if kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f'알 수 없는 지연 분포: {kind}')
+        self.kind = kind
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def parse(cls, spec):
+        kind, _, params = spec.partition(':')
+        if not params:
+            return cls('fixed', float(kind))
+        a, _, b = params.partition(',')
+        return cls(kind, float(a), float(b or 0))
+
+    def sample(self, rng):
+        if self.kind == 'fixed':
+            return self.a
+        if self.kind == 'uniform':
+            return rng.uniform(self.a, self.b)
+        if self.kind == 'normal':
+            return max(0.0, rng.gauss(self.a, self.b))
+        return self.a * math.exp(rng.gauss(0.0, self.b)) if self.a > 0 else 0.0
+
+    def __repr__(self):
+        return f'{self.kind}({self.a}, {self.b})'
+
+
+class TokenBucket:
+    """초당 rate 회, 최대 burst 회까지 허용하는 호출 한도 (키별)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1.0
+            self._buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+            return allowed
+
+
+class FakeCodefConfig:
+    def __init__(self, accounts=2, holdings=(5, 20), latency=None, route_latency=None,
+                 error_rate=0.0, http_error_rate=0.0, rate_limit=0.0, burst=None,
+                 check_passwords=False, seed=0):
+        self.accounts = accounts
+        self.holdings = holdings
+        self.latency = latency or Latency()
+        self.route_latency = route_latency or {}
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.check_passwords = check_passwords
+        self.seed = seed
+
+    def latency_for(self, route):
+        return self.route_latency.get(route, self.latency)
+
+
+def _money(value):
+    return f'{value:,}'
+
+
+def _seeded(seed, *parts):
+    return random.Random(zlib.crc32('|'.join(map(str, (seed,) + parts)).encode()))
+
+
+def account_numbers(config, connected_id):
+    """연결 ID 의 계좌번호 목록 (같은 연결 ID 에는 항상 같은 결과)"""
+    rng = _seeded(config.seed, 'accounts', connected_id)
+    return [str(rng.randrange(10 ** 10, 10 ** 11)) for _ in range(config.accounts)]
+
+
+def synthetic_balance(config, connected_id, account):
+    """계좌 하나의 합성 잔고 (CODEF 처럼 금액/수량은 천 단위 구분 문자열)"""
+    rng = _seeded(config.seed, 'balance', connected_id, account)
+    low, high = config.holdings
+    count = rng.randint(low, high)
+
+    items = []
+    total = 0
+    for index in range(count):
+        name = STOCK_NAMES[index] if index < len(STOCK_NAMES) else f'종목{index + 1}'
+        price = rng.randrange(1_000, 900_000, 50)
+        quantity = rng.randint(1, 300)
+        amount = price * quantity
+        total += amount
+        items.append({
+            'resIsName': name,
+            'resItemCode': f'{rng.randrange(0, 999999):06d}',
+            'resPrice': _money(price),
+            'resQuantity': str(quantity),
+            'resAvailQuantity': str(quantity),
+            'resAmount': _money(amount),
+            'resEarningsRate': f'{rng.uniform(-30, 60):.2f}',
+        })
+
+    deposit = rng.randrange(0, 5_000_000, 1_000)
+    return {
+        'resAccount': account,
+        'resAccountName': '합성 증권 계좌',
+        'rsTotAmt': _money(total + deposit),
+        'resDepositReceived': _money(deposit),
+        'resDepositReceivedD2': _money(deposit),
+        'resItemList': items,
+    }
+
+
+class FakeCodefState:
+    """발급한 토큰, 연결 ID, 호출 통계"""
+
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.limiter = TokenBucket(config.rate_limit, config.burst) if config.rate_limit > 0 else None
+        self.tokens = set()
+        self.connections = {}
+        self.calls = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+        # 게이트웨이가 비밀번호를 암호화할 공개키 (기동할 때마다 새로 생성)
+        key = RSA.generate(2048)
+        self._cipher = PKCS1_v1_5.new(key)
+        self.public_key = base64.b64encode(key.publickey().export_key('DER')).decode()
+
+    def count(self, table, route):
+        with self._lock:
+            table[route] = table.get(route, 0) + 1
+
+    def sample(self, route):
+        with self._lock:
+            delay = self.config.latency_for(route).sample(self.rng)
+            roll = self.rng.random()
+        return delay, roll
+
+    def issue_token(self):
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self.tokens.add(token)
+        return token
+
+    def valid_token(self, token):
+        with self._lock:
+            return token in self.tokens
+
+    def password_ok(self, encrypted):
+        if not self.config.check_passwords:
+            return True
+        try:
+            return bool(self._cipher.decrypt(base64.b64decode(encrypted), None))
+        except (ValueError, TypeError):
+            return False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'errors': dict(self.errors),
+                'tokens': len(self.tokens),
+                'connections': len(self.connections),
+            }
+
+
+def codef_result(code='CF-00000', message='성공', data=None):
+    body = {'result': {'code': code, 'message': message, 'extraMessage': '', 'transactionId': secrets.token_hex(8)}}
+    body['data'] = data if data is not None else {}
+    return body
+
+
+class FakeCodefHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, encode=True):
+        raw = json.dumps(body, ensure_ascii=False)
+        payload = (urllib.parse.quote(raw) if encode else raw).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/_stats':
+            return self._send(200, self.state.stats(), encode=False)
+        if self.path == '/_public-key':
+            return self._send(200, {'publicKey': self.state.public_key}, encode=False)
+        self._send(404, {'error': 'not_found'}, encode=False)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+        route = ROUTES.get(urllib.parse.urlsplit(self.path).path)
+        if route is None:
+            return self._send(404, {'error': 'not_found'}, encode=False)
+
+        state = self.state
+        state.count(state.calls, route)
+        delay, roll = state.sample(route)
+        if delay > 0:
+            time.sleep(delay)
+
+        if route == 'token':
+            return self._send(200, {
+                'access_token': state.issue_token(),
+                'token_type': 'bearer',
+                'expires_in': TOKEN_TTL,
+                'scope': 'read',
+            }, encode=False)
+
+        token = self.headers.get('Authorization', '')[len('Bearer '):]
+        if not state.valid_token(token):
+            state.count(state.errors, route)
+            return self._send(401, {'error': 'invalid_token', 'error_description': 'Invalid access token'},
+                              encode=False)
+
+        if state.limiter is not None and not state.limiter.allow(token):
+            state.count(state.errors, route)
+            return self._send(429, codef_result(RATE_LIMIT_CODE, '요청 한도를 초과했습니다.'))
+
+        config = state.config
+        if roll < config.http_error_rate:
+            state.count(state.errors, route)
+            return self._send(503, {'error': 'service_unavailable'}, encode=False)
+        if roll < config.http_error_rate + config.error_rate:
+            state.count(state.errors, route)
+            return self._send(200, codef_result(ERROR_CODE, '처리 중 오류가 발생했습니다.'))
+
+        try:
+            data = json.loads(raw or b'{}')
+        except ValueError:
+            return self._send(400, codef_result('CF-00001', '요청 본문을 읽을 수 없습니다.'))
+
+        self._send(200, getattr(self, 'handle_' + route)(data))
+
+    def handle_create(self, data):
+        accounts = data.get('accountList') or [{}]
+        if not all(self.state.password_ok(a.get('password')) for a in accounts):
+            return codef_result(INVALID_PASSWORD_CODE, '비밀번호를 복호화할 수 없습니다.')
+        connected_id = secrets.token_hex(11)
+        with self.state._lock:
+            self.state.connections[connected_id] = time.time()
+        return codef_result(data={'connectedId': connected_id, 'successList': accounts, 'errorList': []})
+
+    def handle_delete(self, data):
+        with self.state._lock:
+            self.state.connections.pop(data.get('connectedId'), None)
+        return codef_result(data={'connectedId': data.get('connectedId'), 'successList': data.get('accountList', [])})
+
+    def handle_list(self, data):
+        accounts = account_numbers(self.state.config, data.get('connectedId', ''))
+        rows = [{'resAccount': account, 'resAccountName': '합성 증권 계좌'} for account in accounts]
+        # 실제 CODEF 처럼 계좌가 하나면 객체, 여러 개면 배열
+        return codef_result(data=rows[0] if len(rows) == 1 else rows)
+
+    def handle_balance(self, data):
+        if not self.state.password_ok(data.get('account_password')):
+            return codef_result(INVALID_PASSWORD_CODE, '계좌 비밀번호를 복호화할 수 없습니다.')
+        return codef_result(data=synthetic_balance(
+            self.state.config, data.get('connectedId', ''), data.get('account', '')
+        ))
+
+
+class FakeCodefServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def start(config, host='127.0.0.1', port=0):
+    """백그라운드 스레드에서 서버를 시작하고 (server, state) 반환 (port=0 이면 빈 포트)"""
+    state = FakeCodefState(config)
+    handler = type('BoundFakeCodefHandler', (FakeCodefHandler,), {'state': state})
+    server = FakeCodefServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='fake-codef', daemon=True).start()
+    return server, state
+
+
+def _range(spec):
+    low, _, high = spec.partition('-')
+    return int(low), int(high or low)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--accounts', type=int, default=2, help='연결 ID 당 계좌 수')
+    parser.add_argument('--holdings', type=_range, default=(5, 20), help='계좌당 보유 종목 수 (예: 5-40)')
+    parser.add_argument('--latency', action='append', default=[],
+                        help='지연 분포, 경로별은 route=분포 (여러 번 지정 가능)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='CODEF 오류 코드로 응답할 비율')
+    parser.add_argument('--http-error-rate', type=float, default=0.0, help='HTTP 503 으로 응답할 비율')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='토큰당 초당 호출 한도 (0 이면 무제한)')
+    parser.add_argument('--burst', type=float, default=None)
+    parser.add_argument('--check-passwords', action='store_true', help='RSA 암호화된 비밀번호를 실제로 복호화해 검사')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    latency = Latency()
+    route_latency = {}
+    for spec in args.latency:
+        route, sep, dist = spec.partition('=')
+        if sep:
+            if route not in ROUTES.values():
+                parser.error(f'알 수 없는 경로 이름: {route}')
+            route_latency[route] = Latency.parse(dist)
+        else:
+            latency = Latency.parse(spec)
+
+    config = FakeCodefConfig(
+        accounts=args.accounts, holdings=args.holdings, latency=latency, route_latency=route_latency,
+        error_rate=args.error_rate, http_error_rate=args.http_error_rate,
+        rate_limit=args.rate_limit, burst=args.burst,
+        check_passwords=args.check_passwords, seed=args.seed,
+    )
+    return args, config
+
+
+if __name__ == '__main__':
+    args, config = parse_args()
+    server, state = start(config, args.host, args.port)
+    print(f"CODEF 대체 서버 시작 - http://{args.host}:{server.server_address[1]}")
+    print(f"  지연: 기본 {config.latency}, 경로별 {config.route_latency}")
+    print(f"  오류율: {config.error_rate}, HTTP 오류율: {config.http_error_rate}, 호출 한도: {config.rate_limit}/s")
+    print(f"CODEF_PUBLIC_KEY={state.public_key}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
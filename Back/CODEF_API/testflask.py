@@ -1,21 +1,47 @@
 from flask import Flask, request, jsonify
-import base64
-from Crypto.PublicKey import RSA
-from Crypto.Cipher import PKCS1_v1_5 as Cipher_PKCS1_v1_5
-import requests
-import json
-import urllib.parse
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 import os
+import sys
 from flask_cors import CORS
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 검색 서버와 같이 쓰는 지표/로그/지연 기록 모듈 (Back/common, codef_pipeline 도 사용)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from codef_payloads import dumps
+from codef_pipeline import CodefPipeline, PipelineStats, SyncRunner
+from codef_result_cache import ResultCache
+from codef_client import CodefClient
+import codef_routes
+
+from metrics import install_flask  # noqa: E402
+from service_log import AccessLog, setup_logging  # noqa: E402
+import codef_metrics  # noqa: E402
 
 # .env 파일 로드
 load_dotenv()
 
+
+class CodefJSONProvider(DefaultJSONProvider):
+    """jsonify 를 codef_payloads.dumps(orjson) 로 한 번에 bytes 직렬화"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = CodefJSONProvider(app)
 CORS(app)
 
+# JSON 한 줄 로그 (요청 로그는 표본 추출) + 라우트별 처리 시간 지표와 GET /metrics
+logger = setup_logging('codef-gateway')
+install_flask(app, AccessLog(logger))
+
 # 환경변수에서 설정 로드
 CLIENT_ID = os.getenv('CODEF_CLIENT_ID')
 CLIENT_SECRET = os.getenv('CODEF_CLIENT_SECRET')
@@ -28,509 +54,85 @@ USE_DUMMY_MODE = os.getenv('USE_CODEF_DUMMY', 'true').lower() == 'true'
 if not USE_DUMMY_MODE and not all([CLIENT_ID, CLIENT_SECRET, PUBLIC_KEY]):
     raise Exception("필요한 환경변수가 설정되지 않았습니다. .env 파일을 확인해주세요.")
 
-# 더미 데이터 정의
-DUMMY_ACCOUNT_LISTS = {
-    '0247': ['20901920648'],  # NH투자증권
-    '1247': ['20901920648'],  # NH투자증권 모바일증권 나무  
-    '0240': ['716229952301']  # 삼성증권
-}
-
-DUMMY_BALANCE_DATA = {
-    '20901920648': {
-        'result': {
-            'code': 'CF-00000',
-            'message': '성공'
-        },
-        'data': {
-            'resAccount': '20901920648',
-            'resAccountName': 'NH투자증권 계좌',
-            'rsTotAmt': '1,250,000',
-            'resDepositReceived': '150,000',
-            'resItemList': [
-                {
-                    'resIsName': '삼성전자',
-                    'resPrice': '72,500',
-                    'resQuantity': '10',
-                    'resAmount': '725,000',
-                    'resAvailQuantity': '10'
-                },
-                {
-                    'resIsName': 'LG에너지솔루션',
-                    'resPrice': '425,000',
-                    'resQuantity': '1',
-                    'resAmount': '425,000', 
-                    'resAvailQuantity': '1'
-                }
-            ]
-        }
-    },
-    '716229952301': {
-        'result': {
-            'code': 'CF-00000',
-            'message': '성공'
-        },
-        'data': {
-            'resAccount': '716229952301',
-            'resAccountName': '삼성증권 계좌',
-            'rsTotAmt': '2,340,000',
-            'resDepositReceived': '340,000',
-            'resItemList': [
-                {
-                    'resIsName': 'SK하이닉스',
-                    'resPrice': '125,000',
-                    'resQuantity': '8', 
-                    'resAmount': '1,000,000',
-                    'resAvailQuantity': '8'
-                },
-                {
-                    'resIsName': 'NAVER',
-                    'resPrice': '200,000',
-                    'resQuantity': '5',
-                    'resAmount': '1,000,000',
-                    'resAvailQuantity': '5'
-                }
-            ]
-        }
-    }
-}
-
-def simulate_api_delay():
-    """API 호출을 시뮬레이션하기 위한 지연"""
-    time.sleep(0.5)
-
-def get_access_token():
-    try:
-        token_url = "https://oauth.codef.io/oauth/token"
-
-        # Basic Auth 사용
-        response = requests.post(
-            token_url,
-            auth=(CLIENT_ID, CLIENT_SECRET),  # Basic Auth
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded"
-            },
-            data={
-                "grant_type": "client_credentials"
-            }
-        )
-
-        token_data = response.json()
-
-        if 'access_token' in token_data:
-            return token_data['access_token']
-        else:
-            raise Exception("토큰 발급 실패: " + str(token_data))
+# 모든 라우트가 공유하는 CODEF 클라이언트 (커넥션 풀, timeout, 조회성 호출 재시도)
+codef = CodefClient.from_env(CLIENT_ID, CLIENT_SECRET)
 
-    except Exception as e:
-        print(f"토큰 발급 오류: {e}")
-        return None
+# 다계좌 잔고 조회 동시 실행 수 (요청당 최대 계좌 수는 codef_routes.MAX_BALANCE_ACCOUNTS)
+BALANCE_FANOUT = int(os.getenv('BALANCE_FANOUT', '8'))
+balance_executor = ThreadPoolExecutor(max_workers=BALANCE_FANOUT, thread_name_prefix='balance')
 
-def publicEncRSA(publicKey, data):
-    try:
-        keyDER = base64.b64decode(publicKey)
-        keyPub = RSA.importKey(keyDER)
-        cipher = Cipher_PKCS1_v1_5.new(keyPub)
-        cipher_text = cipher.encrypt(data.encode())
-        encryptedData = base64.b64encode(cipher_text)
-        return encryptedData.decode('utf-8')
-    except Exception as e:
-        print(f"암호화 오류: {e}")
-        return None
+# 계정 연동 파이프라인 단계별 처리 시간과 연동 후 첫 포트폴리오까지의 시간
+pipeline_stats = PipelineStats()
 
+# 잔고/계좌 목록 조회 결과 캐시 (당겨서 새로고침이 반복되어도 TTL 동안은 upstream 을 다시 호출하지 않음)
+result_cache = ResultCache(
+    max_entries=int(os.getenv('CODEF_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('CODEF_CACHE_TTL', '30'))
+)
 
-@app.route('/create_account', methods=['POST'])
-def create_account():
-    try:
-        # 액세스 토큰 발급
-        access_token = get_access_token()
-        if not access_token:
-            return jsonify({
-                'error': '토큰 발급 실패'
-            }), 500
-
-        # JSON 데이터 받기
-        data = request.get_json()
+# upstream 호출 시간, 토큰 발급 수, 캐시/파이프라인 집계를 /metrics 에 연결
+codef_metrics.register(codef, result_cache, pipeline_stats)
 
-        # 필수 필드 확인
-        required_fields = ['id', 'password', 'organization']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'필수 필드가 누락되었습니다: {field}'
-                }), 400
-
-        # 비밀번호 암호화
-        encrypted_password = publicEncRSA(PUBLIC_KEY, data['password'])
-
-        # API 요청 데이터
-        payload = {
-            'accountList': [
-                {
-                    'countryCode': "KR",
-                    'businessType': 'ST',
-                    'organization': data['organization'],
-                    'loginType': '1',
-                    'clientType': 'A',
-                    'id': data['id'],
-                    'password': encrypted_password
-                }
-            ]
-        }
-
-        # API 요청
-        url = "https://development.codef.io/v1/account/create"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}'
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        decoded_response = urllib.parse.unquote(response.text)
-
-        return jsonify(json.loads(decoded_response))
+# 계정 생성/계좌 목록/잔고 조회 단계 (async_gateway.py 와 같은 구현을 요청 스레드와 스레드 풀에서 실행)
+pipeline = CodefPipeline(PUBLIC_KEY, result_cache, pipeline_stats, dummy_mode=USE_DUMMY_MODE)
+runner = SyncRunner(codef, balance_executor)
 
+def respond(route):
+    """공용 라우트 처리(codef_routes)를 요청 본문으로 실행해 JSON 응답으로 변환"""
+    try:
+        data = request.get_json()
     except Exception as e:
         return jsonify({
             'error': str(e)
         }), 500
 
+    body, status = runner.run(route(pipeline, data))
+    return jsonify(body), status
 
-@app.route('/delete_account', methods=['DELETE'])
-def delete_account():
-    try:
-        print("요청 시작")
 
-        data = request.get_json()
-        print("받은 데이터:", data)
-
-        access_token = get_access_token()
-        print("액세스 토큰:", access_token)
-
-        # 필수 파라미터 검증
-        if 'connectedId' not in data:
-            return jsonify({
-                'error': 'connectedId가 필요합니다.'
-            }), 400
-
-        if 'organization' not in data:
-            return jsonify({
-                'error': '기관코드(organization)가 필요합니다.'
-            }), 400
-
-        # API 문서에 맞게 payload 형식 수정
-        payload = {
-            'accountList': [{
-                'countryCode': 'KR',
-                'businessType': 'ST',
-                'clientType': 'A',
-                'organization': data['organization'],  # 클라이언트에서 전달받은 기관코드 사용
-                'loginType': '1'
-            }],
-            'connectedId': data['connectedId']
-        }
-        print("페이로드:", payload)
-
-        url = "https://development.codef.io/v1/account/delete"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}'
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        print("응답 상태 코드:", response.status_code)
-        print("응답 헤더:", response.headers)
-        print("API 응답:", response.text)
-
-        if not response.text:
-            return jsonify({
-                'error': 'API 응답이 비어있습니다.',
-                'status_code': response.status_code
-            }), 500
-
-        decoded_response = urllib.parse.unquote(response.text)
-        print("디코딩된 응답:", decoded_response)
-
-        return jsonify(json.loads(decoded_response))
+@app.route('/create_account', methods=['POST'])
+def create_account():
+    return respond(codef_routes.create_account)
 
-    except Exception as e:
-        print("에러 발생:", str(e))
-        return jsonify({
-            'error': str(e)
-        }), 500
+
+@app.route('/delete_account', methods=['DELETE'])
+def delete_account():
+    return respond(codef_routes.delete_account)
 
 
 @app.route('/stock/account-list', methods=['POST'])
 def get_stock_account_list():
-    try:
-        # 액세스 토큰 발급
-        access_token = get_access_token()
-        if not access_token:
-            return jsonify({
-                'error': '토큰 발급 실패'
-            }), 500
-
-        # JSON 데이터 받기
-        data = request.get_json()
-
-        # 필수 필드 확인
-        required_fields = ['organization', 'connectedId']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'필수 필드가 누락되었습니다: {field}'
-                }), 400
-
-        # API 요청 데이터
-        payload = {
-            'organization': data['organization'],
-            'connectedId': data['connectedId']
-        }
-
-        # API 요청
-        url = "https://development.codef.io/v1/kr/stock/a/account/account-list"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}'
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        decoded_response = urllib.parse.unquote(response.text)
-        response_data = json.loads(decoded_response)
-
-        if response_data.get('result', {}).get('code') == 'CF-00000':
-            account_list = []
-            if 'data' in response_data:
-                if isinstance(response_data['data'], list):
-                    # 여러 계좌인 경우
-                    for account in response_data['data']:
-                        if 'resAccount' in account:
-                            account_list.append(account['resAccount'])
-                else:
-                    # 단일 계좌인 경우
-                    if 'resAccount' in response_data['data']:
-                        account_list.append(response_data['data']['resAccount'])
-
-            return jsonify({'accountList': account_list})
-
-        return jsonify(response_data)
-
-    except Exception as e:
-        return jsonify({
-            'error': str(e)
-        }), 500
+    return respond(codef_routes.get_stock_account_list)
 
 @app.route('/stock/balance', methods=['POST'])
 def stock_balance():
-    # 더미 모드가 활성화된 경우
-    if USE_DUMMY_MODE:
-        try:
-            print("더미 모드: 계좌 잔고 더미 데이터 반환")
-            data = request.get_json()
-            account = data.get('account', '20901920648')
-            
-            # API 호출 시뮬레이션을 위한 지연
-            simulate_api_delay()
-            
-            # 해당 계좌의 더미 데이터 반환, 없으면 기본 데이터
-            dummy_response = DUMMY_BALANCE_DATA.get(account, DUMMY_BALANCE_DATA['20901920648'])
-            return jsonify(dummy_response)
-            
-        except Exception as e:
-            return jsonify({
-                'error': f'더미 모드 에러: {str(e)}'
-            }), 500
-
-    try:
-        # 액세스 토큰 발급
-        access_token = get_access_token()
-        if not access_token:
-            return jsonify({
-                'error': '토큰 발급 실패'
-            }), 500
-
-        # JSON 데이터 받기
-        data = request.get_json()
+    return respond(codef_routes.stock_balance)
 
-        # 필수 필드 확인
-        required_fields = ['organization', 'connectedId', 'account', 'account_password']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'필수 필드가 누락되었습니다: {field}'
-                }), 400
-
-        # 계좌 비밀번호 암호화
-        encrypted_password = publicEncRSA(PUBLIC_KEY, data['account_password'])
-        if not encrypted_password:
-            return jsonify({
-                'error': '비밀번호 암호화 실패'
-            }), 500
-        
-
-        # API 요청 데이터
-        payload = {
-            'organization': data['organization'],
-            'connectedId': data['connectedId'],
-            'account': data['account'],
-            'account_password': encrypted_password,
-            'id': data.get('id', ''),  # 선택적 필드
-            'add_password': data.get('add_password', '')  # 선택적 필드
-        }
-
-        # API 요청
-        url = "https://development.codef.io/v1/kr/stock/a/account/balance-inquiry"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}'
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        decoded_response = urllib.parse.unquote(response.text)
-        print(jsonify(json.loads(decoded_response)))
-        return jsonify(json.loads(decoded_response))
-
-    except Exception as e:
-        return jsonify({
-            'error': str(e)
-        }), 500
+@app.route('/stock/balances', methods=['POST'])
+def stock_balances():
+    return respond(codef_routes.stock_balances)
 
 @app.route('/stock/create-and-list', methods=['POST'])
 def create_account_and_list():
-    # 더미 모드가 활성화된 경우
-    if USE_DUMMY_MODE:
-        try:
-            print("더미 모드: 계좌 생성 및 목록 조회 더미 데이터 반환")
-            data = request.get_json()
-            organization = data.get('organization', '0247')
-            
-            # API 호출 시뮬레이션을 위한 지연
-            simulate_api_delay()
-            
-            # 증권사에 따른 더미 계좌 목록 반환
-            account_list = DUMMY_ACCOUNT_LISTS.get(organization, ['20901920648'])
-            
-            return jsonify({
-                'connectedId': f'dummy_conn_{int(time.time())}',
-                'accountList': account_list
-            })
-            
-        except Exception as e:
-            return jsonify({
-                'error': f'더미 모드 에러: {str(e)}'
-            }), 500
-
-    try:
-        # 액세스 토큰 발급
-        access_token = get_access_token()
-        if not access_token:
-            return jsonify({
-                'error': '토큰 발급 실패'
-            }), 500
-
-        # JSON 데이터 받기
-        data = request.get_json()
-
-        # 필수 필드 확인
-        required_fields = ['id', 'password', 'organization']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'필수 필드가 누락되었습니다: {field}'
-                }), 400
-
-        # 비밀번호 암호화
-        encrypted_password = publicEncRSA(PUBLIC_KEY, data['password'])
-
-        # 계정 생성 API 요청 데이터
-        create_payload = {
-            'accountList': [
-                {
-                    'countryCode': "KR",
-                    'businessType': 'ST',
-                    'organization': data['organization'],
-                    'loginType': '1',
-                    'clientType': 'A',
-                    'id': data['id'],
-                    'password': encrypted_password
-                }
-            ]
-        }
-
-        # 계정 생성 API 요청
-        create_url = "https://development.codef.io/v1/account/create"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}'
-        }
-
-        create_response = requests.post(create_url, headers=headers, json=create_payload)
-        print("create_response.text:", create_response.text)  # 응답 확인
-        create_result = json.loads(urllib.parse.unquote(create_response.text))
-        print("create_result:", create_result)
-
-        # 계정 생성 실패 시
-        if create_result.get('result', {}).get('code') != 'CF-00000':
-            return jsonify(create_result), 400  # 400 등 클라이언트 에러로 반환
-
-        # connectedId 추출
-        connected_id = create_result.get('data', {}).get('connectedId')
-        if not connected_id:
-            print("connectedId 없음:", create_result)
-            return jsonify({
-                'error': 'connectedId를 찾을 수 없습니다.',
-                'detail': create_result
-            }), 500
-
-        # 계좌 목록 조회 API 요청 데이터
-        list_payload = {
-            'organization': data['organization'],
-            'connectedId': connected_id
-        }
-
-        # 계좌 목록 조회 API 요청
-        list_url = "https://development.codef.io/v1/kr/stock/a/account/account-list"
-        list_response = requests.post(list_url, headers=headers, json=list_payload)
-        list_result = json.loads(urllib.parse.unquote(list_response.text))
-
-        # 계좌 목록 추출
-        account_list = []
-        if list_result.get('result', {}).get('code') == 'CF-00000':
-            if 'data' in list_result:
-                if isinstance(list_result['data'], list):
-                    for account in list_result['data']:
-                        if 'resAccount' in account:
-                            account_list.append(account['resAccount'])
-                else:
-                    if 'resAccount' in list_result['data']:
-                        account_list.append(list_result['data']['resAccount'])
+    return respond(codef_routes.create_account_and_list)
 
-        return jsonify({
-            'connectedId': connected_id,
-            'accountList': account_list
-        })
+@app.route('/cache/status', methods=['GET'])
+def get_cache_status():
+    return jsonify(result_cache.stats())
 
-    except Exception as e:
-        return jsonify({
-            'error': str(e)
-        }), 500
+@app.route('/pipeline/status', methods=['GET'])
+def get_pipeline_status():
+    return jsonify(pipeline_stats.snapshot())
 
 # 더미 모드 상태 확인 및 제어 엔드포인트
 @app.route('/dummy-mode/status', methods=['GET'])
 def get_dummy_mode_status():
-    return jsonify({
-        'dummyMode': USE_DUMMY_MODE,
-        'message': '더미 모드가 활성화되어 있습니다.' if USE_DUMMY_MODE else 'Codef API가 정상 작동중입니다.'
-    })
+    return jsonify(codef_routes.dummy_mode_status(pipeline))
 
 @app.route('/dummy-mode/toggle', methods=['POST'])
 def toggle_dummy_mode():
-    global USE_DUMMY_MODE
-    USE_DUMMY_MODE = not USE_DUMMY_MODE
-    return jsonify({
-        'dummyMode': USE_DUMMY_MODE,
-        'message': f'더미 모드가 {"활성화" if USE_DUMMY_MODE else "비활성화"}되었습니다.'
-    })
+    return jsonify(codef_routes.toggle_dummy_mode(pipeline))
 
 if __name__ == '__main__':
-    print(f"Flask 서버 시작 - 더미 모드: {'활성화' if USE_DUMMY_MODE else '비활성화'}")
+    logger.info(f"Flask 서버 시작 - 더미 모드: {'활성화' if USE_DUMMY_MODE else '비활성화'}")
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+빈 검색어 목록(전체 종목 둘러보기)용 정렬 순서와 커서 페이지네이션
+
+로드 시점에 정렬 기준별 행 번호 순열(permutation)을 int32 배열로 만들어 둔다.
+    marcap  시가총액 내림차순 (시가총액 없는 종목은 뒤쪽) → 종목코드
+    name    종목명 (대소문자 무시) → 종목코드
+    ticker  종목코드 (대소문자 무시) → 종목명
+
+커서는 마지막으로 돌려준 행의 정렬 키 자체를 담는다 (keyset 페이지네이션).
+다음 페이지는 순열에서 그 키 바로 뒤 위치를 이진 탐색해 찾으므로 몇 번째 페이지든 비용이 같고,
+행 번호나 오프셋을 담지 않으므로 그 사이 마스터가 다시 로드되어도 같은 기준으로 이어서 읽는다
+(새로 생긴 종목은 순서 자리에 끼고, 사라진 종목은 빠질 뿐 앞 페이지와 중복/누락되지 않음).
+키 전체가 같은 중복 행은 한 페이지 경계에 걸치면 뒤쪽 행이 빠질 수 있다.
+"""
+import base64
+import json
+from bisect import bisect_right
+
+import numpy as np
+
+from compact import int32_view
+from search_engine import marcap_order
+
+SORT_MARCAP = 'marcap'
+SORT_NAME = 'name'
+SORT_TICKER = 'ticker'
+SORTS = (SORT_MARCAP, SORT_NAME, SORT_TICKER)
+
+# 정렬 기준별 커서 키의 값 타입
+_KEY_TYPES = {
+    SORT_MARCAP: (int, int, str),
+    SORT_NAME: (str, str),
+    SORT_TICKER: (str, str),
+}
+
+
+class CursorError(ValueError):
+    """정렬 기준이나 커서가 잘못되었을 때 (HTTP 400)"""
+
+
+def encode_cursor(sort, key):
+    """정렬 기준과 키를 URL 에 그대로 쓸 수 있는 불투명 문자열로"""
+    raw = json.dumps([sort, *key], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor, sort):
+    """encode_cursor 결과를 키 튜플로 (다른 정렬 기준의 커서이거나 형식이 틀리면 CursorError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw.decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise CursorError('잘못된 cursor 값입니다.')
+
+    types = _KEY_TYPES[sort]
+    if (not isinstance(values, list) or len(values) != len(types) + 1 or values[0] != sort
+            or not all(type(value) is t for value, t in zip(values[1:], types))):
+        raise CursorError('잘못된 cursor 값입니다.')
+    return tuple(values[1:])
+
+
+def group_ranks(keys, rows):
+    """정렬된 (키, 행 번호) 배열로 행 번호별 키 순위 (같은 키는 같은 순위)"""
+    ranks = np.empty(len(keys), dtype=np.int64)
+    previous, rank = None, -1
+    for i, key in enumerate(keys):
+        if key != previous:
+            previous, rank = key, rank + 1
+        ranks[i] = rank
+    by_row = np.empty(len(keys), dtype=np.int64)
+    by_row[np.asarray(rows)] = ranks
+    return by_row
+
+
+class StockBrowser:
+    """한 지역 SearchEngine 의 정렬 배열로 만든 전체 목록 순열 (읽기 전용)"""
+
+    def __init__(self, engine):
+        index = engine.index
+        self.index = index
+
+        # 접두어 검색용 정렬 배열을 재사용해 문자열을 다시 정렬하지 않고 순위만 매긴다
+        name_ranks = group_ranks(*engine.sorted_names())
+        ticker_ranks = group_ranks(*engine.sorted_tickers())
+        marcaps = np.asarray(index.marcaps)
+        missing = marcaps < 0
+
+        self.orders = {
+            SORT_MARCAP: int32_view(np.lexsort((ticker_ranks, -np.where(missing, 0, marcaps), missing))),
+            SORT_NAME: int32_view(np.lexsort((ticker_ranks, name_ranks))),
+            SORT_TICKER: int32_view(np.lexsort((name_ranks, ticker_ranks))),
+        }
+        self._keys = {
+            SORT_MARCAP: self._marcap_key,
+            SORT_NAME: lambda row: (index.names_lower[row], index.tickers_lower[row]),
+            SORT_TICKER: lambda row: (index.tickers_lower[row], index.names_lower[row]),
+        }
+
+    def _marcap_key(self, row):
+        return (*marcap_order(self.index.marcaps, row), self.index.tickers_lower[row])
+
+    def memory_usage(self):
+        """순열 버퍼 크기 (바이트)"""
+        return {'orders': sum(order.nbytes for order in self.orders.values())}
+
+    def cursor_after(self, sort, row):
+        """행 row 까지 받았을 때 다음 페이지를 가리키는 커서"""
+        return encode_cursor(sort, self._keys[sort](row))
+
+    def page(self, sort=SORT_MARCAP, cursor=None, limit=30):
+        """정렬 기준 sort 로 cursor 다음부터 limit 개 행 번호와 다음 페이지 커서 (마지막이면 None)"""
+        if sort not in self.orders:
+            raise CursorError('잘못된 sort 값입니다.')
+        order, key = self.orders[sort], self._keys[sort]
+
+        start = 0 if cursor is None else bisect_right(order, decode_cursor(cursor, sort), key=key)
+        rows = order[start:start + limit].tolist()
+        if not rows or start + len(rows) >= len(order):
+            return rows, None
+        return rows, self.cursor_after(sort, rows[-1])
@@ -0,0 +1,208 @@
+"""
+검색 인덱스용 메모리 절약형 읽기 전용 컨테이너
+
+종목 수만큼 str/int/tuple 객체를 만들면 객체 헤더가 실제 데이터보다 커지고,
+prefork 워커에서는 참조 카운트 갱신 때문에 부모와 공유하던 페이지가 워커마다 복사된다.
+여기의 컨테이너는 컬럼 하나를 큰 버퍼 한두 개로 저장하고, 조회할 때만 값 하나를 꺼낸다.
+
+- PackedText: 문자열들을 이어 붙인 str 하나 + 경계 오프셋 (조회는 str 슬라이스)
+- PackedBytes: 행별 JSON 조각을 이어 붙인 bytes 하나 + 경계 오프셋
+- Postings: n-gram → 행 번호 목록 역색인 (int32 배열 하나 + gram 별 구간)
+- HashIndex: 문자열 키 → 위치 (정렬된 64bit 해시 배열 + 상위 비트 디렉터리, 키 문자열은 저장하지 않음)
+
+모두 시퀀스(len / [i] / 반복) 또는 dict 의 get 과 같은 모양이라 검색 코드는 tuple/dict 일 때와 같다.
+"""
+import ctypes
+import gc
+import sys
+from array import array
+
+import numpy as np
+
+
+# hash() 값(부호 있는 64bit)을 부호 없는 값으로 바꿀 때 쓰는 마스크
+_UINT64 = (1 << 64) - 1
+
+
+def release_free_memory():
+    """색인을 만들며 생긴 임시 객체가 남긴 빈 힙 공간을 OS 에 돌려준다
+
+    큰 버퍼 몇 개만 남고 행 단위 임시 객체는 모두 해제되지만, glibc 는 해제된 힙을 바로 돌려주지 않아
+    RSS 가 최종 색인 크기의 몇 배로 남는다. glibc 가 아니면(malloc_trim 이 없으면) 아무것도 하지 않는다.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _offsets(lengths):
+    """길이 목록 → 경계 오프셋 array('q') (길이 = 개수 + 1)"""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return array('q', offsets.tobytes())
+
+
+class PackedText:
+    """읽기 전용 문자열 시퀀스 (이어 붙인 str 하나 + 오프셋)"""
+
+    __slots__ = ('_text', '_offsets')
+
+    def __init__(self, values):
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        self._text = ''.join(values)
+        self._offsets = _offsets([len(v) for v in values])
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        offsets = self._offsets
+        return self._text[offsets[i]:offsets[i + 1]]
+
+    def __iter__(self):
+        text, offsets = self._text, self._offsets
+        for i in range(len(offsets) - 1):
+            yield text[offsets[i]:offsets[i + 1]]
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedText):
+            return NotImplemented
+        return self._text == other._text and self._offsets == other._offsets
+
+    __hash__ = None
+
+    @property
+    def nbytes(self):
+        # str 은 가장 큰 코드 포인트에 따라 글자당 1/2/4 바이트로 저장된다 (PEP 393)
+        return sys.getsizeof(self._text) + len(self._offsets) * 8
+
+
+class PackedBytes:
+    """읽기 전용 bytes 시퀀스 (이어 붙인 bytes 하나 + 오프셋)"""
+
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self, values):
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        self._data = b''.join(values)
+        self._offsets = _offsets([len(v) for v in values])
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        offsets = self._offsets
+        return self._data[offsets[i]:offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self._data) + len(self._offsets) * 8
+
+
+def int32_view(values):
+    """정수 배열을 반복/슬라이스 시 파이썬 int 를 돌려주는 int32 memoryview 로"""
+    return memoryview(np.ascontiguousarray(values, dtype=np.int32)).cast('B').cast('i')
+
+
+class Postings:
+    """gram → 행 번호 목록 역색인 (get 은 int32 memoryview 구간을 복사 없이 반환)"""
+
+    __slots__ = ('_ids', '_rows', '_offsets')
+
+    def __init__(self, ids, rows, offsets):
+        self._ids = ids
+        self._rows = rows
+        self._offsets = offsets
+
+    @classmethod
+    def build(cls, row_grams):
+        """(행 번호, gram 목록) 을 posting 순서대로 받아 색인 생성
+
+        gram 을 정수 id 로 바꿔 (id, 행) 쌍을 int32 배열에 모은 뒤 안정 정렬하므로,
+        gram 별 행 순서는 입력 순서 그대로이고 중간에 gram 별 파이썬 리스트를 만들지 않는다.
+        """
+        ids = {}
+        gram_ids = array('i')
+        rows = array('i')
+        for row, grams in row_grams:
+            for gram in grams:
+                gram_id = ids.get(gram)
+                if gram_id is None:
+                    gram_id = ids[gram] = len(ids)
+                gram_ids.append(gram_id)
+                rows.append(row)
+
+        gram_ids = np.frombuffer(gram_ids, dtype=np.int32)
+        order = np.argsort(gram_ids, kind='stable')
+        sorted_rows = np.frombuffer(rows, dtype=np.int32)[order]
+        offsets = _offsets(np.bincount(gram_ids, minlength=len(ids)))
+        return cls(ids, int32_view(sorted_rows), offsets)
+
+    def get(self, gram, default=None):
+        gram_id = self._ids.get(gram)
+        if gram_id is None:
+            return default
+        return self._rows[self._offsets[gram_id]:self._offsets[gram_id + 1]]
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def nbytes(self):
+        return self._rows.nbytes + len(self._offsets) * 8
+
+
+class HashIndex:
+    """문자열 키 → 위치 목록
+
+    dict 대신 (hash(키), 위치) 를 해시 순으로 정렬한 uint64/int32 배열로 보관하고,
+    해시 상위 비트별 시작 위치(디렉터리)로 구간을 바로 찾는다 (항목당 약 16~20 바이트, 조회 O(1)).
+    해시가 같은 위치를 모두 돌려주므로 호출하는 쪽에서 실제 키를 한 번 더 비교한다.
+    hash() 는 프로세스마다 달라지므로 색인은 만든 프로세스(와 fork 한 워커) 안에서만 쓴다.
+    """
+
+    __slots__ = ('_hashes', '_positions', '_directory', '_shift')
+
+    def __init__(self, keys):
+        """keys[i] 가 위치 i 의 키 (None 이나 빈 문자열은 등록하지 않음)"""
+        positions = np.array([i for i, key in enumerate(keys) if key], dtype=np.int64)
+        hashes = np.fromiter((hash(keys[i]) & _UINT64 for i in positions.tolist()),
+                             dtype=np.uint64, count=len(positions))
+        # 같은 해시 안에서는 위치 순서 (중복 키는 앞선 위치가 먼저)
+        order = np.lexsort((positions, hashes))
+        hashes = hashes[order]
+
+        # 디렉터리 칸 수는 항목 수 이상인 2 의 거듭제곱 (칸당 평균 1 개 이하)
+        bits = max(1, int(len(hashes)).bit_length())
+        self._shift = 64 - bits
+        buckets = hashes >> np.uint64(self._shift)
+        directory = np.searchsorted(buckets, np.arange((1 << bits) + 1, dtype=np.uint64))
+
+        self._hashes = memoryview(np.ascontiguousarray(hashes)).cast('B').cast('Q')
+        self._positions = int32_view(positions[order])
+        self._directory = int32_view(directory)
+
+    def get(self, key):
+        """키의 해시와 같은 위치 목록 (위치 순서)"""
+        h = hash(key) & _UINT64
+        bucket = h >> self._shift
+        i, end = self._directory[bucket], self._directory[bucket + 1]
+        found = []
+        while i < end:
+            if self._hashes[i] == h:
+                found.append(self._positions[i])
+            i += 1
+        return found
+
+    def __len__(self):
+        return len(self._hashes)
+
+    @property
+    def nbytes(self):
+        return self._hashes.nbytes + self._positions.nbytes + self._directory.nbytes
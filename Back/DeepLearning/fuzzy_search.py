@@ -0,0 +1,191 @@
+"""
+초성/자모/오타 허용 검색 엔진 (mode=fuzzy)
+
+로드 시점에 종목명을 자모 분해 문자열과 초성 문자열로 바꿔 n-gram 역색인을 만들어 둔다.
+요청 시에는 역색인으로 후보를 좁힌 뒤 후보에 대해서만 편집 거리를 계산한다.
+"""
+import heapq
+
+from compact import PackedText
+from hangul import decompose, chosung, is_chosung_query
+from search_engine import (
+    GRAM_SIZE, TIER_PREFIX, TIER_SUBSTRING, build_gram_index, sorted_keys, prefix_rows, substring_rows
+)
+
+# 오타 허용 일치 등급 (접두어/부분 일치 다음)
+TIER_TYPO = 3
+
+# 오타 허용 검색을 시작하는 최소 자모 길이
+MIN_TYPO_LENGTH = 4
+
+# 오타 후보를 셀 때 gram 하나당 훑는 posting 길이 상한
+# (posting 은 시가총액 순서라 상위 종목부터 후보가 된다)
+MAX_TYPO_POSTING_SCAN = 2000
+
+# 편집 거리를 실제로 계산하는 후보 수 상한
+MAX_TYPO_CANDIDATES = 50
+
+
+def _fold(text):
+    """검색용 정규화: 소문자 + 공백 제거"""
+    return ''.join(text.lower().split())
+
+
+def max_edit_distance(length):
+    """자모 길이에 따른 허용 편집 거리 (4~9: 1, 10 이상: 2)"""
+    if length < MIN_TYPO_LENGTH:
+        return 0
+    return 1 if length < 10 else 2
+
+
+def substring_distance(pattern, text, max_dist):
+    """text 의 어느 부분 문자열과 pattern 사이의 최소 편집 거리
+
+    Myers 의 비트 병렬 알고리즘으로 text 길이에 비례하는 시간에 계산한다.
+    max_dist 를 넘으면 None 을 반환한다.
+    """
+    m = len(pattern)
+    if m == 0:
+        return 0
+
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    best = m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        if score < best:
+            best = score
+            if best == 0:
+                break
+    return best if best <= max_dist else None
+
+
+class FuzzySearchEngine:
+    """SearchEngine 과 같은 StockIndex 위에 만든 자모/초성 색인"""
+
+    def __init__(self, engine, gram_size=GRAM_SIZE):
+        index = engine.index
+        self.index = index
+        self.engine = engine
+        self.gram_size = gram_size
+        self.marcap_ranks = engine.marcap_ranks
+
+        self.jamo_names = PackedText(decompose(_fold(name)) for name in index.names)
+        self._jamo_keys, self._jamo_rows = sorted_keys(self.jamo_names)
+        self._jamo_grams = build_gram_index(self.jamo_names, self.marcap_ranks, gram_size)
+
+        chosung_names = PackedText(chosung(_fold(name)) for name in index.names)
+        if chosung_names == self.jamo_names:
+            # 한글이 없는 종목명(해외)은 자모 분해와 초성이 같으므로 색인을 공유한다
+            self.chosung_names = self.jamo_names
+            self._chosung_keys, self._chosung_rows = self._jamo_keys, self._jamo_rows
+            self._chosung_grams = self._jamo_grams
+        else:
+            self.chosung_names = chosung_names
+            self._chosung_keys, self._chosung_rows = sorted_keys(chosung_names)
+            self._chosung_grams = build_gram_index(chosung_names, self.marcap_ranks, gram_size)
+
+    def memory_usage(self):
+        """자모/초성 색인 버퍼 크기 (바이트, 공유하는 색인은 한 번만)"""
+        parts = {id(part): part for part in (
+            self.jamo_names, self._jamo_keys, self._jamo_rows, self._jamo_grams,
+            self.chosung_names, self._chosung_keys, self._chosung_rows, self._chosung_grams,
+        )}
+        return {'jamoChosung': sum(part.nbytes for part in parts.values())}
+
+    def _typo_rows(self, keyword, needed, exclude):
+        """q-gram 필터로 후보를 고른 뒤 편집 거리 이내인 행을 최대 needed 개 [(등급 키, 행 번호)] 로 반환
+
+        후보는 일치하는 gram 수가 많은 순서로 검증하고 needed 개를 채우면 멈춘다.
+        결과는 (편집 거리, -일치 gram 수, 시가총액 순위) 순서로 정렬하고,
+        등급 키는 (TIER_TYPO, 편집 거리, -일치 gram 수) 이다.
+        """
+        max_dist = max_edit_distance(len(keyword))
+        if not max_dist:
+            return []
+
+        # 편집 거리 k 이내라면 bigram 중 최소 (m - 1) - 2k 개는 그대로 남는다
+        grams = [keyword[i:i + 2] for i in range(len(keyword) - 1)]
+        threshold = max(1, len(grams) - 2 * max_dist)
+
+        counts = {}
+        for gram in set(grams):
+            for row in self._jamo_grams.get(gram, ())[:MAX_TYPO_POSTING_SCAN]:
+                counts[row] = counts.get(row, 0) + 1
+
+        candidates = heapq.nsmallest(
+            MAX_TYPO_CANDIDATES,
+            (row for row, count in counts.items() if count >= threshold and row not in exclude),
+            key=lambda row: (-counts[row], self.marcap_ranks[row])
+        )
+
+        found = []
+        dist_of = {}
+        for row in candidates:
+            dist = dist_of[row] = substring_distance(keyword, self.jamo_names[row], max_dist)
+            if dist is not None:
+                found.append(row)
+                if len(found) == needed:
+                    break
+        found.sort(key=lambda row: (dist_of[row], -counts[row], self.marcap_ranks[row]))
+        return [((TIER_TYPO, dist_of[row], -counts[row]), row) for row in found]
+
+    def search(self, query, limit=30):
+        """초성/자모/오타 허용 검색 결과 상위 limit 개 행 번호를 랭킹 순서로 반환"""
+        if not _fold(query):
+            return self.engine.search(query, limit)
+        return [row for stage in self.stages(query, limit) for _, row in stage]
+
+    def stages(self, query, limit=30):
+        """검색 단계별 [(등급 키, 행 번호)] 목록을 차례로 생성 (SearchEngine.stages 와 같은 규칙)"""
+        folded = _fold(query)
+        if not folded:
+            yield from self.engine.stages(query, limit)
+            return
+
+        by_chosung = is_chosung_query(folded)
+        if by_chosung:
+            keyword, keys, rows, postings, texts = (
+                folded, self._chosung_keys, self._chosung_rows, self._chosung_grams, self.chosung_names
+            )
+        else:
+            keyword, keys, rows, postings, texts = (
+                decompose(folded), self._jamo_keys, self._jamo_rows, self._jamo_grams, self.jamo_names
+            )
+
+        ranks = self.marcap_ranks
+
+        # 1) 종목코드 접두어 + 자모/초성 접두어
+        prefix = set(self.engine.ticker_prefix(folded))
+        prefix.update(prefix_rows(keys, rows, keyword))
+        ranked = heapq.nsmallest(limit, prefix, key=ranks.__getitem__)
+        yield [((TIER_PREFIX,), row) for row in ranked]
+
+        # 2) 자모/초성 부분 일치
+        needed = limit - len(ranked)
+        if needed > 0:
+            substring = substring_rows(postings, texts, keyword, needed, prefix, self.gram_size)
+            yield [((TIER_SUBSTRING,), row) for row in substring]
+            ranked += substring
+            needed -= len(substring)
+
+        # 3) 오타 허용 (초성 검색은 제외)
+        if needed > 0 and not by_chosung:
+            yield self._typo_rows(keyword, needed, set(ranked))
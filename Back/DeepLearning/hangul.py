@@ -0,0 +1,60 @@
+"""
+한글 자모 분해 유틸리티
+
+완성형 한글 음절을 키보드 입력 단위의 호환 자모로 분해한다.
+(예: "삼성" → "ㅅㅏㅁㅅㅓㅇ", 초성: "ㅅㅅ")
+"""
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSUNG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+            'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+# 두 번 눌러 입력하는 겹모음/겹받침은 낱자로 풀어 부분 입력과도 일치하게 한다
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+# 초성 검색어로 인정하는 자음
+CONSONANTS = frozenset(CHOSUNG)
+
+
+def _split(jamo):
+    return COMPOUND_JAMO.get(jamo, jamo)
+
+
+def decompose(text):
+    """문자열을 호환 자모 단위로 분해 (한글이 아닌 문자는 그대로 유지)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSUNG[offset // 588])
+            out.append(_split(JUNGSUNG[(offset % 588) // 28]))
+            out.append(_split(JONGSUNG[offset % 28]))
+        else:
+            out.append(_split(ch))
+    return ''.join(out)
+
+
+def chosung(text):
+    """음절마다 초성만 남긴 문자열 (한글이 아닌 문자는 그대로 유지)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def is_chosung_query(text):
+    """검색어가 자음(초성)으로만 이루어졌는지 여부"""
+    return bool(text) and all(ch in CONSONANTS for ch in text)
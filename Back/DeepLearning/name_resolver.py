@@ -0,0 +1,137 @@
+"""
+증권사 잔고의 종목명 → 종목코드 변환 색인
+
+CODEF 잔고 조회 응답은 보유 종목을 표시 이름(resIsName: "삼성전자", "NAVER")으로만 알려준다.
+마스터 로드 시점에 정규화한 종목명 → 행 번호 해시 색인을 만들어 두고, 요청 시에는 종목마다
+해시 조회 몇 번으로 종목코드를 찾는다.
+
+정규화: NFKC(전각/㈜ 등 호환 문자 통일) → 소문자 → "(주)", "주식회사" 제거 → 글자/숫자 외 문자 제거
+해외 종목명은 "Apple Inc. Common Stock" 처럼 법인 형태/주식 종류가 붙어 있으므로,
+끝의 "Inc.", "Common Stock", "Class A" 등을 뗀 별칭도 함께 등록한다 ("apple" 로도 찾음).
+완전한 이름이 먼저이고, 별칭은 완전한 이름으로 찾지 못했을 때만 사용한다 (입력 쪽 접미어도 같은 규칙으로 뗌).
+
+같은 키에 종목이 여러 개면(예: "Alphabet" → GOOGL/GOOG) 추측하지 않고 ambiguous 로 표시한다.
+"""
+import re
+import unicodedata
+
+from compact import HashIndex
+
+MATCHED = 'matched'
+AMBIGUOUS = 'ambiguous'
+UNMATCHED = 'unmatched'
+
+# ambiguous 응답에 넣는 후보 수 (시가총액 순)
+MAX_CANDIDATES = 5
+
+_CORPORATE_MARKERS = re.compile(r'\(주\)|주식회사')
+_NON_WORD = re.compile(r'[\W_]+')
+
+# 해외 종목명 끝에서 떼어내는 법인 형태/주식 종류 단어
+US_SUFFIX_WORDS = frozenset((
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited', 'plc',
+    'llc', 'lp', 'sa', 'nv', 'ag', 'se', 'common', 'ordinary', 'stock', 'shares', 'share',
+    'capital', 'voting', 'new',
+))
+
+
+def normalize_name(name):
+    """종목명 비교용 키 (공백/문장부호/대소문자/전각 차이를 무시)"""
+    text = unicodedata.normalize('NFKC', name or '').lower()
+    return _NON_WORD.sub('', _CORPORATE_MARKERS.sub('', text))
+
+
+def alias_name(name):
+    """끝의 법인 형태/주식 종류("Inc. Class A Common Stock" 등)를 뗀 키, 뗄 것이 없으면 None"""
+    words = _NON_WORD.sub(' ', unicodedata.normalize('NFKC', name or '').lower()).split()
+    end = len(words)
+    while end > 1:
+        if words[end - 1] in US_SUFFIX_WORDS:
+            end -= 1
+        elif end > 2 and words[end - 2] == 'class' and len(words[end - 1]) == 1:
+            end -= 2
+        else:
+            break
+    if end == len(words):
+        return None
+    return ''.join(words[:end])
+
+
+class NameResolver:
+    """KR/US StockIndex 의 종목명 → (region, 행 번호) 색인 (읽기 전용)
+
+    지역마다 정규화한 이름과 별칭의 HashIndex 만 두고 키 문자열은 저장하지 않는다.
+    해시가 같은 행은 그 행의 종목명으로 키를 다시 만들어 비교한다.
+    """
+
+    def __init__(self, indexes):
+        self.indexes = {index.region: index for index in indexes}
+        self._exact = {}
+        self._alias = {}
+        for region, index in self.indexes.items():
+            keys = [normalize_name(name) for name in index.names]
+            aliases = [alias_name(name) for name in index.names]
+            self._exact[region] = HashIndex(keys)
+            self._alias[region] = HashIndex([
+                short if short != key else None for key, short in zip(keys, aliases)
+            ])
+
+    def __len__(self):
+        return sum(len(table) for table in self._exact.values())
+
+    def _lookup(self, tables, make_key, key, region):
+        found = []
+        for index_region, index in self.indexes.items():
+            if region is not None and index_region != region:
+                continue
+            for row in tables[index_region].get(key):
+                if make_key(index.names[row]) == key:
+                    found.append((index_region, row))
+        return found
+
+    def candidates(self, name, region=None):
+        """종목명과 일치하는 (region, 행 번호) 목록 (region 을 주면 그 지역만)"""
+        key = normalize_name(name)
+        short = alias_name(name)
+        # 입력에도 "Inc." 등이 붙어 있으면 뗀 형태로 한 번 더 찾는다
+        keys = (key,) if not short or short == key else (key, short)
+        for lookup in keys:
+            for tables, make_key in ((self._exact, normalize_name), (self._alias, alias_name)):
+                rows = self._lookup(tables, make_key, lookup, region)
+                if rows:
+                    return rows
+        return []
+
+    def memory_usage(self):
+        """색인 버퍼 크기 (바이트)"""
+        return {
+            'exact': sum(table.nbytes for table in self._exact.values()),
+            'alias': sum(table.nbytes for table in self._alias.values()),
+        }
+
+    def stock(self, region, row):
+        index = self.indexes[region]
+        return {
+            'ticker': index.tickers[row],
+            'name': index.names[row],
+            'region': region,
+            'marketCap': index.marcap(row),
+        }
+
+    def resolve(self, name, region=None):
+        """종목명 하나를 {'status', 'ticker', 'name', 'region', 'marketCap', 'candidates'} 로 변환"""
+        rows = self.candidates(name, region)
+        if len(rows) == 1:
+            return {'status': MATCHED, **self.stock(*rows[0])}
+        if not rows:
+            return {'status': UNMATCHED}
+        # 같은 종목이 두 번 등록된 마스터 행은 하나로 본다
+        stocks = {}
+        for entry in rows:
+            stock = self.stock(*entry)
+            stocks.setdefault((stock['region'], stock['ticker']), stock)
+        if len(stocks) == 1:
+            return {'status': MATCHED, **next(iter(stocks.values()))}
+        ranked = sorted(stocks.values(), key=lambda s: (s['marketCap'] is None, -(s['marketCap'] or 0)))
+        return {'status': AMBIGUOUS, 'candidates': ranked[:MAX_CANDIDATES]}
+
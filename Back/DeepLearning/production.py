@@ -0,0 +1,139 @@
+"""
+운영용 멀티 워커 실행 (prefork)
+
+마스터 프로세스가 종목 인덱스를 먼저 만들고 소켓을 연 다음 워커를 fork 한다.
+워커는 부모가 만든 인덱스를 copy-on-write 로 공유하므로 각자 다시 로드하지 않는다.
+
+- SIGTERM/SIGINT: 모든 워커에 SIGTERM 을 보내 처리 중인 요청을 마치고 종료
+- 워커가 비정상 종료하면 새 워커를 다시 띄운다
+- 데이터 변경 확인(poll)은 마스터에서만 한다. 마스터가 새 인덱스를 만들면 워커를 하나씩 새로 fork 하고
+  기존 워커는 SIGTERM 으로 처리 중인 요청을 마친 뒤 종료시킨다 (워커마다 따로 다시 로드하지 않음)
+- fork 를 지원하지 않는 OS(Windows)에서는 uvicorn 의 기본 멀티 워커로 실행
+"""
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+# 종료 신호 후 처리 중인 요청을 기다리는 최대 시간 (초)
+GRACEFUL_TIMEOUT = float(os.getenv('GRACEFUL_TIMEOUT', '20'))
+
+logger = logging.getLogger(__name__)
+
+
+def _bind(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock):
+    # 부모의 시그널 처리기를 기본값으로 되돌리고 uvicorn 이 직접 처리하게 한다
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(
+        app,
+        access_log=False,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock):
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(app, app_path, host, port, workers, preload, poll=None, poll_interval=0):
+    """workers 개 프로세스로 app 실행
+
+    preload() 는 fork 전에 마스터에서 한 번 호출된다 (인덱스 로드).
+    poll() 은 poll_interval 초마다 마스터에서 호출되며, True 를 반환하면(데이터를 다시 로드했으면)
+    워커를 차례로 교체해 새 워커가 새 인덱스를 공유하게 한다.
+    """
+    if not hasattr(os, 'fork'):
+        uvicorn.run(app_path, host=host, port=port, workers=workers,
+                    timeout_graceful_shutdown=GRACEFUL_TIMEOUT)
+        return
+
+    started = time.perf_counter()
+    preload()
+    logger.info(f"인덱스 로드 완료 ({time.perf_counter() - started:.2f}s), 워커 {workers}개 시작")
+
+    sock = _bind(host, port)
+    children = {_spawn(app, sock) for _ in range(workers)}
+    # 교체되어 종료 중인 워커 (종료해도 다시 띄우지 않음)
+    retiring = set()
+    stopping = False
+    next_poll = time.monotonic() + poll_interval
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children | retiring):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    deadline = None
+    while children or retiring:
+        if stopping and deadline is None:
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT + 5
+
+        if poll is not None and poll_interval > 0 and not stopping and time.monotonic() >= next_poll:
+            if poll():
+                logger.info(f"인덱스를 다시 로드했습니다, 워커 {len(children)}개를 교체합니다")
+                for old in list(children):
+                    children.add(_spawn(app, sock))
+                    children.discard(old)
+                    retiring.add(old)
+                    try:
+                        os.kill(old, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+            next_poll = time.monotonic() + poll_interval
+
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+
+        if pid == 0:
+            if deadline is not None and time.monotonic() > deadline:
+                # 정해진 시간 안에 끝나지 않은 워커는 강제 종료
+                for child in children | retiring:
+                    try:
+                        os.kill(child, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+            time.sleep(0.2)
+            continue
+
+        if pid in retiring:
+            retiring.discard(pid)
+            continue
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"워커 {pid} 종료 (status={status}), 다시 시작합니다")
+            children.add(_spawn(app, sock))
+
+    sock.close()
@@ -0,0 +1,302 @@
+"""
+목표 비중 리밸런싱 주문 계산 (NumPy 벡터화)
+
+보유 종목/현금과 목표 비중으로 정수 주 단위 매수/매도 주문을 만든다.
+포트폴리오 여러 개를 (포트폴리오 x 종목) 2차원 배열로 묶어 한 번에 계산하므로
+야간 배치처럼 수천 개를 계획할 때도 파이썬 루프는 입력 변환과 결과 조립에만 쓴다.
+
+계산 순서 (포트폴리오마다 같은 규칙):
+1) 평가금액 = Σ 가격 x 수량 + 현금 (원화 기준, 해외주식/달러는 fxRate 로 환산)
+2) 현재 비중과 목표 비중 차이가 driftBand 이하인 종목은 거래하지 않는다 (거래 수 최소화)
+3) 나머지는 목표 수량 이하가 되도록 내림한 정수 주로 맞춘다 (매도 대금이 매수 재원이 됨)
+4) 수수료 포함 매수 금액이 (현금 - 목표 현금) 을 넘으면 매수 수량을 같은 비율로 줄인다
+5) 남은 예산으로 목표까지 반 주 이상 모자란 종목을 부족 금액이 큰 순서대로 한 주씩 더 산다
+6) 거래 금액이 minTradeValue 미만인 주문은 내지 않는다
+
+같은 종목을 사고파는 왕복 거래는 만들지 않으며, 현금이 음수가 되는 계획은 만들지 않는다.
+"""
+import numpy as np
+
+REGION_CASH = 0
+REGION_KR = 1
+REGION_US = 2
+
+# 지역별 거래 통화와 현금 종목코드 (search_stocks 의 region 0 항목과 같은 코드)
+CURRENCIES = {REGION_KR: 'KRW', REGION_US: 'USD'}
+CASH_TICKERS = ('KRW', 'USD')
+
+# 기본 거래 비용 (매수/매도 금액 대비, 리밸런싱 초안 노트북의 transaction_costs 와 같은 값)
+DEFAULT_FEE_RATE = 0.003
+
+# 부동소수점 오차로 9.9999999 주가 9 주로 내려가지 않도록 더하는 값
+_EPSILON = 1e-9
+
+
+class PlanError(ValueError):
+    """입력으로 계획을 만들 수 없을 때 (HTTP 400)"""
+
+
+class Portfolio:
+    """리밸런싱 입력 하나를 배열로 정리한 것 (종목 순서는 keys 와 같음)"""
+
+    __slots__ = ('keys', 'prices', 'fx', 'quantities', 'weights', 'cash', 'cash_weight',
+                 'fee_rate', 'drift_band', 'min_trade_value')
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _normalize_ticker(ticker, region):
+    ticker = str(ticker).strip()
+    return ticker.upper() if region != REGION_KR else ticker
+
+
+def parse_portfolio(data, price_lookup=None, fx_rate=None, fee_rate=DEFAULT_FEE_RATE,
+                    drift_band=0.0, min_trade_value=0.0):
+    """요청 dict 를 Portfolio 로 변환 (잘못된 입력이면 PlanError)
+
+    data: {'holdings': [{ticker, region, quantity, price?}], 'targets': [{ticker, region, weight, price?}],
+           'fxRate'?, 'feeRate'?, 'driftBand'?, 'minTradeValue'?}
+    현금은 region 0 의 KRW/USD 항목이며 quantity 가 금액이다.
+    가격이 없는 종목은 price_lookup(region, ticker) 로 채운다 (없으면 None).
+    fx_rate 등 키워드 인자는 data 에 값이 없을 때 쓰는 기본값이다.
+    """
+    def option(name, default):
+        value = data.get(name)
+        return default if value is None else value
+
+    fx = option('fxRate', fx_rate)
+    needs_fx = False
+
+    assets = {}
+    cash = 0.0
+    cash_weight = 0.0
+
+    def asset(region, ticker):
+        key = (region, _normalize_ticker(ticker, region))
+        entry = assets.get(key)
+        if entry is None:
+            entry = assets[key] = {'quantity': 0.0, 'weight': 0.0, 'price': None}
+        return entry
+
+    for holding in data.get('holdings') or ():
+        region = int(holding['region'])
+        quantity = float(holding.get('quantity') or 0)
+        if region == REGION_CASH:
+            currency = _normalize_ticker(holding['ticker'], region)
+            if currency not in CASH_TICKERS:
+                raise PlanError(f"알 수 없는 현금 종목입니다: {holding['ticker']}")
+            if currency == 'USD':
+                needs_fx = True
+                cash += quantity * (fx or 0)
+            else:
+                cash += quantity
+            continue
+        if region not in CURRENCIES:
+            raise PlanError(f'잘못된 region 값입니다: {region}')
+        entry = asset(region, holding['ticker'])
+        entry['quantity'] += quantity
+        if holding.get('price'):
+            entry['price'] = float(holding['price'])
+
+    for target in data.get('targets') or ():
+        region = int(target['region'])
+        weight = float(target.get('weight') or 0)
+        if region == REGION_CASH:
+            cash_weight += weight
+            continue
+        if region not in CURRENCIES:
+            raise PlanError(f'잘못된 region 값입니다: {region}')
+        entry = asset(region, target['ticker'])
+        entry['weight'] += weight
+        if target.get('price') and entry['price'] is None:
+            entry['price'] = float(target['price'])
+
+    asset_weight = sum(entry['weight'] for entry in assets.values())
+    if asset_weight + cash_weight > 1 + 1e-6:
+        raise PlanError(f'목표 비중의 합이 1 을 넘습니다: {asset_weight + cash_weight:.6f}')
+
+    for (region, ticker), entry in assets.items():
+        if entry['price'] is None and price_lookup is not None:
+            entry['price'] = price_lookup(region, ticker)
+        if not entry['price'] or entry['price'] <= 0:
+            raise PlanError(f'가격 정보가 없습니다: {ticker}')
+        needs_fx = needs_fx or region == REGION_US
+
+    if needs_fx and not fx:
+        raise PlanError('해외주식/달러 현금이 있으면 fxRate(원/달러)가 필요합니다.')
+
+    portfolio = Portfolio()
+    portfolio.keys = list(assets)
+    portfolio.prices = np.array([entry['price'] for entry in assets.values()], dtype=np.float64)
+    portfolio.fx = np.array([fx if region == REGION_US else 1.0 for region, _ in assets], dtype=np.float64)
+    portfolio.quantities = np.array([entry['quantity'] for entry in assets.values()], dtype=np.float64)
+    portfolio.weights = np.array([entry['weight'] for entry in assets.values()], dtype=np.float64)
+    portfolio.cash = cash
+    # 목표 비중을 다 채우지 않으면 나머지는 현금으로 둔다
+    portfolio.cash_weight = max(0.0, 1.0 - asset_weight)
+    portfolio.fee_rate = float(option('feeRate', fee_rate))
+    portfolio.drift_band = float(option('driftBand', drift_band))
+    portfolio.min_trade_value = float(option('minTradeValue', min_trade_value))
+    return portfolio
+
+
+def _pad(portfolios):
+    """종목 수가 다른 포트폴리오들을 (P, N) 배열로 (빈 칸은 valid=False, 가격 1)"""
+    count = len(portfolios)
+    width = max((len(p) for p in portfolios), default=0) or 1
+    price = np.ones((count, width))
+    quantity = np.zeros((count, width))
+    weight = np.zeros((count, width))
+    valid = np.zeros((count, width), dtype=bool)
+    for i, p in enumerate(portfolios):
+        n = len(p)
+        price[i, :n] = p.prices * p.fx
+        quantity[i, :n] = p.quantities
+        weight[i, :n] = p.weights
+        valid[i, :n] = True
+
+    def column(name):
+        return np.array([getattr(p, name) for p in portfolios], dtype=np.float64)[:, None]
+
+    return (price, quantity, weight, valid, column('cash'), column('cash_weight'),
+            column('fee_rate'), column('drift_band'), column('min_trade_value'))
+
+
+def _trade_cash(delta, price, fee):
+    """수수료를 포함한 매매 후 현금 변화량 (매수는 감소, 매도는 증가)"""
+    value = delta * price
+    return -(value + fee * np.abs(value)).sum(axis=1, keepdims=True)
+
+
+def solve(price, quantity, weight, valid, cash, cash_weight, fee, band, min_value):
+    """(P, N) 배열 입력으로 종목별 주문 수량(정수, 매수 +, 매도 -) 계산
+
+    price 는 원화 환산 가격, cash 등 포트폴리오별 값은 (P, 1) 배열이다.
+    """
+    value = price * quantity
+    total = value.sum(axis=1, keepdims=True) + cash
+    safe_total = np.where(total > 0, total, 1.0)
+
+    # 2) 허용 범위 안의 종목은 그대로 둔다
+    drift = np.abs(value / safe_total - weight)
+    trade = valid & (drift > band)
+
+    # 3) 목표 수량 이하가 되는 정수 주
+    ideal = weight * total / price
+    delta = np.where(trade, np.floor(ideal - quantity + _EPSILON), 0.0)
+    # 소수점 주식(4.5 주 등)은 정수 주만 팔 수 있다
+    delta = np.maximum(delta, -np.floor(quantity + _EPSILON))
+    delta = np.where(np.abs(delta * price) < min_value, 0.0, delta)
+
+    # 4) 목표 현금을 남기고 살 수 있는 만큼만 매수
+    cash_target = cash_weight * total
+    change = _trade_cash(delta, price, fee)
+    budget = cash + change - cash_target
+    buy_cost = np.where(delta > 0, delta * price * (1 + fee), 0.0).sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where((budget < 0) & (buy_cost > 0),
+                         np.clip((buy_cost + budget) / buy_cost, 0.0, 1.0), 1.0)
+    delta = np.where(delta > 0, np.floor(delta * scale + _EPSILON), delta)
+
+    # 5) 남은 예산으로 반 주 이상 모자란 종목을 부족 금액이 큰 순서대로 한 주씩
+    change = _trade_cash(delta, price, fee)
+    budget = np.maximum(cash + change - cash_target, 0.0)
+    shortfall = ideal - (quantity + delta)
+    candidate = trade & (shortfall > 0.5)
+    order = np.argsort(np.where(candidate, -shortfall * price, np.inf), axis=1, kind='stable')
+    unit_cost = np.where(candidate, price * (1 + fee), np.inf)
+    affordable = np.cumsum(np.take_along_axis(unit_cost, order, axis=1), axis=1) <= budget
+    extra = np.zeros_like(candidate)
+    np.put_along_axis(extra, order, affordable, axis=1)
+    delta = delta + extra
+
+    # 6) 한 주 추가로 생긴 작은 매수 주문은 다시 뺀다 (매수를 빼는 것은 현금을 늘리기만 함)
+    delta = np.where((delta > 0) & (delta * price < min_value), 0.0, delta)
+    return delta
+
+
+def _summaries(price, quantity, weight, valid, cash, cash_weight, fee, delta):
+    """(P, N) 주문 수량으로 종목별 금액/비중과 포트폴리오별 요약값을 한 번에 계산"""
+    final = quantity + delta
+    change = delta * price
+    fees = fee * np.abs(change)
+
+    total = (quantity * price).sum(axis=1, keepdims=True) + cash
+    cash_after = cash - change.sum(axis=1, keepdims=True) - fees.sum(axis=1, keepdims=True)
+    final_total = (final * price).sum(axis=1, keepdims=True) + cash_after
+
+    current_w = quantity * price / np.where(total > 0, total, 1.0)
+    final_w = final * price / np.where(final_total > 0, final_total, 1.0)
+
+    def drift(weights, cash_value, base):
+        # 종목과 현금 비중 차이의 절반 (0 이면 목표와 같음)
+        cash_gap = np.abs(cash_value / np.where(base > 0, base, 1.0) - cash_weight)
+        gap = np.where(valid, np.abs(weights - weight), 0.0).sum(axis=1, keepdims=True)
+        return np.round((gap + cash_gap) / 2, 6)
+
+    columns = {
+        'change': change, 'fees': fees,
+        'current_w': np.round(current_w, 6), 'final_w': np.round(final_w, 6),
+    }
+    summary = {
+        'totalValue': np.round(total, 2), 'cashBefore': np.round(cash, 2),
+        'cashAfter': np.round(cash_after, 2), 'fees': np.round(fees.sum(axis=1, keepdims=True), 2),
+        'driftBefore': drift(current_w, cash, total), 'driftAfter': drift(final_w, cash_after, final_total),
+    }
+    return ({name: values.tolist() for name, values in columns.items()},
+            {name: values[:, 0].tolist() for name, values in summary.items()})
+
+
+def _plan_result(portfolio, delta, columns, summary):
+    """포트폴리오 하나의 계산 결과(파이썬 리스트)를 응답 dict 로 조립"""
+    orders = []
+    positions = []
+    for (region, ticker), qty, d, price, krw, fee, cur, fin, tgt in zip(
+            portfolio.keys, portfolio.quantities.tolist(), delta, portfolio.prices.tolist(),
+            columns['change'], columns['fees'], columns['current_w'], columns['final_w'],
+            portfolio.weights.tolist()):
+        positions.append({
+            'ticker': ticker, 'region': region,
+            'currentQuantity': qty, 'targetQuantity': qty + d,
+            'currentWeight': cur, 'targetWeight': tgt, 'finalWeight': fin,
+        })
+        if d:
+            orders.append((d > 0, -abs(krw), {
+                'ticker': ticker, 'region': region, 'side': 'buy' if d > 0 else 'sell',
+                'quantity': int(abs(d)), 'price': price, 'currency': CURRENCIES[region],
+                'amount': round(abs(d) * price, 4), 'feeKrw': round(fee, 2),
+            }))
+
+    # 매도 대금으로 매수하도록 매도를 먼저, 같은 방향은 원화 환산 금액이 큰 순서
+    orders.sort(key=lambda item: item[:2])
+    orders = [order for _, _, order in orders]
+    return {
+        'orders': orders,
+        'positions': positions,
+        'summary': {'baseCurrency': 'KRW', **summary, 'tradeCount': len(orders)},
+    }
+
+
+def plan_batch(portfolios):
+    """Portfolio 목록의 리밸런싱 계획 목록 (입력 순서 유지)"""
+    if not portfolios:
+        return []
+    price, quantity, weight, valid, cash, cash_weight, fee, band, min_value = _pad(portfolios)
+    delta = solve(price, quantity, weight, valid, cash, cash_weight, fee, band, min_value)
+    columns, summary = _summaries(price, quantity, weight, valid, cash, cash_weight, fee, delta)
+    delta = delta.tolist()
+
+    results = []
+    for i, p in enumerate(portfolios):
+        n = len(p)
+        results.append(_plan_result(
+            p, delta[i][:n], {name: values[i][:n] for name, values in columns.items()},
+            {name: values[i] for name, values in summary.items()},
+        ))
+    return results
+
+
+def plan(portfolio):
+    """Portfolio 하나의 리밸런싱 계획"""
+    return plan_batch([portfolio])[0]
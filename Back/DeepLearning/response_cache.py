@@ -0,0 +1,93 @@
+"""
+검색 응답 캐시 (LRU + TTL)
+
+직렬화가 끝난 응답 bytes 와 ETag 를 보관한다.
+데이터셋 버전이 바뀌면(마스터 재로드) 전체를 비운다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    __slots__ = ('body', 'etag', 'expires_at')
+
+    def __init__(self, body, ttl):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        self.expires_at = time.monotonic() + ttl
+
+
+class ResponseCache:
+    """스레드 안전한 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _sync_version(self, version):
+        # 잠금을 잡은 상태에서 호출
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key, version):
+        """version 데이터셋 기준으로 key 의 캐시 항목 반환, 없거나 만료되면 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, version, body):
+        """응답 bytes 를 저장하고 CachedResponse 반환 (캐시가 꺼져 있어도 ETag 는 계산)"""
+        entry = CachedResponse(body, self.ttl)
+        if not self.enabled:
+            return entry
+        with self._lock:
+            self._sync_version(version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            'size': size,
+            'maxEntries': self.max_entries,
+            'ttlSeconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hitRatio': round(self.hits / total, 4) if total else None,
+        }
@@ -0,0 +1,206 @@
+"""
+자동완성용 종목 검색 엔진
+
+- 종목코드: 정렬된 소문자 티커 배열 + 이진 탐색으로 접두어 검색
+- 종목명/종목코드: 문자 n-gram 역색인으로 부분 문자열 후보 추출
+
+결과는 접두어 일치 → 부분 일치 → 시가총액 순으로 정렬된다.
+search_regions 는 여러 지역 엔진의 결과를 같은 기준으로 합쳐 상위 limit 개를 고른다.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import itemgetter
+
+import numpy as np
+
+from compact import PackedText, Postings, int32_view
+
+# n-gram 길이 (1글자 검색어는 unigram 색인 사용)
+GRAM_SIZE = 2
+
+# 랭킹 등급
+TIER_EXACT = 0   # 종목코드 완전 일치
+TIER_PREFIX = 1  # 종목코드/종목명 접두어 일치
+TIER_SUBSTRING = 2  # 종목코드/종목명 부분 일치
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def marcap_ranks(marcaps):
+    """행 번호별 시가총액 내림차순 순위 (음수 = 시가총액 없음은 파일 순서대로 뒤쪽)"""
+    marcaps = np.asarray(marcaps, dtype=np.int64)
+    order = np.lexsort((np.arange(len(marcaps)), -marcaps, marcaps < 0))
+    ranks = np.empty(len(marcaps), dtype=np.int32)
+    ranks[order] = np.arange(len(marcaps), dtype=np.int32)
+    return int32_view(ranks)
+
+
+def marcap_order(marcaps, row):
+    """지역이 달라도 비교할 수 있는 시가총액 정렬 키 (큰 순서, 시가총액 없으면 뒤쪽)"""
+    marcap = int(marcaps[row])
+    return (1, 0) if marcap < 0 else (0, -marcap)
+
+
+def build_gram_index(texts, ranks, n=GRAM_SIZE):
+    """문자열 목록으로 gram → 행 번호 역색인(Postings) 생성
+
+    길이 1..n 의 gram 을 모두 색인해 짧은 검색어도 처리한다.
+    각 posting 은 시가총액 순위 순서로 저장되어 앞에서부터 읽으면 곧 랭킹 순서다.
+    """
+    def row_grams():
+        for row in np.argsort(np.asarray(ranks), kind='stable').tolist():
+            text = texts[row]
+            grams = set()
+            for size in range(1, n + 1):
+                grams |= _grams(text, size)
+            yield row, grams
+
+    return Postings.build(row_grams())
+
+
+def substring_rows(postings, texts, keyword, needed, exclude=(), gram_size=GRAM_SIZE):
+    """keyword 를 포함하는 행을 시가총액 순위 순서로 최대 needed 개 반환
+
+    keyword 의 gram 중 posting 이 가장 짧은 것 하나만 순서대로 훑으며 검증한다.
+    posting 이 순위 순서이므로 needed 개를 채우면 바로 멈출 수 있다.
+    """
+    shortest = None
+    for gram in _grams(keyword, min(len(keyword), gram_size)):
+        rows = postings.get(gram)
+        if not rows:
+            return []
+        if shortest is None or len(rows) < len(shortest):
+            shortest = rows
+
+    found = []
+    for row in shortest:
+        if row not in exclude and keyword in texts[row]:
+            found.append(row)
+            if len(found) == needed:
+                break
+    return found
+
+
+def sorted_keys(texts):
+    """접두어 이진 탐색용 (정렬된 문자열, 대응 행 번호) 배열"""
+    order = sorted(range(len(texts)), key=texts.__getitem__)
+    return PackedText(texts[i] for i in order), int32_view(order)
+
+
+def prefix_rows(keys, rows, keyword):
+    lo = bisect_left(keys, keyword)
+    hi = bisect_left(keys, keyword + '\uffff', lo)
+    return rows[lo:hi]
+
+
+class SearchEngine:
+    """한 지역 StockIndex 위에 만든 읽기 전용 검색 구조"""
+
+    def __init__(self, index, gram_size=GRAM_SIZE):
+        self.index = index
+        self.gram_size = gram_size
+        self.marcap_ranks = marcap_ranks(index.marcaps)
+
+        # 접두어 검색용 정렬 배열
+        self._ticker_keys, self._ticker_rows = sorted_keys(index.tickers_lower)
+        self._name_keys, self._name_rows = sorted_keys(index.names_lower)
+
+        # 부분 문자열 후보 추출용 역색인
+        self._name_grams = build_gram_index(index.names_lower, self.marcap_ranks, gram_size)
+        self._ticker_grams = build_gram_index(index.tickers_lower, self.marcap_ranks, gram_size)
+
+    def memory_usage(self):
+        """검색 구조별 버퍼 크기 (바이트)"""
+        return {
+            'ranks': self.marcap_ranks.nbytes,
+            'prefixKeys': sum(keys.nbytes + rows.nbytes for keys, rows in (
+                (self._ticker_keys, self._ticker_rows), (self._name_keys, self._name_rows))),
+            'grams': self._name_grams.nbytes + self._ticker_grams.nbytes,
+        }
+
+    def sorted_names(self):
+        """소문자 종목명 정렬 배열과 대응 행 번호"""
+        return self._name_keys, self._name_rows
+
+    def sorted_tickers(self):
+        """소문자 종목코드 정렬 배열과 대응 행 번호"""
+        return self._ticker_keys, self._ticker_rows
+
+    def ticker_prefix(self, keyword):
+        """keyword 로 시작하는 종목코드의 행 번호"""
+        return prefix_rows(self._ticker_keys, self._ticker_rows, keyword)
+
+    def name_prefix(self, keyword):
+        """keyword 로 시작하는 종목명의 행 번호"""
+        return prefix_rows(self._name_keys, self._name_rows, keyword)
+
+    def ticker_exact(self, keyword):
+        """종목코드가 keyword 와 같은 행 번호"""
+        lo = bisect_left(self._ticker_keys, keyword)
+        hi = bisect_right(self._ticker_keys, keyword, lo)
+        return self._ticker_rows[lo:hi]
+
+    def stages(self, query, limit=30):
+        """검색 단계별 [(등급 키, 행 번호)] 목록을 차례로 생성 (단계마다 최대 남은 자리 수만큼)
+
+        단계 안에서는 랭킹 순서이고, 뒤 단계의 등급 키는 앞 단계보다 크다.
+        같은 등급 키 안에서는 시가총액 순위 순서다.
+        """
+        keyword = query.strip().lower()
+        if not keyword:
+            return
+
+        # 1) 접두어 일치 (완전 일치 포함)
+        prefix = set(self.ticker_prefix(keyword))
+        prefix.update(self.name_prefix(keyword))
+        # 접두어 후보는 모두 TIER_PREFIX 이상이므로 등급은 종목코드 완전 일치 여부로만 갈린다
+        exact = set(self.ticker_exact(keyword))
+        ranks = self.marcap_ranks
+        ranked = heapq.nsmallest(limit, prefix, key=lambda row: (row not in exact, ranks[row]))
+        yield [((TIER_EXACT if row in exact else TIER_PREFIX,), row) for row in ranked]
+
+        # 2) 남은 자리만큼 부분 일치를 시가총액 순으로 채움
+        needed = limit - len(ranked)
+        if needed > 0:
+            substring = substring_rows(
+                self._name_grams, self.index.names_lower, keyword, needed, prefix, self.gram_size
+            ) + substring_rows(
+                self._ticker_grams, self.index.tickers_lower, keyword, needed, prefix, self.gram_size
+            )
+            ranked = heapq.nsmallest(needed, set(substring), key=ranks.__getitem__)
+            yield [((TIER_SUBSTRING,), row) for row in ranked]
+
+    def search(self, query, limit=30):
+        """검색어와 일치하는 상위 limit 개 행 번호를 랭킹 순서로 반환"""
+        if not query.strip():
+            return list(range(min(limit, len(self.index))))
+        return [row for stage in self.stages(query, limit) for _, row in stage]
+
+
+def search_regions(engines, query, limit=30):
+    """여러 지역 엔진을 한 랭킹(등급 키 → 시가총액)으로 검색해 상위 limit 개 (엔진 번호, 행 번호) 반환
+
+    엔진은 모두 같은 종류(SearchEngine 또는 FuzzySearchEngine)여야 단계별 등급이 맞는다.
+    지역마다 검색 단계를 한 단계씩 함께 진행하고, 모은 결과가 limit 개가 되면 뒤 단계(낮은 등급)는
+    어느 지역도 실행하지 않는다. 지역별 결과는 이미 랭킹 순서이므로 heapq.merge 로 앞에서부터
+    limit 개만 꺼낸다 (합친 결과 전체를 정렬하지 않음, 점수가 같으면 앞 엔진이 먼저).
+    """
+    pending = [(i, engine.index.marcaps, engine.stages(query, limit)) for i, engine in enumerate(engines)]
+    ranked = [[] for _ in engines]
+    found = 0
+    while pending and found < limit:
+        active = []
+        for i, marcaps, stages in pending:
+            stage = next(stages, None)
+            if stage is None:
+                continue
+            ranked[i].extend((key + marcap_order(marcaps, row), i, row) for key, row in stage)
+            found += len(stage)
+            active.append((i, marcaps, stages))
+        pending = active
+
+    merged = heapq.merge(*ranked, key=itemgetter(0))
+    return [(i, row) for _, i, row in islice(merged, limit)]
@@ -0,0 +1,49 @@
+"""
+JSON 직렬화 도우미
+
+orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 으로 동작한다.
+검색 응답은 로드 시점에 만들어 둔 행 단위 JSON 조각을 이어 붙여 한 번에 만든다.
+"""
+import json
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:  # orjson 은 선택 의존성
+    orjson = None
+    DefaultJSONResponse = JSONResponse
+
+
+def dumps(obj):
+    """obj 를 UTF-8 JSON bytes 로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def stock_fragment(name, ticker, region, market_cap):
+    """StockInfo 한 건에 해당하는 JSON 조각"""
+    return dumps({'name': name, 'ticker': ticker, 'region': region, 'marketCap': market_cap})
+
+
+def search_body(fragments, message=None, **fields):
+    """SearchResponse 모양의 JSON bytes 를 행 조각 목록으로 바로 생성
+
+    Pydantic 모델 생성/검증 없이 bytes 를 한 번만 이어 붙인다.
+    fields 는 message 뒤에 추가할 필드 (예: nextCursor)
+    """
+    return b''.join((
+        b'{"success":true,"data":[',
+        b','.join(fragments),
+        b'],"message":',
+        dumps(message),
+        *(b',' + dumps(name) + b':' + dumps(value) for name, value in fields.items()),
+        b'}',
+    ))
+
+
+def search_response(fragments, message=None, **fields):
+    """search_body 로 만든 JSON 응답"""
+    return Response(content=search_body(fragments, message, **fields), media_type='application/json')
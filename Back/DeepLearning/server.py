@@ -1,14 +1,110 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
-import pandas as pd
+from contextlib import asynccontextmanager
+import argparse
+import os
+import sys
+import time
 import uvicorn
 
+from stock_index import StockStore
+from serialization import DefaultJSONResponse, dumps, search_body, search_response
+from response_cache import ResponseCache
+from rebalance import DEFAULT_FEE_RATE, PlanError, parse_portfolio, plan, plan_batch
+from browse import SORT_MARCAP, CursorError
+
+# CODEF 게이트웨이와 같이 쓰는 지표/로그 모듈 (Back/common)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from latency import LatencyRecorder  # noqa: E402
+from metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware  # noqa: E402
+from service_log import AccessLog, dropped_count, setup_logging  # noqa: E402
+
+# JSON 한 줄 로그 (요청 로그는 표본 추출)
+logger = setup_logging('stock-search')
+
+# 서버 기동 시 한 번만 로드되는 종목 인덱스
+# (CSV 경로: KR_STOCK_PATH / US_STOCK_PATH, 컬럼형 캐시 위치: STOCK_CACHE_DIR)
+stock_store = StockStore()
+
+# 마스터 파일 변경 확인 주기 (초, 0 이면 자동 갱신 안 함)
+STOCK_RELOAD_INTERVAL = float(os.getenv('STOCK_RELOAD_INTERVAL', '30'))
+
+# 이 프로세스에서 변경 확인 스레드를 띄울지 여부
+# (prefork 운영 모드에서는 마스터가 확인하고 워커를 교체하므로 워커는 띄우지 않는다)
+run_watcher = True
+
+# 검색 결과 최대 개수 (기본 30개, 목록 화면용 대량 조회 허용)
+DEFAULT_SEARCH_LIMIT = 30
+MAX_SEARCH_LIMIT = 10000
+
+# 국내/해외를 함께 검색하는 region 값
+REGION_ALL = "all"
+
+# 일괄 종목 조회 최대 개수
+MAX_BATCH_ITEMS = 1000
+
+# 리밸런싱 일괄 계획 최대 포트폴리오 수
+MAX_REBALANCE_BATCH = int(os.getenv('MAX_REBALANCE_BATCH', '10000'))
+
+# 리밸런싱 가격을 요청에 주지 않았을 때 마스터에서 읽는 종가 컬럼 (해외 마스터에는 가격이 없음)
+PRICE_COLUMNS = {1: 'Close'}
+
+# 검색 응답 캐시 (항목 수, TTL 초) 와 클라이언트/프록시 캐시 유효 시간 (Cache-Control max-age 초)
+search_cache = ResponseCache(
+    max_entries=int(os.getenv('SEARCH_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('SEARCH_CACHE_TTL', '300'))
+)
+SEARCH_CACHE_MAX_AGE = int(os.getenv('SEARCH_CACHE_MAX_AGE', '60'))
+
+# 엔드포인트별 처리 시간 기록
+search_latency = LatencyRecorder()
+info_latency = LatencyRecorder()
+
+
+def _dataset_value(fn):
+    dataset = stock_store.current
+    return fn(dataset) if dataset is not None else None
+
+
+# /metrics 조회 시점에 읽는 인덱스/캐시 지표 (요청 처리 경로에는 비용 없음)
+REGISTRY.callback('stock_index_load_seconds', '현재 인덱스를 만드는 데 걸린 시간',
+                  lambda: _dataset_value(lambda d: d.load_seconds))
+REGISTRY.callback('stock_index_loaded_timestamp_seconds', '현재 인덱스를 만든 시각 (unix time)',
+                  lambda: _dataset_value(lambda d: d.loaded_at))
+REGISTRY.callback('stock_index_rows', '지역별 종목 수',
+                  lambda: _dataset_value(lambda d: {('kr',): len(d.kr), ('us',): len(d.us)}) or {},
+                  labels=('region',))
+REGISTRY.callback('stock_index_reloads_total', '마스터 파일 변경으로 인덱스를 다시 만든 횟수',
+                  lambda: stock_store.reload_count, kind='counter')
+REGISTRY.callback('search_cache_entries', '검색 응답 캐시 항목 수', lambda: search_cache.stats()['size'])
+REGISTRY.callback('search_cache_lookups_total', '검색 응답 캐시 조회 수 (hit/miss)',
+                  lambda: {('hit',): search_cache.hits, ('miss',): search_cache.misses},
+                  labels=('result',), kind='counter')
+REGISTRY.callback('search_cache_evictions_total', '검색 응답 캐시에서 밀려난 항목 수',
+                  lambda: search_cache.evictions, kind='counter')
+REGISTRY.callback('search_cache_hit_ratio', '검색 응답 캐시 적중률', lambda: search_cache.stats()['hitRatio'])
+REGISTRY.callback('log_records_dropped_total', '로그 큐가 가득 차 버린 레코드 수',
+                  dropped_count, kind='counter')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청을 받기 전에 KR/US 마스터를 읽어 인덱스를 만든다
+    if stock_store.current is None:
+        stock_store.load()
+    # 이후 파일이 바뀌면 백그라운드에서 다시 만들어 교체
+    if run_watcher:
+        stock_store.start_watcher(STOCK_RELOAD_INTERVAL)
+    yield
+    stock_store.stop_watcher()
+
 app = FastAPI(
     title="Stock Search API",
     description="국내/해외 주식 검색 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse
 )
 
 # CORS 설정 업데이트
@@ -21,9 +117,8 @@ app.add_middleware(
     expose_headers=["*"]  # 모든 헤더 노출
 )
 
-# CSV 파일 경로
-KR_STOCK_PATH = 'KR_Stock_Master.csv'
-US_STOCK_PATH = 'US_Stock_Master.csv'
+# 라우트별 처리 시간 히스토그램 (CORS 처리까지 포함하도록 가장 바깥에 추가)
+app.add_middleware(MetricsMiddleware, access_log=AccessLog(logger))
 
 # Response 모델
 class StockInfo(BaseModel):
@@ -36,92 +131,197 @@ class SearchResponse(BaseModel):
     success: bool
     data: List[StockInfo]
     message: Optional[str] = None
+    # 빈 검색어 목록의 다음 페이지 커서 (마지막 페이지면 null)
+    nextCursor: Optional[str] = None
 
 class StockDetailResponse(BaseModel):
     success: bool
     data: Optional[dict] = None
     message: Optional[str] = None
 
+class StockInfoQuery(BaseModel):
+    ticker: str
+    region: str
+
+class StockInfoBatchRequest(BaseModel):
+    items: List[StockInfoQuery] = Field(..., max_length=MAX_BATCH_ITEMS)
+
+class StockInfoBatchItem(BaseModel):
+    ticker: str
+    region: str
+    success: bool
+    data: Optional[dict] = None
+    message: Optional[str] = None
+
+class StockInfoBatchResponse(BaseModel):
+    success: bool
+    data: List[StockInfoBatchItem]
+    message: Optional[str] = None
+
+class ResolveQuery(BaseModel):
+    resIsName: str = Field(..., description="증권사 잔고의 종목명")
+    region: Optional[int] = Field(None, description="지역 힌트 (1: 국내, 2: 해외)")
+
+class ResolveRequest(BaseModel):
+    # CODEF resItemList 를 그대로 보내도 된다 (종목명 외 필드는 무시)
+    items: List[ResolveQuery] = Field(..., max_length=MAX_BATCH_ITEMS)
+    region: Optional[int] = Field(None, description="항목에 region 이 없을 때 쓰는 지역 힌트")
+
+class ResolvedStock(BaseModel):
+    resIsName: str
+    status: str = Field(..., description="matched / ambiguous / unmatched")
+    ticker: Optional[str] = None
+    name: Optional[str] = None
+    region: Optional[int] = None
+    marketCap: Optional[float] = None
+    candidates: Optional[List[StockInfo]] = None
+
+class ResolveResponse(BaseModel):
+    success: bool
+    data: List[ResolvedStock]
+    message: Optional[str] = None
+
+class RebalanceHolding(BaseModel):
+    ticker: str
+    region: int = Field(..., description="0: 현금(KRW/USD), 1: 국내, 2: 해외")
+    quantity: float = Field(..., ge=0, description="보유 수량 (현금은 금액)")
+    price: Optional[float] = Field(None, gt=0, description="현지 통화 가격 (없으면 마스터 종가)")
+
+class RebalanceTarget(BaseModel):
+    ticker: str
+    region: int
+    weight: float = Field(..., ge=0, le=1)
+    price: Optional[float] = Field(None, gt=0)
+
+class RebalancePlanRequest(BaseModel):
+    holdings: List[RebalanceHolding] = []
+    targets: List[RebalanceTarget]
+    fxRate: Optional[float] = Field(None, gt=0, description="원/달러 환율")
+    feeRate: Optional[float] = Field(None, ge=0, lt=1)
+    driftBand: Optional[float] = Field(None, ge=0, le=1, description="이 차이 이하인 종목은 거래하지 않음")
+    minTradeValue: Optional[float] = Field(None, ge=0, description="이 금액(원) 미만 주문은 내지 않음")
+
+class RebalanceBatchRequest(BaseModel):
+    portfolios: List[RebalancePlanRequest] = Field(..., max_length=MAX_REBALANCE_BATCH)
+    # 포트폴리오에 값이 없을 때 쓰는 공통 설정
+    fxRate: Optional[float] = Field(None, gt=0)
+    feeRate: Optional[float] = Field(None, ge=0, lt=1)
+    driftBand: Optional[float] = Field(None, ge=0, le=1)
+    minTradeValue: Optional[float] = Field(None, ge=0)
+
+class RebalanceBatchItem(BaseModel):
+    success: bool
+    data: Optional[dict] = None
+    message: Optional[str] = None
+
+class RebalanceBatchResponse(BaseModel):
+    success: bool
+    data: List[RebalanceBatchItem]
+    message: Optional[str] = None
+
+def cached_json_response(entry, request):
+    """ETag/Cache-Control 헤더를 붙인 응답, If-None-Match 가 같으면 304"""
+    headers = {
+        'ETag': entry.etag,
+        'Cache-Control': f'public, max-age={SEARCH_CACHE_MAX_AGE}'
+    }
+    if request.headers.get('if-none-match') == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type='application/json', headers=headers)
+
 # 주식 데이터 로드
 def load_stock_data():
-    kr_stocks = pd.read_csv(KR_STOCK_PATH)
-    us_stocks = pd.read_csv(US_STOCK_PATH)
-    return kr_stocks, us_stocks
+    dataset = stock_store.current
+    if dataset is None:
+        dataset = stock_store.load()
+    return dataset
+
+# 현금 검색 응답 (고정)
+CASH_FRAGMENTS = (
+    dumps(StockInfo(name="원화", ticker="KRW", region=0).model_dump()),
+    dumps(StockInfo(name="달러", ticker="USD", region=0).model_dump())
+)
 
 @app.get("/api/stocks/search", response_model=SearchResponse)
 async def search_stocks(
+    request: Request,
     query: str = Query(default="", description="검색어"),
-    region: str = Query(default="0", description="지역 (0: 현금, 1: 국내주식, 2: 해외주식)")
+    region: str = Query(default="0", description="지역 (0: 현금, 1: 국내주식, 2: 해외주식, all: 국내+해외)"),
+    mode: str = Query(default="exact", description="검색 방식 (exact: 일반, fuzzy: 초성/자모/오타 허용)"),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="최대 결과 수"),
+    sort: str = Query(default=SORT_MARCAP, description="검색어가 없을 때 목록 정렬 (marcap: 시가총액, name: 종목명, ticker: 종목코드)"),
+    cursor: Optional[str] = Query(default=None, description="검색어가 없을 때 이전 응답의 nextCursor (다음 페이지)")
 ):
+    started = time.perf_counter()
     try:
         # 현금 검색인 경우
         if region == "0":
-            return SearchResponse(
-                success=True,
-                data=[
-                    StockInfo(name="원화", ticker="KRW", region=0),
-                    StockInfo(name="달러", ticker="USD", region=0)
-                ]
-            )
-
-        # 주식 데이터 로드
-        kr_stocks, us_stocks = load_stock_data()
+            return search_response(CASH_FRAGMENTS)
 
         # 검색 대상 설정
-        if region == "1":  # 국내주식
-            target_stocks = kr_stocks
-        elif region == "2":  # 해외주식
-            target_stocks = us_stocks
-        else:
+        if region not in ("1", "2", REGION_ALL):
             raise HTTPException(status_code=400, detail="잘못된 region 값입니다.")
+        if mode not in ("exact", "fuzzy"):
+            raise HTTPException(status_code=400, detail="잘못된 mode 값입니다.")
 
-        # 검색 수행
-        if query:
-            # 종목명 또는 종목코드로 검색
-            if region == "1":  # 국내주식
-                filtered = target_stocks[
-                    target_stocks['Name'].str.lower().str.contains(query.lower()) |
-                    target_stocks['Code'].str.lower().str.contains(query.lower())
-                ]
-            else:  # 해외주식
-                filtered = target_stocks[
-                    target_stocks['Company Name'].str.lower().str.contains(query.lower()) |
-                    target_stocks['ACT Symbol'].str.lower().str.contains(query.lower())
-                ]
-        else:
-            # 쿼리가 없으면 전체 목록 반환 (최대 30개)
-            filtered = target_stocks
-
-        # 결과를 리스트로 변환
-        results = []
-        for _, row in filtered.head(30).iterrows():
-            if region == "1":  # 국내주식
-                name = row['Name']
-                ticker = row['Code']
-                market_cap = float(row['Marcap']) if 'Marcap' in row else None
-            else:  # 해외주식
-                name = row['Company Name']
-                ticker = row['ACT Symbol']
-                market_cap = None  # 해외주식은 시가총액 정보가 없음
-            
-            stock_info = StockInfo(
-                name=name,
-                ticker=ticker,
-                region=1 if region == "1" else 2,
-                marketCap=market_cap
-            )
-            results.append(stock_info)
+        dataset = load_stock_data()
+        keyword = query.strip().lower()
+
+        # 검색어가 없으면 정렬 기준별 전체 목록을 커서로 페이지 단위 조회
+        if not keyword:
+            if region == REGION_ALL:
+                raise HTTPException(status_code=400, detail="검색어 없이 목록을 조회할 때는 region 을 1 또는 2 로 지정해야 합니다.")
+            return browse_stocks(dataset, dataset.get(region), region, sort, cursor, limit, request)
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="cursor 는 검색어가 없을 때만 사용할 수 있습니다.")
+
+        # 자주 쓰이는 검색어는 직렬화된 응답을 그대로 재사용 (데이터셋이 바뀌면 자동으로 비워짐)
+        cache_key = (keyword, region, mode, limit)
+        entry = search_cache.get(cache_key, dataset.version)
+        if entry is None:
+            # 검색 수행 (접두어 일치 → 부분 일치 → 시가총액 순, all 이면 국내/해외를 한 랭킹으로 합침)
+            fuzzy = mode == "fuzzy"
+            if region == REGION_ALL:
+                fragments = [index.row_json[i] for index, i in dataset.search_all(query, limit, fuzzy)]
+            else:
+                rows = dataset.engine(region, fuzzy=fuzzy).search(query, limit=limit)
+                row_json = dataset.get(region).row_json
+                fragments = [row_json[i] for i in rows]
+
+            # 미리 직렬화된 행 JSON 조각을 이어 붙여 응답 생성
+            entry = search_cache.put(cache_key, dataset.version, search_body(fragments))
 
-        return SearchResponse(success=True, data=results)
+        return cached_json_response(entry, request)
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        search_latency.record(time.perf_counter() - started)
+
+def browse_stocks(dataset, index, region, sort, cursor, limit, request):
+    """정렬 기준 sort 의 cursor 다음 limit 개 목록 (첫 페이지만 응답 캐시 사용)"""
+    cache_key = ('', region, sort, limit)
+    entry = search_cache.get(cache_key, dataset.version) if cursor is None else None
+    if entry is None:
+        try:
+            rows, next_cursor = dataset.browser(region).page(sort, cursor, limit)
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        row_json = index.row_json
+        body = search_body([row_json[i] for i in rows], nextCursor=next_cursor)
+        if cursor is not None:
+            return Response(content=body, media_type='application/json')
+        entry = search_cache.put(cache_key, dataset.version, body)
+    return cached_json_response(entry, request)
 
 @app.get("/api/stocks/info", response_model=StockDetailResponse)
 async def get_stock_info(
     ticker: str = Query(..., description="종목코드"),
     region: str = Query(..., description="지역 (1: 국내, 2: 해외)")
 ):
+    started = time.perf_counter()
     try:
         if not ticker or not region:
             raise HTTPException(
@@ -129,23 +329,22 @@ async def get_stock_info(
                 detail="종목코드와 지역 정보가 필요합니다."
             )
 
-        # 주식 데이터 로드
-        kr_stocks, us_stocks = load_stock_data()
-
         # 지역에 따른 데이터 선택
-        target_stocks = kr_stocks if region == "1" else us_stocks
+        index = load_stock_data().get(region)
+        if index is None:
+            raise HTTPException(status_code=400, detail="잘못된 region 값입니다.")
 
-        # 종목 검색
-        stock = target_stocks[target_stocks['Code'] == ticker]
+        # 종목 검색 (종목코드 해시 색인)
+        row = index.find(ticker)
 
-        if len(stock) == 0:
+        if row is None:
             raise HTTPException(
                 status_code=404,
                 detail="해당 종목을 찾을 수 없습니다."
             )
 
         # 종목 정보 반환
-        stock_info = stock.iloc[0].to_dict()
+        stock_info = index.details([row])[0]
 
         return StockDetailResponse(success=True, data=stock_info)
 
@@ -153,6 +352,200 @@ async def get_stock_info(
         raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        info_latency.record(time.perf_counter() - started)
+
+@app.post("/api/stocks/info/batch", response_model=StockInfoBatchResponse)
+async def get_stock_info_batch(request: StockInfoBatchRequest):
+    """여러 지역의 종목코드를 한 번에 조회 (없는 종목은 항목별로 실패 표시)"""
+    started = time.perf_counter()
+    try:
+        dataset = load_stock_data()
+
+        # 지역별로 행 번호를 모아 원본 행을 한 번에 꺼낸다
+        found = {}
+        for pos, item in enumerate(request.items):
+            index = dataset.get(item.region)
+            row = index.find(item.ticker) if index is not None else None
+            if row is not None:
+                found.setdefault(index.region, []).append((pos, row))
+
+        details = {}
+        for region, hits in found.items():
+            rows = dataset.get(region).details([row for _, row in hits])
+            for (pos, _), detail in zip(hits, rows):
+                details[pos] = detail
+
+        results = []
+        for pos, item in enumerate(request.items):
+            if pos in details:
+                results.append(StockInfoBatchItem(
+                    ticker=item.ticker, region=item.region, success=True, data=details[pos]
+                ))
+            elif dataset.get(item.region) is None:
+                results.append(StockInfoBatchItem(
+                    ticker=item.ticker, region=item.region, success=False, message="잘못된 region 값입니다."
+                ))
+            else:
+                results.append(StockInfoBatchItem(
+                    ticker=item.ticker, region=item.region, success=False, message="해당 종목을 찾을 수 없습니다."
+                ))
+
+        return StockInfoBatchResponse(success=True, data=results)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        info_latency.record(time.perf_counter() - started)
+
+@app.post("/api/stocks/resolve", response_model=ResolveResponse)
+async def resolve_stocks(request: ResolveRequest):
+    """잔고 종목명 목록을 종목코드/시가총액으로 변환 (같은 이름이 여러 종목이면 ambiguous, 없으면 unmatched)"""
+    try:
+        resolver = load_stock_data().resolver
+        regions = {item.region for item in request.items} | {request.region}
+        if not regions <= {None, 1, 2}:
+            raise HTTPException(status_code=400, detail="잘못된 region 값입니다.")
+
+        # 여러 계좌에 같은 종목이 있으면 이름이 반복되므로 한 번만 찾는다
+        resolved = {}
+        results = []
+        for item in request.items:
+            key = (item.resIsName, item.region or request.region)
+            if key not in resolved:
+                resolved[key] = resolver.resolve(*key)
+            results.append(ResolvedStock(resIsName=item.resIsName, **resolved[key]))
+
+        unmatched = sum(result.status != 'matched' for result in results)
+        message = f"{unmatched}개 종목을 확정하지 못했습니다." if unmatched else None
+        return ResolveResponse(success=True, data=results, message=message)
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def master_price_lookup(dataset):
+    """요청에 가격이 없는 종목의 마스터 종가 조회 함수 (같은 요청 안에서는 한 번만 읽음)"""
+    prices = {}
+
+    def lookup(region, ticker):
+        key = (region, ticker)
+        if key not in prices:
+            index = dataset.get(region)
+            column = PRICE_COLUMNS.get(region)
+            row = index.find(ticker) if index is not None else None
+            price = None
+            if row is not None and column in index.table.columns:
+                price = float(index.table[column][row])
+            prices[key] = price if price == price else None
+        return prices[key]
+
+    return lookup
+
+def _plan_options(request):
+    return {
+        'fx_rate': request.fxRate,
+        'fee_rate': request.feeRate if request.feeRate is not None else DEFAULT_FEE_RATE,
+        'drift_band': request.driftBand or 0.0,
+        'min_trade_value': request.minTradeValue or 0.0,
+    }
+
+# NumPy 계산은 CPU 작업이므로 async 대신 스레드풀에서 실행되는 일반 함수로 둔다
+@app.post("/api/rebalance/plan", response_model=StockDetailResponse)
+def plan_rebalance(request: RebalancePlanRequest):
+    """보유 종목/현금과 목표 비중으로 정수 주 단위 매수/매도 주문 계산"""
+    try:
+        portfolio = parse_portfolio(
+            request.model_dump(), price_lookup=master_price_lookup(load_stock_data())
+        )
+        return StockDetailResponse(success=True, data=plan(portfolio))
+
+    except PlanError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/rebalance/plan/batch", response_model=RebalanceBatchResponse)
+def plan_rebalance_batch(request: RebalanceBatchRequest):
+    """여러 포트폴리오의 리밸런싱 계획을 한 번에 계산 (입력이 잘못된 포트폴리오는 항목별로 실패 표시)"""
+    try:
+        lookup = master_price_lookup(load_stock_data())
+        options = _plan_options(request)
+
+        portfolios = []
+        errors = {}
+        for pos, item in enumerate(request.portfolios):
+            try:
+                portfolios.append(parse_portfolio(item.model_dump(), price_lookup=lookup, **options))
+            except PlanError as e:
+                errors[pos] = str(e)
+
+        plans = iter(plan_batch(portfolios))
+        results = [
+            RebalanceBatchItem(success=False, message=errors[pos]) if pos in errors
+            else RebalanceBatchItem(success=True, data=next(plans))
+            for pos in range(len(request.portfolios))
+        ]
+        return RebalanceBatchResponse(success=True, data=results)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/ready")
+async def readiness(response: Response):
+    """인덱스가 만들어진 뒤에만 200 을 반환하는 readiness 체크"""
+    dataset = stock_store.current
+    if dataset is None:
+        response.status_code = 503
+        return {'ready': False}
+    return {'ready': True, 'version': dataset.version}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 지표 (워커마다 따로 집계)"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/stocks/status")
+async def get_stock_status():
+    """인덱스 로드 상태(데이터셋 버전, 로드 시간)와 조회 지연시간(p50/p99) 확인"""
+    dataset = stock_store.current
+    return {
+        'loaded': dataset is not None,
+        'version': dataset.version if dataset else None,
+        'rows': {
+            'kr': len(dataset.kr) if dataset else 0,
+            'us': len(dataset.us) if dataset else 0
+        },
+        'loadedAt': dataset.loaded_at if dataset else None,
+        'loadSeconds': round(dataset.load_seconds, 3) if dataset else None,
+        'reload': {
+            # prefork 워커에서는 마스터 프로세스가 변경을 확인한다 (값은 이 워커를 fork 한 시점 기준)
+            'watching': stock_store.watching or (not run_watcher and STOCK_RELOAD_INTERVAL > 0),
+            'intervalSeconds': STOCK_RELOAD_INTERVAL,
+            'count': stock_store.reload_count,
+            'lastError': stock_store.last_error
+        },
+        'searchCache': search_cache.stats(),
+        'latency': {
+            'search': search_latency.snapshot(),
+            'info': info_latency.snapshot()
+        }
+    }
 
 if __name__ == "__main__":
-    uvicorn.run("server:app", host="0.0.0.0", port=5001, reload=True)
+    parser = argparse.ArgumentParser(description="Stock Search API 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")),
+                        help="운영 모드 워커 수 (0 이면 개발용 자동 리로드 모드)")
+    args = parser.parse_args()
+
+    if args.workers > 0:
+        # 운영 모드: 인덱스를 미리 만든 뒤 워커를 fork 해서 공유 (파일 변경 확인은 마스터에서만)
+        from production import serve
+        run_watcher = False
+        serve(app, "server:app", args.host, args.port, args.workers, preload=stock_store.load,
+              poll=stock_store.poll, poll_interval=STOCK_RELOAD_INTERVAL)
+    else:
+        uvicorn.run("server:app", host=args.host, port=args.port, reload=True)
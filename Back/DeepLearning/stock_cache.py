@@ -0,0 +1,228 @@
+"""
+주식 마스터 컬럼형 바이너리 캐시
+
+CSV 를 한 번만 파싱해 컬럼별 .npy 파일로 저장하고, 이후에는 memory-map 으로 연다.
+캐시 디렉터리 이름에 원본 CSV 의 SHA-256 이 들어가므로 파일이 바뀌면 새 캐시가 만들어진다.
+여러 워커 프로세스가 같은 파일을 mmap 하므로 페이지 캐시 한 벌을 공유한다.
+
+- 숫자 컬럼: <번호>.npy
+- 문자열 컬럼: <번호>.data.npy (UTF-8 바이트를 이어 붙인 uint8)
+              <번호>.offsets.npy (행 경계 int64, 길이 = 행 수 + 1)
+              <번호>.null.npy (결측 여부 bool, 결측이 있을 때만)
+
+사용법:
+    python stock_cache.py build     # 캐시 생성
+    python stock_cache.py measure   # CSV / 캐시 기동 시간과 RSS 비교
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+CACHE_FORMAT = 1
+META_FILE = 'meta.json'
+
+
+class PackedStrings:
+    """UTF-8 버퍼 + 오프셋 배열로 저장된 읽기 전용 문자열 컬럼"""
+
+    __slots__ = ('_data', '_offsets', '_nulls')
+
+    def __init__(self, data, offsets, nulls=None):
+        self._data = data
+        self._offsets = offsets
+        self._nulls = nulls
+
+    @classmethod
+    def from_values(cls, values):
+        """str/None 목록으로 (data, offsets, nulls) 배열 생성"""
+        encoded = [b'' if v is None else v.encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        nulls = np.array([v is None for v in values], dtype=bool)
+        return cls(data, offsets, nulls if nulls.any() else None)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if self._nulls is not None and self._nulls[i]:
+            return None
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ColumnarTable:
+    """캐시 디렉터리를 memory-map 으로 연 읽기 전용 테이블"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.source_digest = meta['source_digest']
+        self.columns = [col['name'] for col in meta['columns']]
+        self.num_rows = meta['rows']
+
+        def load(name):
+            return np.load(os.path.join(path, name), mmap_mode='r')
+
+        self._columns = {}
+        for i, col in enumerate(meta['columns']):
+            if col['kind'] == 'str':
+                nulls = load(f'{i}.null.npy') if col.get('nulls') else None
+                self._columns[col['name']] = PackedStrings(
+                    load(f'{i}.data.npy'), load(f'{i}.offsets.npy'), nulls
+                )
+            else:
+                self._columns[col['name']] = load(f'{i}.npy')
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def rows(self, indices):
+        """행 번호 목록의 원본 행을 dict 목록으로 반환 (결측치는 None)"""
+        out = []
+        for i in indices:
+            record = {}
+            for name, column in self._columns.items():
+                value = column[i]
+                if isinstance(value, np.generic):
+                    value = value.item()
+                    if isinstance(value, float) and value != value:
+                        value = None
+                record[name] = value
+            out.append(record)
+        return out
+
+
+def _cache_path(cache_dir, csv_path, digest):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f'{stem}-{digest[:16]}')
+
+
+def build_cache(frame, csv_path, digest, cache_dir):
+    """DataFrame 을 컬럼형 캐시로 저장하고 캐시 디렉터리 경로 반환
+
+    임시 디렉터리에 모두 쓴 뒤 rename 하므로 다른 워커가 만들다 만 캐시를 보지 않는다.
+    """
+    import pandas as pd
+
+    target = _cache_path(cache_dir, csv_path, digest)
+    if os.path.exists(os.path.join(target, META_FILE)):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='.building-', dir=cache_dir)
+    try:
+        columns = []
+        for i, name in enumerate(frame.columns):
+            series = frame[name]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                np.save(os.path.join(tmp, f'{i}.npy'), series.to_numpy())
+                columns.append({'name': str(name), 'kind': 'num'})
+            else:
+                values = [None if pd.isna(v) else str(v) for v in series]
+                packed = PackedStrings.from_values(values)
+                np.save(os.path.join(tmp, f'{i}.data.npy'), packed._data)
+                np.save(os.path.join(tmp, f'{i}.offsets.npy'), packed._offsets)
+                if packed._nulls is not None:
+                    np.save(os.path.join(tmp, f'{i}.null.npy'), packed._nulls)
+                columns.append({'name': str(name), 'kind': 'str', 'nulls': packed._nulls is not None})
+
+        meta = {
+            'format': CACHE_FORMAT,
+            'source': os.path.basename(csv_path),
+            'source_digest': digest,
+            'rows': len(frame),
+            'columns': columns,
+        }
+        with open(os.path.join(tmp, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # 다른 프로세스가 먼저 만들었으면 그것을 사용
+            if not os.path.exists(os.path.join(target, META_FILE)):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def open_table(csv_path, reader, digest, cache_dir):
+    """csv_path 에 해당하는 캐시를 열고, 없으면 reader(csv_path) 로 파싱해 만든다"""
+    target = _cache_path(cache_dir, csv_path, digest)
+    if not os.path.exists(os.path.join(target, META_FILE)):
+        build_cache(reader(csv_path), csv_path, digest, cache_dir)
+    return ColumnarTable(target)
+
+
+def _rss_mb():
+    """현재 프로세스 RSS (MB, Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _measure_child(mode):
+    import time
+    import stock_index
+
+    started = time.perf_counter()
+    if mode == 'csv':
+        tables = [stock_index.read_kr_master(stock_index.DEFAULT_KR_PATH),
+                  stock_index.read_us_master(stock_index.DEFAULT_US_PATH)]
+    else:
+        tables = [
+            open_table(path, reader, stock_index.file_digest(path), stock_index.DEFAULT_CACHE_DIR)
+            for path, reader in ((stock_index.DEFAULT_KR_PATH, stock_index.read_kr_master),
+                                 (stock_index.DEFAULT_US_PATH, stock_index.read_us_master))
+        ]
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'mode': mode, 'rows': sum(len(t) for t in tables),
+                      'seconds': round(elapsed, 4), 'rssMb': _rss_mb()}))
+
+
+def main(argv):
+    import subprocess
+    import stock_index
+
+    command = argv[1] if len(argv) > 1 else 'build'
+    if command == 'build':
+        for path, reader in ((stock_index.DEFAULT_KR_PATH, stock_index.read_kr_master),
+                             (stock_index.DEFAULT_US_PATH, stock_index.read_us_master)):
+            target = build_cache(reader(path), path, stock_index.file_digest(path),
+                                 stock_index.DEFAULT_CACHE_DIR)
+            print(f'{path} -> {target}')
+    elif command == 'measure':
+        main([argv[0], 'build'])
+        for mode in ('csv', 'cache'):
+            subprocess.run([sys.executable, __file__, '_child', mode], check=True)
+    elif command == '_child':
+        _measure_child(argv[2])
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
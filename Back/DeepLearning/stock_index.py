@@ -0,0 +1,300 @@
+"""
+주식 마스터(KR/US) 인메모리 인덱스
+
+서버 기동 시 CSV 를 한 번만 읽어 지역별 읽기 전용 인덱스를 만든다.
+요청 처리 경로에서는 더 이상 CSV 를 파싱하지 않는다.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from compact import HashIndex, PackedBytes, PackedText, release_free_memory
+from serialization import stock_fragment
+from stock_cache import open_table
+from search_engine import SearchEngine, search_regions
+from fuzzy_search import FuzzySearchEngine
+from name_resolver import NameResolver
+from browse import StockBrowser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# CSV 파일 경로와 컬럼형 캐시 위치
+DEFAULT_KR_PATH = os.getenv('KR_STOCK_PATH', os.path.join(BASE_DIR, 'KR_Stock_Master.csv'))
+DEFAULT_US_PATH = os.getenv('US_STOCK_PATH', os.path.join(BASE_DIR, 'US_Stock_Master.csv'))
+DEFAULT_CACHE_DIR = os.getenv('STOCK_CACHE_DIR', os.path.join(BASE_DIR, '.stock_cache'))
+
+# 지역 코드
+REGION_KR = 1
+REGION_US = 2
+
+# 시가총액이 없는 행의 값 (int64 배열이라 NaN 대신 사용)
+MISSING_MARCAP = -1
+
+# 지역별 CSV 컬럼 이름 (종목명, 종목코드, 시가총액)
+REGION_COLUMNS = {
+    REGION_KR: ('Name', 'Code', 'Marcap'),
+    REGION_US: ('Company Name', 'ACT Symbol', None),
+}
+
+
+def _normalize(values):
+    """문자열 컬럼을 앞뒤 공백이 제거된 str 튜플로 정규화"""
+    return tuple('' if v is None else str(v).strip() for v in values)
+
+
+class StockIndex:
+    """한 지역의 읽기 전용 종목 인덱스
+
+    종목명/종목코드와 검색용 소문자 형태는 정규화해 PackedText(이어 붙인 str 하나)로,
+    시가총액은 int64 배열로 둔다 (행마다 파이썬 객체를 만들지 않음).
+    검색 응답에 들어갈 행별 JSON 조각(row_json)과 종목코드 → 행 번호 해시 색인도 함께 만들어 둔다.
+    나머지 컬럼은 memory-map 된 원본 테이블(table)에 남겨 두고 상세 조회 때만 읽는다.
+    생성 이후에는 값을 바꾸지 않으므로 여러 요청이 동시에 공유해도 안전하다.
+    """
+
+    __slots__ = ('region', 'names', 'tickers', 'names_lower', 'tickers_lower',
+                 'marcaps', 'row_json', 'ticker_index', 'table')
+
+    def __init__(self, region, table):
+        name_col, ticker_col, marcap_col = REGION_COLUMNS[region]
+
+        self.region = region
+        self.names = PackedText(_normalize(table[name_col]))
+        self.tickers = PackedText(_normalize(table[ticker_col]))
+        self.names_lower = PackedText(name.lower() for name in self.names)
+        self.tickers_lower = PackedText(ticker.lower() for ticker in self.tickers)
+
+        # 시가총액 (원 단위 정수, 없으면 MISSING_MARCAP / 해외주식은 시가총액 정보가 없음)
+        if marcap_col and marcap_col in table.columns:
+            values = np.asarray(table[marcap_col], dtype=np.float64)
+            self.marcaps = np.where(np.isnan(values), MISSING_MARCAP, values).astype(np.int64)
+        else:
+            self.marcaps = np.full(len(self.names), MISSING_MARCAP, dtype=np.int64)
+
+        self.row_json = PackedBytes(
+            stock_fragment(name, ticker, region, self.marcap(row))
+            for row, (name, ticker) in enumerate(zip(self.names, self.tickers))
+        )
+
+        # 종목코드(대소문자 무시) → 행 번호, 중복 코드는 먼저 나온 행을 사용
+        self.ticker_index = HashIndex(self.tickers_lower)
+
+        # 상세 조회용 원본 행 데이터 (memory-map 된 컬럼형 캐시)
+        self.table = table
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f'StockIndex 는 읽기 전용입니다: {name}')
+        object.__setattr__(self, name, value)
+
+    def __len__(self):
+        return len(self.names)
+
+    def marcap(self, row):
+        """행의 시가총액 (float), 없으면 None"""
+        value = int(self.marcaps[row])
+        return None if value == MISSING_MARCAP else float(value)
+
+    def find(self, ticker):
+        """종목코드의 행 번호, 없으면 None"""
+        key = ticker.strip().lower()
+        for row in self.ticker_index.get(key):
+            if self.tickers_lower[row] == key:
+                return row
+        return None
+
+    def details(self, rows):
+        """행 번호 목록의 원본 행을 dict 목록으로 반환 (결측치는 None)"""
+        return self.table.rows(rows)
+
+    def memory_usage(self):
+        """인덱스가 따로 가진 버퍼 크기 (바이트, memory-map 된 원본 테이블 제외)"""
+        return {
+            'names': self.names.nbytes + self.names_lower.nbytes,
+            'tickers': self.tickers.nbytes + self.tickers_lower.nbytes,
+            'marcaps': self.marcaps.nbytes,
+            'rowJson': self.row_json.nbytes,
+            'tickerIndex': self.ticker_index.nbytes,
+        }
+
+
+class StockDataset:
+    """KR/US 인덱스와 검색 엔진, 전체 목록 순열, 종목명 → 종목코드 색인 묶음"""
+
+    def __init__(self, kr, us, version=None):
+        self.kr = kr
+        self.us = us
+        self.engines = {REGION_KR: SearchEngine(kr), REGION_US: SearchEngine(us)}
+        self.fuzzy_engines = {
+            region: FuzzySearchEngine(engine) for region, engine in self.engines.items()
+        }
+        self.browsers = {region: StockBrowser(engine) for region, engine in self.engines.items()}
+        self.resolver = NameResolver((kr, us))
+        self.version = version
+        self.load_seconds = None
+        self.loaded_at = time.time()
+
+    def get(self, region):
+        """region 값("1"/"2" 또는 1/2)에 해당하는 인덱스 반환, 없으면 None"""
+        return {REGION_KR: self.kr, REGION_US: self.us}.get(_to_region(region))
+
+    def engine(self, region, fuzzy=False):
+        """region 값에 해당하는 검색 엔진 반환 (fuzzy=True 면 초성/오타 허용 엔진), 없으면 None"""
+        engines = self.fuzzy_engines if fuzzy else self.engines
+        return engines.get(_to_region(region))
+
+    def search_all(self, query, limit=30, fuzzy=False):
+        """KR/US 를 한 랭킹으로 검색한 상위 limit 개 (StockIndex, 행 번호) 목록"""
+        indexes = (self.kr, self.us)
+        engines = [self.engine(index.region, fuzzy) for index in indexes]
+        return [(indexes[i], row) for i, row in search_regions(engines, query, limit)]
+
+    def browser(self, region):
+        """region 값에 해당하는 전체 목록 순열(StockBrowser) 반환, 없으면 None"""
+        return self.browsers.get(_to_region(region))
+
+
+def _to_region(region):
+    try:
+        return int(region)
+    except (TypeError, ValueError):
+        return None
+
+
+# pandas 는 캐시가 없을 때 CSV 를 파싱하는 데만 쓰므로, 캐시로 기동하는 워커는 import 하지 않는다
+def read_kr_master(path):
+    import pandas as pd
+
+    # 종목코드의 앞자리 0 이 사라지지 않도록 문자열로 읽는다
+    return pd.read_csv(path, dtype={'Code': str, 'ISU_CD': str}, index_col=0)
+
+
+def read_us_master(path):
+    import pandas as pd
+
+    # 'NA' 같은 티커가 결측치로 바뀌지 않도록 기본 결측 처리를 끈다
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def file_digest(path):
+    """파일 내용의 SHA-256 (hex)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_dataset(kr_path, us_path, cache_dir=DEFAULT_CACHE_DIR):
+    """CSV 마스터로 StockDataset 생성
+
+    원본은 컬럼형 캐시(stock_cache)를 통해 읽으므로 CSV 는 내용이 바뀌었을 때만 파싱한다.
+    """
+    started = time.perf_counter()
+    kr_digest, us_digest = file_digest(kr_path), file_digest(us_path)
+    version = hashlib.sha256((kr_digest + us_digest).encode()).hexdigest()[:12]
+
+    kr = StockIndex(REGION_KR, open_table(kr_path, read_kr_master, kr_digest, cache_dir))
+    us = StockIndex(REGION_US, open_table(us_path, read_us_master, us_digest, cache_dir))
+    dataset = StockDataset(kr, us, version)
+    release_free_memory()
+    dataset.load_seconds = time.perf_counter() - started
+    return dataset
+
+
+class StockStore:
+    """현재 사용 중인 StockDataset 보관소
+
+    요청 처리 코드는 `current` 를 한 번 읽어 그 데이터셋만 사용한다.
+    마스터 파일이 바뀌면 백그라운드 스레드에서 새 데이터셋을 완전히 만든 뒤
+    `current` 참조만 교체하므로, 처리 중인 요청은 만들다 만 인덱스를 보지 않는다.
+    """
+
+    def __init__(self, kr_path=DEFAULT_KR_PATH, us_path=DEFAULT_US_PATH, cache_dir=DEFAULT_CACHE_DIR):
+        self.kr_path = kr_path
+        self.us_path = us_path
+        self.cache_dir = cache_dir
+        self.current = None
+        self.reload_count = 0
+        self.last_error = None
+
+        self._fingerprint = None
+        self._pending = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def fingerprint(self):
+        """변경 감지용 (mtime, size) 묶음"""
+        stats = [os.stat(path) for path in (self.kr_path, self.us_path)]
+        return tuple((st.st_mtime_ns, st.st_size) for st in stats)
+
+    def load(self):
+        with self._reload_lock:
+            fingerprint = self.fingerprint()
+            self.current = load_dataset(self.kr_path, self.us_path, self.cache_dir)
+            self._fingerprint = fingerprint
+        return self.current
+
+    def reload(self):
+        """새 데이터셋을 만들어 교체, 실패하면 기존 데이터셋을 그대로 유지"""
+        try:
+            self.load()
+            self.reload_count += 1
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.last_error = f'{type(e).__name__}: {e}'
+            return False
+
+    def start_watcher(self, interval):
+        """interval 초마다 마스터 파일 변경을 확인하는 데몬 스레드 시작"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name='stock-master-watcher', daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    @property
+    def watching(self):
+        return self._watcher is not None
+
+    def poll(self):
+        """마스터 파일 변경을 한 번 확인하고, 바뀐 뒤 한 주기 동안 그대로면 다시 로드 (교체했으면 True)
+
+        watcher 스레드가 interval 초마다 호출한다. prefork 운영 모드에서는 마스터 프로세스가 직접 호출한다.
+        """
+        try:
+            fingerprint = self.fingerprint()
+        except OSError as e:
+            # 파일 교체 중 잠시 사라질 수 있으므로 다음 주기에 다시 확인
+            self.last_error = f'{type(e).__name__}: {e}'
+            return False
+
+        if fingerprint == self._fingerprint:
+            self._pending = None
+        elif fingerprint != self._pending:
+            # 쓰는 중인 파일을 읽지 않도록 한 주기 동안 바뀌지 않을 때까지 기다린다
+            self._pending = fingerprint
+        else:
+            self._pending = None
+            if self.reload():
+                return True
+            # 실패한 버전은 다시 시도하지 않고 다음 변경을 기다린다
+            self._fingerprint = fingerprint
+        return False
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            self.poll()
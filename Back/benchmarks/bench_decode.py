@@ -0,0 +1,87 @@
+"""
+CODEF 응답 처리 마이크로 벤치마크
+
+이전 방식(response.text → unquote → json.loads → jsonify 재직렬화)과
+codef_payloads 의 단일 경로(bytes unquote → orjson 파싱 + 숫자 변환 → 한 번 직렬화)를 비교한다.
+
+사용법:
+    python Back/benchmarks/bench_decode.py [--items 300] [--iterations 500]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CODEF_API'))
+
+from codef_payloads import decode_response, dumps
+
+
+def make_body(items):
+    """resItemList 가 items 개인 퍼센트 인코딩된 잔고 조회 응답 bytes"""
+    data = {
+        'result': {'code': 'CF-00000', 'message': '성공'},
+        'data': {
+            'resAccount': '20901920648',
+            'rsTotAmt': f'{items * 1_000_000:,}',
+            'resDepositReceived': '150,000',
+            'resItemList': [
+                {
+                    'resIsName': f'종목{i}',
+                    'resPrice': f'{72_500 + i:,}',
+                    'resQuantity': str(10 + i),
+                    'resAmount': f'{(72_500 + i) * (10 + i):,}',
+                    'resAvailQuantity': str(10 + i),
+                }
+                for i in range(items)
+            ],
+        },
+    }
+    return urllib.parse.quote(json.dumps(data, ensure_ascii=False)).encode('ascii')
+
+
+def previous_pipeline(body):
+    text = body.decode('utf-8')                 # response.text
+    decoded = urllib.parse.unquote(text)        # unquote
+    data = json.loads(decoded)                  # json.loads
+    return json.dumps(data).encode('utf-8')     # jsonify
+
+
+def single_pass_pipeline(body):
+    return dumps(decode_response(body))
+
+
+def measure(fn, body, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(body)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(items=300, iterations=500):
+    body = make_body(items)
+    previous = measure(previous_pipeline, body, iterations)
+    single = measure(single_pass_pipeline, body, iterations)
+    return {
+        'items': items,
+        'bodyBytes': len(body),
+        'iterations': iterations,
+        'previousUs': round(previous, 1),
+        'singlePassUs': round(single, 1),
+        'speedup': round(previous / single, 2),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=300)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    result = run(args.items, args.iterations)
+    print(f"종목 {result['items']}개, 응답 {result['bodyBytes']:,} bytes, {result['iterations']}회")
+    print(f"  이전 방식  : {result['previousUs']:>10.1f} us/response")
+    print(f"  단일 경로  : {result['singlePassUs']:>10.1f} us/response")
+    print(f"  개선 배율  : {result['speedup']:>10.2f}x")
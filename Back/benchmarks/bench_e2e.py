@@ -0,0 +1,250 @@
+"""
+종단간 부하 시나리오 (서버를 실제로 띄워 HTTP 로 측정)
+
+autocomplete
+    검색 API 서버(DeepLearning/server.py, 운영 모드 워커 1개)를 합성 마스터로 띄우고,
+    동시 사용자들이 종목명을 한 글자씩 입력하는 것처럼 접두어 검색을 연달아 보낸다.
+    (입력할 때마다 요청이 나가는 자동완성 폭주, 응답 캐시 적중 포함)
+
+portfolio
+    로컬 CODEF 대체 서버(CODEF_API/fake_codef.py) 와 게이트웨이(async_gateway.py 또는
+    testflask.py)를 띄우고, 여러 사용자가 동시에 다계좌 포트폴리오(/stock/balances)를
+    새로 고치는 상황을 만든다. 일부 요청은 force_refresh 로 결과 캐시를 건너뛴다.
+
+결과는 시나리오별 요청 수, 오류 수, RPS, p50/p95/p99 지연 시간과 서버 RSS(MB) 이다.
+부하 생성기와 서버가 같은 머신에서 돌므로 절대값보다 같은 환경에서의 비교에 사용한다.
+
+사용법:
+    python Back/benchmarks/bench_e2e.py [--scenario autocomplete,portfolio] [--rows 10000]
+        [--users 50] [--gateway async|flask] [--json]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+from bench_gateway import Connection
+from bench_stats import rss_mb, summarize
+from synthetic_master import write_masters
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH_DIR = os.path.join(BENCH_DIR, '..', 'DeepLearning')
+CODEF_DIR = os.path.join(BENCH_DIR, '..', 'CODEF_API')
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'stock-bench')
+HOST = '127.0.0.1'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(process, url, timeout=300):
+    """url 이 200 을 돌려줄 때까지 대기 (프로세스가 먼저 죽으면 오류)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'서버가 시작 중에 종료되었습니다: {process.args}')
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return response.read()
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f'{url} 이(가) {timeout}초 안에 준비되지 않았습니다.')
+
+
+class Server:
+    """벤치마크 동안만 띄우는 서버 프로세스"""
+
+    def __init__(self, args, cwd, env=None, ready_path='/', port=None):
+        self.port = port or free_port()
+        self.process = subprocess.Popen(
+            [sys.executable] + [arg.format(port=self.port) for arg in args],
+            cwd=cwd, env=dict(os.environ, **(env or {})),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self.ready_body = wait_ready(self.process, self.url(ready_path))
+
+    def url(self, path=''):
+        return f'http://{HOST}:{self.port}{path}'
+
+    def rss_mb(self):
+        return rss_mb(self.process.pid, include_children=True)
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+async def drive(port, sessions, concurrency):
+    """sessions(요청 목록의 목록)를 concurrency 개 연결로 나눠 보내고 지연 시간 요약 반환
+
+    세션 하나는 한 사용자의 연속 요청으로, 같은 연결에서 순서대로 보낸다.
+    요청은 (method, path, payload) 튜플이다.
+    """
+    queue = list(reversed(sessions))
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        connection = Connection(HOST, port)
+        while queue:
+            for method, path, payload in queue.pop():
+                started = time.perf_counter()
+                try:
+                    status, _ = await connection.request(method, path, payload)
+                    if status != 200:
+                        errors += 1
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    connection.close()
+                latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {'errors': errors, 'seconds': round(elapsed, 3), **summarize(latencies, elapsed)}
+
+
+def typing_sessions(kr_path, us_path, users, words, seed=7):
+    """사용자마다 종목명 words 개를 한 글자씩 입력하는 검색 요청 목록"""
+    with open(kr_path, encoding='utf-8') as f:
+        kr_names = [row['Name'] for row in csv.DictReader(f)]
+    with open(us_path, encoding='utf-8') as f:
+        us_names = [row['Company Name'].split()[0] for row in csv.DictReader(f)]
+
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(users):
+        session = []
+        for _ in range(words):
+            region, names = rng.choice((('1', kr_names), ('2', us_names)))
+            name = rng.choice(names)
+            for end in range(1, min(len(name), 6) + 1):
+                query = urllib.parse.quote(name[:end])
+                session.append(('GET', f'/api/stocks/search?query={query}&region={region}&limit=10', None))
+        sessions.append(session)
+    return sessions
+
+
+def run_autocomplete(rows=10000, users=50, words=4, seed=7, work_dir=DEFAULT_WORK_DIR):
+    kr_path, us_path = write_masters(os.path.join(work_dir, 'masters'), rows, seed)
+    with tempfile.TemporaryDirectory(dir=work_dir) as cache_dir:
+        server = Server(
+            ['server.py', '--host', HOST, '--port', '{port}', '--workers', '1'], SEARCH_DIR,
+            env={'KR_STOCK_PATH': kr_path, 'US_STOCK_PATH': us_path, 'STOCK_CACHE_DIR': cache_dir,
+                 'STOCK_RELOAD_INTERVAL': '0'},
+            ready_path='/ready',
+        )
+        try:
+            rss_idle = server.rss_mb()
+            sessions = typing_sessions(kr_path, us_path, users, words, seed)
+            result = asyncio.run(drive(server.port, sessions, users))
+            return {'rows': rows, 'users': users, 'rssIdleMb': rss_idle, 'rssMb': server.rss_mb(), **result}
+        finally:
+            server.stop()
+
+
+def refresh_sessions(users, accounts, rounds, force_ratio, seed=7):
+    """사용자마다 계좌 accounts 개의 포트폴리오를 rounds 번 새로 고치는 요청 목록"""
+    rng = random.Random(seed)
+    sessions = []
+    for user in range(users):
+        connected_id = f'bench-user-{user}'
+        body = {'accounts': [
+            {'organization': '0247', 'connectedId': connected_id,
+             'account': f'{user:06d}{n:05d}', 'account_password': '1234'}
+            for n in range(accounts)
+        ]}
+        session = []
+        for _ in range(rounds):
+            force = rng.random() < force_ratio
+            payload = {'accounts': [dict(a, force_refresh=force) for a in body['accounts']]}
+            session.append(('POST', '/stock/balances', json.dumps(payload).encode()))
+        sessions.append(session)
+    return sessions
+
+
+GATEWAY_COMMANDS = {
+    'async': ['async_gateway.py', '--host', HOST, '--port', '{port}', '--workers', '1'],
+    'flask': ['-c', f'import testflask; testflask.app.run(host="{HOST}", port={{port}}, threaded=True)'],
+}
+
+
+def run_portfolio(users=100, accounts=3, rounds=3, force_ratio=0.2, gateway='async',
+                  upstream_latency='lognormal:0.05,0.5', seed=7):
+    fake = Server(['fake_codef.py', '--host', HOST, '--port', '{port}', '--latency', upstream_latency,
+                   '--seed', str(seed)], CODEF_DIR, ready_path='/_public-key')
+    try:
+        public_key = json.loads(fake.ready_body)['publicKey']
+        server = Server(GATEWAY_COMMANDS[gateway], CODEF_DIR, env={
+            'USE_CODEF_DUMMY': 'false', 'CODEF_PUBLIC_KEY': public_key,
+            'CODEF_OAUTH_URL': fake.url(), 'CODEF_API_URL': fake.url(),
+            'CODEF_CLIENT_ID': 'bench', 'CODEF_CLIENT_SECRET': 'bench',
+        }, ready_path='/cache/status')
+        try:
+            rss_idle = server.rss_mb()
+            sessions = refresh_sessions(users, accounts, rounds, force_ratio, seed)
+            result = asyncio.run(drive(server.port, sessions, users))
+            with urllib.request.urlopen(server.url('/cache/status')) as response:
+                cache = json.loads(response.read())
+            return {'gateway': gateway, 'users': users, 'accountsPerUser': accounts,
+                    'rssIdleMb': rss_idle, 'rssMb': server.rss_mb(),
+                    'cacheHitRatio': cache.get('hitRatio'), **result}
+        finally:
+            server.stop()
+    finally:
+        fake.stop()
+
+
+SCENARIOS = ('autocomplete', 'portfolio')
+
+
+def run(scenarios=SCENARIOS, rows=10000, users=50, gateway='async', seed=7, work_dir=DEFAULT_WORK_DIR):
+    os.makedirs(work_dir, exist_ok=True)
+    results = {}
+    if 'autocomplete' in scenarios:
+        results['autocomplete'] = run_autocomplete(rows, users, seed=seed, work_dir=work_dir)
+    if 'portfolio' in scenarios:
+        results['portfolio'] = run_portfolio(users, gateway=gateway, seed=seed)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', default=','.join(SCENARIOS))
+    parser.add_argument('--rows', type=int, default=10000, help='autocomplete 합성 마스터 행 수')
+    parser.add_argument('--users', type=int, default=50, help='동시 사용자 수')
+    parser.add_argument('--gateway', choices=sorted(GATEWAY_COMMANDS), default='async')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    results = run(args.scenario.split(','), args.rows, args.users, args.gateway, args.seed, args.work_dir)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for name, result in results.items():
+            print(name)
+            for key, value in result.items():
+                print(f"  {key:>16}: {value}")
@@ -0,0 +1,130 @@
+"""
+CODEF 게이트웨이 부하 테스트
+
+이미 떠 있는 게이트웨이(testflask.py 또는 async_gateway.py)에 동시 요청을 보내
+처리량(RPS)과 지연 시간 분포를 측정한다. upstream 은 더미 모드나 로컬 대체 CODEF 서버
+(Back/CODEF_API/fake_codef.py, CODEF_API_URL) 를 사용해 실제 CODEF 를 호출하지 않도록 한다.
+--vary 를 주면 요청마다 계좌번호를 바꿔 결과 캐시를 거치지 않고 upstream 까지 호출한다.
+
+사용법:
+    python Back/benchmarks/bench_gateway.py --url http://127.0.0.1:5000 \
+        [--path /stock/balance] [--concurrency 500] [--requests 2000] [--vary]
+"""
+import argparse
+import asyncio
+import json
+import time
+import urllib.parse
+
+from bench_stats import summarize
+
+DEFAULT_BODY = {
+    'organization': '0247',
+    'connectedId': 'bench-connected-id',
+    'account': '20901920648',
+    'account_password': '1234',
+}
+
+
+class Connection:
+    """keep-alive HTTP/1.1 연결 하나 (부하 생성기 자체가 병목이 되지 않도록 asyncio 스트림으로 직접 구현)"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        """요청 하나를 보내고 (상태 코드, 본문) 반환"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n'
+        if payload is not None:
+            head += f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+        self.writer.write((head + '\r\n').encode() + (payload or b''))
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('연결이 닫혔습니다.')
+        length = 0
+        close = False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                close = True
+        body = await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return int(status_line.split()[1]), body
+
+    async def post(self, path, payload):
+        status, _ = await self.request('POST', path, payload)
+        return status
+
+    async def get(self, path):
+        status, _ = await self.request('GET', path)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def run(url, path='/stock/balance', concurrency=500, total=2000, body=None, vary=False):
+    parsed = urllib.parse.urlsplit(url)
+    body = body or DEFAULT_BODY
+    base_payload = json.dumps(body).encode()
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal errors, remaining
+        payload = base_payload
+        connection = Connection(parsed.hostname, parsed.port or 80)
+        while remaining > 0:
+            remaining -= 1
+            if vary:
+                payload = json.dumps(dict(body, account=f"{body['account']}-{remaining}")).encode()
+            started = time.perf_counter()
+            try:
+                if await connection.post(path, payload) != 200:
+                    errors += 1
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                connection.close()
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        **summarize(latencies, elapsed, digits=1),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--path', default='/stock/balance')
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--vary', action='store_true', help='요청마다 계좌번호를 바꿔 결과 캐시 우회')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.path, args.concurrency, args.requests, vary=args.vary))
+    for key, value in result.items():
+        print(f"{key:>12}: {value}")
@@ -0,0 +1,153 @@
+"""
+종목 마스터 인덱스 메모리 리포트
+
+합성 마스터(synthetic_master.py, 기본 KR/US 각 100만 행)로 검색 서버와 같은 StockDataset 을 만든 뒤
+    1) 인덱스를 만든 프로세스의 RSS (anon/file) 와 구조별 버퍼 크기
+    2) prefork 처럼 그 프로세스를 fork 한 워커들이 검색/조회를 처리한 뒤의 워커별 private / PSS
+를 출력한다. private 가 워커를 하나 늘릴 때마다 추가로 드는 메모리다.
+
+--source 로 다른 체크아웃의 Back/DeepLearning 을 지정하면 같은 조건으로 이전 구현과 비교할 수 있다
+(구조별 크기는 memory_usage() 가 있는 구현에서만 출력).
+측정마다 새 프로세스에서 실행하며, 컬럼형 캐시는 먼저 별도 프로세스에서 만들어 둔다 (pandas 제외).
+
+사용법:
+    python Back/benchmarks/bench_memory.py [--rows 1000000] [--workers 2] [--queries 2000]
+        [--source Back/DeepLearning] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(BENCH_DIR, '..', 'DeepLearning')
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'stock-bench')
+
+from bench_stats import memory_mb
+from synthetic_master import write_masters
+
+
+def _structure_sizes(dataset):
+    """구현이 memory_usage() 로 알려주는 구조별 버퍼 크기 (MB)"""
+    parts = {}
+    for region, index in (('kr', dataset.kr), ('us', dataset.us)):
+        parts[f'{region}.index'] = index
+        parts[f'{region}.search'] = dataset.engine(index.region)
+        parts[f'{region}.fuzzy'] = dataset.engine(index.region, fuzzy=True)
+        parts[f'{region}.browse'] = getattr(dataset, 'browsers', {}).get(index.region)
+    parts['resolver'] = getattr(dataset, 'resolver', None)
+
+    sizes = {}
+    for prefix, part in parts.items():
+        if hasattr(part, 'memory_usage'):
+            for name, size in part.memory_usage().items():
+                sizes[f'{prefix}.{name}'] = round(size / 2 ** 20, 1)
+    return sizes
+
+
+def _serve(dataset, queries, seed):
+    """워커 하나의 요청 처리 흉내 (자동완성/초성 검색, 종목코드 조회, 상세 조회)"""
+    rng = random.Random(seed)
+    for _ in range(queries):
+        index = dataset.kr if rng.random() < 0.7 else dataset.us
+        row = rng.randrange(len(index))
+        name = index.names[row]
+        rows = dataset.engine(index.region, fuzzy=rng.random() < 0.3).search(name[:rng.randint(1, 4)], 30)
+        b''.join(index.row_json[r] for r in rows)
+        index.details([index.find(index.tickers[row])])
+
+
+def measure(rows, workers, queries, seed, work_dir):
+    """현재 프로세스에서 데이터셋을 만들고 fork 한 워커들의 메모리를 잰다 (JSON dict 반환)"""
+    from stock_index import load_dataset
+
+    kr_path, us_path = write_masters(os.path.join(work_dir, 'masters'), rows, seed)
+    cache_dir = os.path.join(work_dir, 'memory-cache')
+    before = memory_mb()
+    dataset = load_dataset(kr_path, us_path, cache_dir)
+    result = {
+        'rows': rows,
+        'loadSeconds': round(dataset.load_seconds, 2),
+        'baseRssMb': before.get('rss'),
+        'parent': memory_mb(),
+        'structuresMb': _structure_sizes(dataset),
+        'workers': [],
+    }
+
+    pipes = []
+    for worker in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _serve(dataset, queries, seed + worker)
+            with os.fdopen(write_fd, 'w') as out:
+                out.write(json.dumps(memory_mb()))
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            result['workers'].append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return result
+
+
+def run(rows=1000000, workers=2, queries=2000, seed=7, source=DEFAULT_SOURCE, work_dir=DEFAULT_WORK_DIR):
+    """캐시를 준비한 뒤 새 프로세스에서 measure 를 실행해 결과 dict 반환"""
+    os.makedirs(work_dir, exist_ok=True)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join((os.path.abspath(source), BENCH_DIR)))
+    common = ['--rows', str(rows), '--seed', str(seed), '--work-dir', work_dir]
+    subprocess.run([sys.executable, __file__, '--_prepare'] + common, check=True, env=env)
+    output = subprocess.run(
+        [sys.executable, __file__, '--_child', '--workers', str(workers), '--queries', str(queries)] + common,
+        check=True, capture_output=True, text=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_report(result):
+    parent = result['parent']
+    print(f"{result['rows']:,} 행 x KR/US  로드 {result['loadSeconds']}s")
+    print(f"  인덱스를 만든 프로세스  RSS {parent['rss']} MB (anon {parent['anon']}, file {parent['file']}), "
+          f"기동 직후 {result['baseRssMb']} MB")
+    for name, size in result['structuresMb'].items():
+        print(f'    {name:<20} {size:>8} MB')
+    for i, worker in enumerate(result['workers']):
+        print(f"  워커 {i}  RSS {worker['rss']} MB  PSS {worker.get('pss')} MB  private {worker.get('private')} MB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='측정할 Back/DeepLearning 디렉터리')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='합성 마스터/캐시를 둘 디렉터리')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--_prepare', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--_child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._prepare:
+        from stock_cache import open_table
+        import stock_index
+
+        kr_path, us_path = write_masters(os.path.join(args.work_dir, 'masters'), args.rows, args.seed)
+        for path, reader in ((kr_path, stock_index.read_kr_master), (us_path, stock_index.read_us_master)):
+            open_table(path, reader, stock_index.file_digest(path), os.path.join(args.work_dir, 'memory-cache'))
+        sys.exit(0)
+    if args._child:
+        print(json.dumps(measure(args.rows, args.workers, args.queries, args.seed, args.work_dir)))
+        sys.exit(0)
+
+    result = run(args.rows, args.workers, args.queries, args.seed, args.source, args.work_dir)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
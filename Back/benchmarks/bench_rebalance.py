@@ -0,0 +1,124 @@
+"""
+리밸런싱 계획(rebalance.py) 벤치마크
+
+    single   종목 수(기본 5/20/100/500)별 포트폴리오 하나의 parse_portfolio + plan 지연 시간
+    batch    포트폴리오 수(기본 1천/1만, 종목 20개)별 plan_batch 한 번과 plan 반복 호출 비교
+
+입력은 국내/해외 종목과 원화/달러 현금이 섞인 무작위 포트폴리오이며 가격은 요청에 포함한다
+(마스터 종가 조회 비용은 서버의 종목코드 조회와 같으므로 제외).
+
+사용법:
+    python Back/benchmarks/bench_rebalance.py [--assets 5,20,100,500] [--batches 1000,10000] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'DeepLearning'))
+
+from bench_stats import summarize
+from rebalance import parse_portfolio, plan, plan_batch
+
+DEFAULT_ASSETS = (5, 20, 100, 500)
+DEFAULT_BATCHES = (1000, 10000)
+BATCH_ASSETS = 20
+FX_RATE = 1380.0
+
+
+def random_request(rng, assets):
+    """종목 assets 개의 리밸런싱 요청 dict (약 70% 종목만 보유, 목표 비중 합은 0.8~1)"""
+    holdings = [
+        {'ticker': 'KRW', 'region': 0, 'quantity': rng.uniform(0, 2e7)},
+        {'ticker': 'USD', 'region': 0, 'quantity': rng.uniform(0, 5e3)},
+    ]
+    targets = []
+    weights = [rng.random() for _ in range(assets)]
+    scale = rng.uniform(0.8, 1.0) / sum(weights)
+    for i, weight in enumerate(weights):
+        region = rng.choice((1, 2))
+        ticker = f'{i:06d}' if region == 1 else f'T{i}'
+        price = rng.uniform(1000, 500000) if region == 1 else rng.uniform(5, 800)
+        if rng.random() < 0.7:
+            holdings.append({'ticker': ticker, 'region': region, 'quantity': rng.randint(1, 200), 'price': price})
+        targets.append({'ticker': ticker, 'region': region, 'weight': weight * scale, 'price': price})
+    return {'holdings': holdings, 'targets': targets, 'fxRate': FX_RATE,
+            'driftBand': rng.choice((0.0, 0.01)), 'minTradeValue': rng.choice((0.0, 10000.0))}
+
+
+def run_single(assets, count=200, seed=7):
+    """종목 assets 개 포트폴리오 count 개를 하나씩 계획 (서버의 /api/rebalance/plan 과 같은 경로)"""
+    rng = random.Random(seed)
+    requests = [random_request(rng, assets) for _ in range(count)]
+    plan(parse_portfolio(requests[0]))
+    best = None
+    timer = time.perf_counter
+    for _ in range(3):
+        latencies = []
+        started = timer()
+        for data in requests:
+            t = timer()
+            plan(parse_portfolio(data))
+            latencies.append(timer() - t)
+        elapsed = timer() - started
+        if best is None or elapsed < best[1]:
+            best = (latencies, elapsed)
+    return summarize(*best)
+
+
+def run_batch(portfolios, assets=BATCH_ASSETS, seed=7):
+    """포트폴리오 portfolios 개를 plan_batch 한 번으로 계획한 시간과 plan 반복 호출 시간 비교"""
+    rng = random.Random(seed)
+    parsed = [parse_portfolio(random_request(rng, assets)) for _ in range(portfolios)]
+    timer = time.perf_counter
+
+    started = timer()
+    batch = plan_batch(parsed)
+    batch_seconds = timer() - started
+
+    started = timer()
+    loop = [plan(p) for p in parsed]
+    loop_seconds = timer() - started
+
+    if batch != loop:
+        raise AssertionError('plan_batch 결과가 plan 반복 호출 결과와 다릅니다.')
+    return {
+        'batchSeconds': round(batch_seconds, 3),
+        'loopSeconds': round(loop_seconds, 3),
+        'rps': round(portfolios / batch_seconds, 1),
+        'speedup': round(loop_seconds / batch_seconds, 2),
+    }
+
+
+def run(assets=DEFAULT_ASSETS, batches=DEFAULT_BATCHES, seed=7):
+    return {
+        'single': {str(n): run_single(n, seed=seed) for n in assets},
+        'batch': {str(n): run_batch(n, seed=seed) for n in batches},
+    }
+
+
+def print_report(result):
+    for assets, stats in result['single'].items():
+        print(f"종목 {int(assets):>4}개  p50 {stats['p50Ms']:>8.3f}ms  p95 {stats['p95Ms']:>8.3f}ms  "
+              f"p99 {stats['p99Ms']:>8.3f}ms")
+    for portfolios, stats in result['batch'].items():
+        print(f"포트폴리오 {int(portfolios):>6,}개 (종목 {BATCH_ASSETS}개)  일괄 {stats['batchSeconds']:.3f}s  "
+              f"반복 {stats['loopSeconds']:.3f}s  x{stats['speedup']}  {stats['rps']:,.0f} 개/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', default=','.join(map(str, DEFAULT_ASSETS)))
+    parser.add_argument('--batches', default=','.join(map(str, DEFAULT_BATCHES)))
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    result = run([int(n) for n in args.assets.split(',')], [int(n) for n in args.batches.split(',')], args.seed)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
@@ -0,0 +1,65 @@
+"""
+RSA 비밀번호 암호화 마이크로 벤치마크
+
+요청마다 공개키를 파싱하던 방식(이전 publicEncRSA)과
+기동 시 한 번 파싱한 RSAEncryptor 를 재사용하는 방식의 호출당 비용을 비교한다.
+
+사용법:
+    python Back/benchmarks/bench_rsa.py [--iterations 2000]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CODEF_API'))
+
+from Crypto.PublicKey import RSA
+from Crypto.Cipher import PKCS1_v1_5 as Cipher_PKCS1_v1_5
+
+from codef_crypto import RSAEncryptor
+
+
+def encrypt_per_call(public_key, data):
+    """이전 구현: 호출마다 base64 디코딩 + RSA.importKey"""
+    key = RSA.importKey(base64.b64decode(public_key))
+    cipher = Cipher_PKCS1_v1_5.new(key)
+    return base64.b64encode(cipher.encrypt(data.encode())).decode('utf-8')
+
+
+def measure(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations=2000, key_bits=2048):
+    key = RSA.generate(key_bits)
+    public_key = base64.b64encode(key.publickey().export_key('DER')).decode()
+    password = 'account-password-1234'
+
+    encryptor = RSAEncryptor(public_key)
+    per_call = measure(lambda: encrypt_per_call(public_key, password), iterations)
+    cached = measure(lambda: encryptor.encrypt(password), iterations)
+    return {
+        'keyBits': key_bits,
+        'iterations': iterations,
+        'perCallImportUs': round(per_call, 2),
+        'cachedEncryptorUs': round(cached, 2),
+        'speedup': round(per_call / cached, 2),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--key-bits', type=int, default=2048)
+    args = parser.parse_args()
+
+    result = run(args.iterations, args.key_bits)
+    print(f"키 길이 {result['keyBits']}bit, {result['iterations']}회")
+    print(f"  호출마다 키 파싱 : {result['perCallImportUs']:>10.2f} us/call")
+    print(f"  암호화기 재사용  : {result['cachedEncryptorUs']:>10.2f} us/call")
+    print(f"  개선 배율        : {result['speedup']:>10.2f}x")
@@ -0,0 +1,202 @@
+"""
+종목 검색 / 종목코드 조회 마이크로 벤치마크
+
+합성 마스터(synthetic_master.py, 기본 1만/10만/100만 행)를 load_dataset 으로 읽은 뒤
+검색 유형별로 SearchEngine/FuzzySearchEngine.search 와 StockIndex.find 호출 시간을 잰다.
+행 수마다 별도 프로세스에서 실행하므로 RSS 는 해당 크기의 데이터셋만 올린 상태의 값이다.
+
+검색 유형:
+    kr_prefix      국내 종목명 앞 1~3 글자 (자동완성 입력 중)
+    kr_substring   국내 종목명 중간 2 글자
+    kr_chosung     국내 종목명 앞 2~3 글자의 초성 (fuzzy)
+    us_prefix      해외 종목명 앞 1~4 글자
+    us_typo        해외 종목명 첫 단어에 오타 한 글자 (fuzzy)
+    ticker_prefix  국내 종목코드 앞 3 자리
+    ticker_lookup  KR/US 종목코드 완전 일치 조회 (StockIndex.find)
+    name_resolve   잔고 종목명 → 종목코드 변환 (NameResolver.resolve, KR/US 번갈아)
+    browse_first   빈 검색어 목록 첫 페이지 (StockBrowser.page, 정렬 기준 무작위)
+    browse_deep    빈 검색어 목록의 임의 위치 다음 페이지 (커서로 이어 읽기)
+    all_prefix     국내/해외 종목명 앞 1~3 글자로 region=all 검색 (StockDataset.search_all)
+    all_chosung    국내/해외 종목명 앞 2~3 글자의 초성/자모로 region=all fuzzy 검색
+
+사용법:
+    python Back/benchmarks/bench_search.py [--sizes 10000,100000,1000000] [--queries 2000] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'DeepLearning'))
+
+from bench_stats import rss_mb, summarize
+from synthetic_master import write_masters
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'stock-bench')
+
+
+def typo(rng, word):
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice('aeiou') + word[i + 1:]
+
+
+def build_queries(dataset, count, rng):
+    """검색 유형별 (호출 함수, 검색어 목록)"""
+    from browse import SORTS
+    from hangul import chosung
+
+    kr, us = dataset.kr, dataset.us
+    kr_rows = [rng.randrange(len(kr)) for _ in range(count)]
+    us_rows = [rng.randrange(len(us)) for _ in range(count)]
+    kr_names = [kr.names[row] for row in kr_rows]
+    us_names = [us.names[row] for row in us_rows]
+
+    kr_exact = dataset.engine(1).search
+    kr_fuzzy = dataset.engine(1, fuzzy=True).search
+    us_exact = dataset.engine(2).search
+    us_fuzzy = dataset.engine(2, fuzzy=True).search
+
+    def lookup(pair):
+        return kr.find(pair[0]), us.find(pair[1])
+
+    resolve = dataset.resolver.resolve
+
+    def search_all(query, limit):
+        return dataset.search_all(query, limit)
+
+    def search_all_fuzzy(query, limit):
+        return dataset.search_all(query, limit, fuzzy=True)
+
+    browser = dataset.browser(1)
+
+    def browse(item, limit):
+        return browser.page(item[0], item[1], limit)
+
+    # 순열의 임의 위치 행을 마지막으로 받은 것처럼 만든 커서
+    deep = []
+    for _ in range(count):
+        sort = rng.choice(SORTS)
+        row = browser.orders[sort][rng.randrange(len(kr))]
+        deep.append((sort, browser.cursor_after(sort, row)))
+
+    return {
+        'kr_prefix': (kr_exact, [name[:rng.randint(1, 3)] for name in kr_names]),
+        'kr_substring': (kr_exact, [name[1:3] or name for name in kr_names]),
+        'kr_chosung': (kr_fuzzy, [chosung(name[:rng.randint(2, 3)]) for name in kr_names]),
+        'us_prefix': (us_exact, [name[:rng.randint(1, 4)] for name in us_names]),
+        'us_typo': (us_fuzzy, [typo(rng, name.split()[0]) for name in us_names]),
+        'ticker_prefix': (kr_exact, [kr.tickers[row][:3] for row in kr_rows]),
+        'ticker_lookup': (lookup, [(kr.tickers[a], us.tickers[b]) for a, b in zip(kr_rows, us_rows)]),
+        'name_resolve': (resolve, [kr_names[i] if i % 2 else us_names[i] for i in range(count)]),
+        'browse_first': (browse, [(rng.choice(SORTS), None) for _ in range(count)]),
+        'browse_deep': (browse, deep),
+        'all_prefix': (search_all, [
+            (kr_names[i] if i % 2 else us_names[i])[:rng.randint(1, 3)] for i in range(count)
+        ]),
+        'all_chosung': (search_all_fuzzy, [
+            chosung((kr_names[i] if i % 2 else us_names[i])[:rng.randint(2, 3)]) for i in range(count)
+        ]),
+    }
+
+
+# limit 인자 없이 호출하는 조회 유형
+LOOKUPS = ('ticker_lookup', 'name_resolve')
+
+
+def measure(fn, queries, limit, repeat=3):
+    """검색어 목록을 repeat 번 반복해 가장 빨랐던 회차의 요약 반환 (다른 프로세스로 인한 잡음 제거)"""
+    best = None
+    timer = time.perf_counter
+    for _ in range(repeat):
+        latencies = []
+        started = timer()
+        for query in queries:
+            t = timer()
+            if limit is None:
+                fn(query)
+            else:
+                fn(query, limit)
+            latencies.append(timer() - t)
+        elapsed = timer() - started
+        if best is None or elapsed < best[1]:
+            best = (latencies, elapsed)
+    return summarize(*best)
+
+
+def run_size(rows, queries=2000, limit=30, seed=7, work_dir=DEFAULT_WORK_DIR):
+    """rows 행 데이터셋 하나를 현재 프로세스에서 측정"""
+    from stock_index import load_dataset
+
+    kr_path, us_path = write_masters(os.path.join(work_dir, 'masters'), rows, seed)
+    with tempfile.TemporaryDirectory(dir=work_dir) as cache_dir:
+        rss_before = rss_mb()
+        # 첫 로드는 CSV 파싱 + 컬럼형 캐시 생성, 두 번째는 캐시에서 기동하는 경우
+        cold_seconds = load_dataset(kr_path, us_path, cache_dir).load_seconds
+        dataset = load_dataset(kr_path, us_path, cache_dir)
+
+        rng = random.Random(seed)
+        result = {
+            'rows': rows,
+            'coldLoadSeconds': round(cold_seconds, 3),
+            'loadSeconds': round(dataset.load_seconds, 3),
+            'rssMb': rss_mb(),
+            'baseRssMb': rss_before,
+            'searches': {},
+        }
+        for name, (fn, items) in build_queries(dataset, queries, rng).items():
+            # 첫 호출의 지연(지연 초기화 등)이 분위수에 섞이지 않도록 한 번 예열
+            fn(items[0]) if name in LOOKUPS else fn(items[0], limit)
+            result['searches'][name] = measure(fn, items, None if name in LOOKUPS else limit)
+        result['rssMb'] = rss_mb()
+    return result
+
+
+def run(sizes=DEFAULT_SIZES, queries=2000, limit=30, seed=7, work_dir=DEFAULT_WORK_DIR):
+    """크기마다 새 프로세스에서 run_size 를 실행해 결과 목록 반환"""
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    for rows in sizes:
+        output = subprocess.run(
+            [sys.executable, __file__, '--_child', str(rows), '--queries', str(queries),
+             '--limit', str(limit), '--seed', str(seed), '--work-dir', work_dir],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def print_report(results):
+    for result in results:
+        print(f"{result['rows']:>9,} 행  로드 {result['loadSeconds']:.2f}s  RSS {result['rssMb']} MB")
+        for name, stats in result['searches'].items():
+            print(f"  {name:<14} p50 {stats['p50Ms']:>8.3f}ms  p95 {stats['p95Ms']:>8.3f}ms  "
+                  f"p99 {stats['p99Ms']:>8.3f}ms  {stats['rps']:>10,.0f} q/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='합성 마스터/캐시를 둘 디렉터리')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--_child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._child:
+        print(json.dumps(run_size(args._child, args.queries, args.limit, args.seed, args.work_dir)))
+        sys.exit(0)
+
+    results = run([int(size) for size in args.sizes.split(',')], args.queries, args.limit,
+                  args.seed, args.work_dir)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results)
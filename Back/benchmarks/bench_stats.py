@@ -0,0 +1,89 @@
+"""
+벤치마크 공통 도우미 (지연 시간 분위수 요약, 프로세스 RSS/메모리 구성)
+"""
+import os
+import statistics
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, seconds, digits=3):
+    """초 단위 지연 시간 목록을 count/rps/p50/p95/p99/mean(ms) 요약으로 변환"""
+    values = sorted(latencies)
+    ms = lambda v: round(v * 1000, digits)  # noqa: E731
+    return {
+        'count': len(values),
+        'rps': round(len(values) / seconds, 1) if seconds > 0 else None,
+        'p50Ms': ms(percentile(values, 0.50)),
+        'p95Ms': ms(percentile(values, 0.95)),
+        'p99Ms': ms(percentile(values, 0.99)),
+        'meanMs': ms(statistics.fmean(values)) if values else 0.0,
+    }
+
+
+def _rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_mb(pid=None, include_children=False):
+    """프로세스 RSS (MB, Linux 전용, 읽을 수 없으면 None)
+
+    include_children=True 면 자식 프로세스(prefork 워커 등)까지 합산한다.
+    fork 로 공유하는 페이지도 프로세스마다 따로 세므로 실제 사용량보다 크게 나올 수 있다.
+    """
+    pid = pid or os.getpid()
+    pids = [pid]
+    if include_children:
+        for parent in pids:
+            pids.extend(_children(parent))
+    total = sum(_rss_kb(p) for p in pids)
+    return round(total / 1024, 1) if total else None
+
+
+def memory_mb(pid=None):
+    """프로세스 메모리 구성 (MB, Linux 전용, 읽을 수 없으면 빈 dict)
+
+    rss: 전체 상주 메모리, anon/file: 힙 등 익명 페이지와 memory-map 한 파일 페이지,
+    pss: 공유 페이지를 공유하는 프로세스 수로 나눠 센 값, private: 이 프로세스만 가진 페이지
+    """
+    pid = pid or os.getpid()
+    fields = {}
+    for name in (f'/proc/{pid}/status', f'/proc/{pid}/smaps_rollup'):
+        try:
+            with open(name) as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    parts = value.split()
+                    if len(parts) == 2 and parts[1] == 'kB':
+                        fields[key] = int(parts[0])
+        except OSError:
+            pass
+    if 'VmRSS' not in fields:
+        return {}
+    mb = lambda kb: round(kb / 1024, 1)  # noqa: E731
+    result = {'rss': mb(fields['VmRSS']), 'anon': mb(fields.get('RssAnon', 0)),
+              'file': mb(fields.get('RssFile', 0))}
+    if 'Pss' in fields:
+        result['pss'] = mb(fields['Pss'])
+        result['private'] = mb(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0))
+    return result
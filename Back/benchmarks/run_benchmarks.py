@@ -0,0 +1,163 @@
+"""
+벤치마크 일괄 실행 + 기준값(baseline) 비교
+
+검색 마이크로 벤치마크(bench_search.py), 리밸런싱 계획 벤치마크(bench_rebalance.py)와
+종단간 부하 시나리오(bench_e2e.py)를 정해진
+설정(profile)으로 실행하고, 결과를 평탄화한 지표(예: search.100000.kr_prefix.p99Ms)로 저장한다.
+
+    --save-baseline   결과를 baseline.json 으로 저장 (기준값 갱신)
+    --check           baseline.json 과 비교해 허용 범위를 넘게 나빠진 지표가 있으면 종료 코드 1
+
+지연 시간/로드 시간/RSS 는 커질수록, RPS 는 작아질수록 나빠진 것으로 본다.
+측정값은 머신에 따라 크게 다르므로 기준값은 CI 와 같은 환경에서 --save-baseline 으로 만든다.
+
+사용법:
+    python Back/benchmarks/run_benchmarks.py [--profile ci|full] [--check] [--save-baseline]
+        [--tolerance 0.5] [--output results.json]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+
+import bench_e2e
+import bench_rebalance
+import bench_search
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+PROFILES = {
+    # CI 용: 몇 분 안에 끝나는 크기
+    'ci': {'sizes': (10000, 100000), 'queries': 1000, 'rows': 10000, 'users': 50,
+           'assets': (5, 20, 100, 500), 'portfolios': (1000,)},
+    # 전체: 100만 행 마스터와 더 많은 동시 사용자 (메모리 수 GB 필요)
+    'full': {'sizes': (10000, 100000, 1000000), 'queries': 2000, 'rows': 100000, 'users': 200,
+             'assets': (5, 20, 100, 500), 'portfolios': (1000, 10000)},
+}
+
+# 지표 이름 끝부분 → (나빠지는 방향, 무시할 절대 변화량)
+# 분위수 지연은 아주 작은 값에서 상대 변화가 크게 흔들리므로 절대 변화량 하한을 둔다
+DIRECTIONS = (
+    ('Ms', 'higher', 1.0),
+    ('Seconds', 'higher', 0.5),
+    ('rssMb', 'higher', 10),
+    ('rps', 'lower', 0),
+    ('errors', 'higher', 0),
+)
+
+# 비교하지 않는 지표 (실행 시간 합계, 유휴 RSS 등 설정/환경에 따라 달라지는 값)
+# 마이크로 벤치마크의 처리량은 분위수 지연과 중복이고 호출 하나가 수 us 라 잡음이 커서 제외
+IGNORED = ('*.seconds', '*.baseRssMb', '*.rssIdleMb', '*.cacheHitRatio', '*.count', '*.meanMs',
+           'search.*.rps', 'rebalance.single.*.rps', 'rebalance.batch.*.loopSeconds')
+
+
+def flatten(value, prefix=''):
+    """중첩 dict 를 '.' 로 이은 숫자 지표 dict 로 변환"""
+    metrics = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            metrics.update(flatten(item, f'{prefix}.{key}' if prefix else str(key)))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        metrics[prefix] = value
+    return metrics
+
+
+def run(profile):
+    settings = PROFILES[profile]
+    started = time.perf_counter()
+    search = bench_search.run(settings['sizes'], settings['queries'])
+    rebalance = bench_rebalance.run(settings['assets'], settings['portfolios'])
+    e2e = bench_e2e.run(rows=settings['rows'], users=settings['users'])
+    return {
+        'profile': profile,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'elapsedSeconds': round(time.perf_counter() - started, 1),
+        'metrics': flatten({
+            'search': {str(result.pop('rows')): result for result in search},
+            'rebalance': rebalance,
+            'e2e': e2e,
+        }),
+    }
+
+
+def direction(name):
+    if any(fnmatch.fnmatchcase(name, pattern) for pattern in IGNORED):
+        return None
+    leaf = name.rsplit('.', 1)[-1]
+    for suffix, worse, floor in DIRECTIONS:
+        if leaf.endswith(suffix):
+            return worse, floor
+    return None
+
+
+def compare(baseline, current, tolerance):
+    """허용 범위(tolerance, 상대값)를 넘게 나빠진 지표 목록 [(이름, 기준값, 현재값, 변화율)]"""
+    regressions = []
+    for name, base in baseline['metrics'].items():
+        rule = direction(name)
+        value = current['metrics'].get(name)
+        if rule is None or value is None:
+            continue
+        worse, floor = rule
+        delta = value - base if worse == 'higher' else base - value
+        if delta <= floor:
+            continue
+        if base == 0 or delta / abs(base) > tolerance:
+            regressions.append((name, base, value, delta / abs(base) if base else None))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='ci')
+    parser.add_argument('--check', action='store_true', help='baseline.json 과 비교')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 baseline.json 으로 저장')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='허용하는 상대 악화 비율 (0.5 = 50%%)')
+    parser.add_argument('--output', help='이번 결과를 저장할 JSON 경로')
+    args = parser.parse_args(argv)
+
+    current = run(args.profile)
+    for name, value in current['metrics'].items():
+        print(f'{name:<48} {value}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    status = 0
+    if args.check:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('profile') != current['profile']:
+            print(f"기준값 profile({baseline.get('profile')})이 이번 실행({current['profile']})과 다릅니다.")
+            return 2
+        regressions = compare(baseline, current, args.tolerance)
+        if regressions:
+            print(f'\n성능 저하 {len(regressions)}건 (허용 {args.tolerance:.0%}):')
+            for name, base, value, ratio in regressions:
+                change = f'{ratio:+.0%}' if ratio is not None else 'new'
+                print(f'  {name:<46} {base} -> {value} ({change})')
+            status = 1
+        else:
+            print(f'\n기준값 대비 성능 저하 없음 (허용 {args.tolerance:.0%})')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f'기준값 저장: {args.baseline}')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+벤치마크용 합성 주식 마스터 생성기
+
+실제 KR_Stock_Master.csv / US_Stock_Master.csv 와 같은 컬럼 구성으로 N 행짜리 CSV 를 만든다.
+종목명은 실제 종목명 분포를 흉내 내도록 음절/단어 조합으로 만들고, 종목코드는 중복 없이 뽑는다.
+같은 seed 면 항상 같은 파일이 만들어지므로 벤치마크 결과끼리 비교할 수 있다.
+
+사용법:
+    python Back/benchmarks/synthetic_master.py --rows 100000 --out /tmp/masters [--seed 7]
+"""
+import argparse
+import csv
+import os
+import random
+import string
+
+KR_HEADER = ['', 'Code', 'ISU_CD', 'Name', 'Market', 'Dept', 'Close', 'ChangeCode', 'Changes',
+             'ChagesRatio', 'Open', 'High', 'Low', 'Volume', 'Amount', 'Marcap', 'Stocks', 'MarketId']
+US_HEADER = ['ACT Symbol', 'Company Name']
+
+KR_SYLLABLES = ('삼', '성', '전', '자', '현', '대', '기', '아', '한', '국', '엘', '지', '에', '스', '케',
+                '이', '카', '오', '네', '셀', '트', '리', '온', '바', '신', '동', '원', '진', '화', '금',
+                '미', '래', '코', '롯', '데', '포', '효', '세', '광', '명', '우', '제', '일', '알', '텍')
+KR_PREFIXES = ('', '', '', 'SK', 'LG', 'KB', 'HD', 'CJ', 'GS', 'DB', 'LS', 'NH')
+KR_SUFFIXES = ('', '', '전자', '바이오', '화학', '홀딩스', '제약', '건설', '증권', '금융지주', '엔터',
+               '반도체', '에너지', '솔루션', '테크', '중공업', '우', '스팩1호')
+KR_MARKETS = (('KOSPI', 'STK'), ('KOSDAQ', 'KSQ'), ('KONEX', 'KNX'))
+
+US_ONSETS = ('b', 'c', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'z',
+             'br', 'cl', 'gr', 'st', 'tr')
+US_VOWELS = ('a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'io')
+US_WORDS = ('Global', 'Capital', 'Holdings', 'Energy', 'Therapeutics', 'Systems', 'Bancorp',
+            'Technologies', 'Pharmaceuticals', 'Realty', 'Acquisition', 'Financial', 'Semiconductor')
+US_SUFFIXES = ('Inc. Common Stock', 'Corporation Common Stock', 'Ltd. Ordinary Shares',
+               'Class A Common Stock', 'ETF', 'Trust', 'Warrant')
+
+
+def kr_name(rng):
+    body = ''.join(rng.choice(KR_SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return rng.choice(KR_PREFIXES) + body + rng.choice(KR_SUFFIXES)
+
+
+def us_word(rng):
+    word = ''.join(rng.choice(US_ONSETS) + rng.choice(US_VOWELS) for _ in range(rng.randint(1, 3)))
+    return word.capitalize()
+
+
+def us_name(rng):
+    words = [us_word(rng)]
+    if rng.random() < 0.6:
+        words.append(rng.choice(US_WORDS) if rng.random() < 0.7 else us_word(rng))
+    words.append(rng.choice(US_SUFFIXES))
+    return ' '.join(words)
+
+
+def kr_codes(rng, rows):
+    """중복 없는 숫자 종목코드 (6자리, 행이 많으면 자릿수를 늘린다)"""
+    width = max(6, len(str(rows - 1)))
+    return [f'{code:0{width}d}' for code in rng.sample(range(10 ** width), rows)]
+
+
+def us_symbols(rng, rows):
+    """중복 없는 1~5 글자 대문자 티커 (bijective base-26)"""
+    letters = string.ascii_uppercase
+    symbols = []
+    for value in rng.sample(range(sum(26 ** k for k in range(1, 6))), rows):
+        symbol = []
+        value += 1
+        while value:
+            value, digit = divmod(value - 1, 26)
+            symbol.append(letters[digit])
+        symbols.append(''.join(reversed(symbol)))
+    return symbols
+
+
+def write_kr_master(path, rows, seed=7):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(KR_HEADER)
+        for i, code in enumerate(kr_codes(rng, rows)):
+            market, market_id = rng.choice(KR_MARKETS)
+            close = rng.randint(100, 500000)
+            change = rng.randint(-close // 10, close // 10)
+            stocks = rng.randint(10 ** 5, 6 * 10 ** 9)
+            volume = rng.randint(0, 10 ** 7)
+            writer.writerow([
+                i, code, f'KR7{code[-6:]}00{i % 10}', kr_name(rng), market, '', close,
+                1 if change > 0 else (2 if change < 0 else 3), change, round(change / close * 100, 2),
+                close - change, close + abs(change), close - abs(change), volume, volume * close,
+                # 시가총액은 실제 분포처럼 한쪽으로 길게 늘어지게 (로그 정규)
+                int(rng.lognormvariate(25, 1.8)), stocks, market_id,
+            ])
+
+
+def write_us_master(path, rows, seed=7):
+    rng = random.Random(seed + 1)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(US_HEADER)
+        for symbol in us_symbols(rng, rows):
+            writer.writerow([symbol, us_name(rng)])
+
+
+def write_masters(directory, rows, seed=7):
+    """directory 에 KR/US 합성 마스터를 만들고 (kr_path, us_path) 반환 (이미 있으면 재사용)"""
+    os.makedirs(directory, exist_ok=True)
+    kr_path = os.path.join(directory, f'KR_Stock_Master_{rows}_{seed}.csv')
+    us_path = os.path.join(directory, f'US_Stock_Master_{rows}_{seed}.csv')
+    if not os.path.exists(kr_path):
+        write_kr_master(kr_path + '.tmp', rows, seed)
+        os.replace(kr_path + '.tmp', kr_path)
+    if not os.path.exists(us_path):
+        write_us_master(us_path + '.tmp', rows, seed)
+        os.replace(us_path + '.tmp', us_path)
+    return kr_path, us_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--out', default='.')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    for path in write_masters(args.out, args.rows, args.seed):
+        print(path)
@@ -0,0 +1,36 @@
+"""
+최근 처리 시간 분위수 기록 (검색 서버 / CODEF 게이트웨이 공용)
+
+LatencyRecorder 는 최근 N건의 처리 시간을 보관하고 p50/p99 를 계산한다.
+고정 크기 링 버퍼라서 요청 수가 늘어도 기록 비용과 메모리가 일정하다.
+"""
+import threading
+from collections import deque
+
+
+class LatencyRecorder:
+    """최근 N건의 처리 시간을 보관하고 p50/p99 를 계산 (스레드 안전)"""
+
+    def __init__(self, size=2048):
+        self._samples = deque(maxlen=size)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+
+        if not samples:
+            return {'count': count, 'p50Ms': None, 'p99Ms': None}
+
+        def percentile(p):
+            idx = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+            return round(samples[idx] * 1000, 3)
+
+        return {'count': count, 'p50Ms': percentile(50), 'p99Ms': percentile(99)}
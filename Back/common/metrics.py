@@ -0,0 +1,231 @@
+"""
+경량 Prometheus 지표 (검색 서버 / CODEF 게이트웨이 공용)
+
+- Counter/Histogram 은 요청 처리 경로에서 잠금 한 번과 덧셈만 하고, 텍스트 변환은 /metrics 조회 때만 한다
+- 캐시 적중 수나 인덱스 로드 시간처럼 다른 객체가 이미 세고 있는 값은 조회 시점에 콜백(Callback)으로 읽는다
+- MetricsMiddleware(ASGI) 와 install_flask 가 라우트별 처리 시간 히스토그램을 기록한다
+- 멀티 워커로 띄우면 워커마다 따로 집계하므로 /metrics 는 응답한 워커 하나의 값이다
+
+외부 라이브러리(prometheus_client) 없이 text exposition format 0.0.4 로 출력한다.
+"""
+import bisect
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 처리 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 등록된 라우트와 맞지 않는 요청의 route 라벨 (임의 경로로 시계열이 늘어나지 않도록 하나로 묶음)
+UNMATCHED_ROUTE = 'unmatched'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터 (라벨 값 튜플별)"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """누적 구간 히스토그램 (라벨 값 튜플별 구간 개수 + 합계)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        # 구간별 개수는 누적하지 않고 저장해 기록 비용을 O(log 구간 수) 로 유지 (누적은 출력할 때)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for label_values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield self.name + '_bucket', _format_labels(self.labels, label_values, le), cumulative
+            labels = _format_labels(self.labels, label_values)
+            yield self.name + '_sum', labels, total
+            yield self.name + '_count', labels, cumulative
+
+
+class Callback:
+    """조회 시점에 fn() 을 호출해 값을 읽는 지표
+
+    fn 은 숫자 하나, 또는 {라벨 값 튜플: 숫자} dict 를 반환한다 (None 인 값은 출력하지 않음).
+    다른 객체가 이미 세고 있는 누적값은 kind='counter' 로 등록한다.
+    """
+
+    def __init__(self, name, help, fn, labels=(), kind='gauge'):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labels = tuple(labels)
+        self.kind = kind
+
+    def samples(self):
+        value = self.fn()
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for label_values, item in items:
+            if item is not None:
+                yield self.name, _format_labels(self.labels, label_values), item
+
+
+class Registry:
+    """지표 모음과 text exposition 출력"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self.register(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def callback(self, name, help, fn, labels=(), kind='gauge'):
+        return self.register(Callback(name, help, fn, labels, kind))
+
+    def render(self):
+        """전체 지표를 Prometheus 텍스트 형식(bytes)으로 변환"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception:
+                # 콜백 하나가 실패해도 나머지 지표는 내보낸다
+                continue
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{name}{labels} {_format_value(value)}' for name, labels, value in samples)
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+# 프로세스 기본 레지스트리
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', '라우트별 HTTP 요청 처리 시간', ('method', 'route', 'status')
+)
+
+
+def _record_request(method, route, status, seconds, access_log):
+    REQUEST_DURATION.observe(seconds, method, route, str(status))
+    if access_log is not None:
+        access_log.request(method, route, status, seconds)
+
+
+class MetricsMiddleware:
+    """라우트별 처리 시간을 기록하는 ASGI 미들웨어 (FastAPI/Starlette)
+
+    route 라벨은 실제 경로가 아니라 라우트 템플릿(/api/stocks/{id} 등)을 사용한다.
+    access_log 에 service_log.AccessLog 를 주면 표본 추출한 요청 로그도 남긴다.
+    """
+
+    def __init__(self, app, access_log=None):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 라우터가 같은 scope 에 일치한 라우트를 기록해 둔다
+            route = scope.get('route')
+            _record_request(
+                scope['method'], getattr(route, 'path', UNMATCHED_ROUTE), status,
+                time.perf_counter() - started, self.access_log,
+            )
+
+
+def install_flask(app, access_log=None, registry=REGISTRY, path='/metrics'):
+    """Flask 앱에 처리 시간 기록 훅과 /metrics 엔드포인트를 추가"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+            _record_request(request.method, route, response.status_code,
+                            time.perf_counter() - started, access_log)
+        return response
+
+    app.add_url_rule(path, 'metrics', lambda: Response(registry.render(), content_type=CONTENT_TYPE))
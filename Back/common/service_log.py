@@ -0,0 +1,135 @@
+"""
+구조화(JSON 한 줄) 로그 + 비동기 출력 + 표본 추출 (검색 서버 / CODEF 게이트웨이 공용)
+
+- 요청 처리 스레드는 크기 제한이 있는 큐에 레코드를 넣기만 하고, 포맷과 출력은 별도 스레드가 한다
+  (큐가 가득 차면 기다리지 않고 버린 뒤 개수만 센다)
+- 요청 로그(AccessLog)는 LOG_SAMPLE_RATE 비율만 남기고, LOG_SLOW_SECONDS 보다 느린 요청과 5xx 는 항상 남긴다
+- 요청 본문/헤더/토큰은 로그에 남기지 않는다
+
+환경변수: LOG_LEVEL(INFO), LOG_SAMPLE_RATE(0.01), LOG_SLOW_SECONDS(1.0), LOG_QUEUE_SIZE(10000)
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', '0.01'))
+LOG_SLOW_SECONDS = float(os.getenv('LOG_SLOW_SECONDS', '1.0'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+# 요청마다 INFO 로그를 남기는 라이브러리 (AccessLog 와 중복되므로 경고 이상만 남김)
+NOISY_LOGGERS = ('httpx', 'httpcore', 'urllib3', 'werkzeug')
+
+_handler = None
+_listener = None
+
+
+class JSONFormatter(logging.Formatter):
+    """레코드 하나를 JSON 한 줄로 (extra={'fields': {...}} 의 값은 최상위 키로 합침)"""
+
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'service': self.service,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버리는 QueueHandler"""
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # 메시지 조립과 traceback 문자열화만 호출한 스레드에서 하고 JSON 변환은 출력 스레드로 미룬다
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _start_listener(output):
+    global _listener
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # fork 된 워커에는 부모의 출력 스레드가 없으므로 새 큐와 스레드를 만든다
+    if _listener is not None:
+        _start_listener(_listener.handlers[0])
+
+
+def _stop():
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logging(service, level=LOG_LEVEL):
+    """루트 로거를 JSON + 비동기 출력으로 설정하고 service 이름의 로거 반환 (여러 번 불러도 한 번만 설정)"""
+    global _handler
+    if _handler is None:
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(JSONFormatter(service))
+        _handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _start_listener(output)
+
+        root = logging.getLogger()
+        root.handlers[:] = [_handler]
+        root.setLevel(level)
+        for name in NOISY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        atexit.register(_stop)
+    return logging.getLogger(service)
+
+
+def dropped_count():
+    """큐가 가득 차 버린 로그 레코드 수"""
+    return _handler.dropped if _handler is not None else 0
+
+
+class AccessLog:
+    """표본 추출 요청 로그 (느린 요청과 5xx 는 항상 기록)"""
+
+    def __init__(self, logger, sample_rate=LOG_SAMPLE_RATE, slow_seconds=LOG_SLOW_SECONDS):
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+
+    def request(self, method, route, status, seconds):
+        slow = seconds >= self.slow_seconds
+        if status < 500 and not slow and random.random() >= self.sample_rate:
+            return
+        level = logging.WARNING if status >= 500 or slow else logging.INFO
+        self.logger.log(level, 'request', extra={'fields': {
+            'method': method, 'route': route, 'status': status, 'ms': round(seconds * 1000, 2),
+        }})
@@ -36,13 +36,13 @@ export const getAccountBalance = async (params: BalanceRequestParams): Promise<B
           return {
             name: item.resItemName || '알 수 없음',
             price: item.resPresentAmt || '0',
-            amount: item.resValuationAmt || '0',
-            quantity: item.resQuantity || '0',
-            availableQuantity: item.resQuantity || '0',
+            amount: String(item.resValuationAmt || '0'),
+            quantity: String(item.resQuantity || '0'),
+            availableQuantity: String(item.resQuantity || '0'),
             isForeign,
             currency,
             originalPrice: currency === 'USD' ? item.resPresentAmt : undefined,
-            originalAmount: currency === 'USD' ? item.resValuationAmt : undefined
+            originalAmount: currency === 'USD' ? String(item.resValuationAmt ?? '0') : undefined
           };
         });
       }
@@ -62,8 +62,9 @@ export const getAccountBalance = async (params: BalanceRequestParams): Promise<B
       return {
         accountNumber: apiData.resAccount || params.account,
         accountName: apiData.resAccountName || params.account,
-        totalAmount: apiData.rsTotAmt || apiData.rsTotValAmt || '0',
-        balance: apiData.resDepositReceived || apiData.resAccountBalance || '0',
+        // 잔고 API 는 금액/수량을 숫자로 보내므로 문자열 형식으로 맞춘다
+        totalAmount: String(apiData.rsTotAmt || apiData.rsTotValAmt || '0'),
+        balance: String(apiData.resDepositReceived || apiData.resAccountBalance || '0'),
         stocks,
         usdBalance: apiData.resUSDBalance || '0'
       };
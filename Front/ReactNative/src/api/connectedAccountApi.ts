@@ -222,10 +222,10 @@ export const getStockBalance = async (
       if (apiData.resItemList) {
         stocks = (apiData.resItemList || []).map((item: any) => ({
           name: item.resIsName || item.resName || '알 수 없음',
-          price: item.resPrice || item.resCurrentPrice || '0',
-          quantity: item.resQuantity || '0',
-          amount: item.resAmount || item.rsCurValAmt || '0',
-          availableQuantity: item.resAvailQuantity || item.resQuantity || '0'
+          price: String(item.resPrice || item.resCurrentPrice || '0'),
+          quantity: String(item.resQuantity || '0'),
+          amount: String(item.resAmount || item.rsCurValAmt || '0'),
+          availableQuantity: String(item.resAvailQuantity || item.resQuantity || '0')
         }));
       } 
       // 삼성증권 등 다른 형식의 경우 - resAccountStock이 있으면 변환
@@ -243,8 +243,9 @@ export const getStockBalance = async (
       return {
         accountNumber: apiData.resAccount || account,
         accountName: apiData.resAccount || apiData.resAccountName || account,
-        totalAmount: apiData.rsTotAmt || apiData.rsTotValAmt || apiData.resAccountTotalAmt || '0',
-        balance: apiData.resDepositReceived || apiData.resAccountBalance || '0',
+        // 잔고 API 는 금액/수량을 숫자로 보내므로 BalanceInfo 의 문자열 형식으로 맞춘다
+        totalAmount: String(apiData.rsTotAmt || apiData.rsTotValAmt || apiData.resAccountTotalAmt || '0'),
+        balance: String(apiData.resDepositReceived || apiData.resAccountBalance || '0'),
         stocks
       };
     } else {
@@ -100,6 +100,11 @@ interface MyStockAccountComponentProps {
   theme: Theme;
 }
 
+// 금액/수량 값을 숫자로 변환
+// (잔고 API 는 숫자로 보내고, 이전 응답이나 직접 만든 값은 "1,250,000" 같은 문자열일 수 있음)
+const parseAmount = (value: string | number | null | undefined): number =>
+  typeof value === 'number' ? value : parseFloat((value || '0').replace(/,/g, ''));
+
 // 컴포넌트 정의
 const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React.ReactElement => {
   const insets = useSafeAreaInsets();
@@ -633,9 +638,10 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
             
             // API 응답에서 확인된 정확한 필드명 사용
             const itemName = item.resIsName || item.resItemName || '알 수 없음';
-            const itemPrice = item.resPrice || item.resPresentAmt || '0';
-            const itemQuantity = item.resQuantity || '0';
-            const itemAmount = item.resAmount || item.resValuationAmt || '0';
+            // 잔고 API 는 금액/수량을 숫자로 보내므로 화면에서 쓰는 문자열 형식으로 맞춘다
+            const itemPrice = String(item.resPrice || item.resPresentAmt || '0');
+            const itemQuantity = String(item.resQuantity || '0');
+            const itemAmount = String(item.resAmount || item.resValuationAmt || '0');
               
             // 해외 주식인 경우 확인 (resAccountCurrency 필드 활용)
             const isForeign = 
@@ -671,7 +677,7 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
               price: convertedPrice,
               quantity: itemQuantity,
               amount: convertedAmount,
-              availableQuantity: item.resQuantity || '0',
+              availableQuantity: String(item.resQuantity || '0'),
               isForeign: isForeign,
               currency: currency,
               originalPrice: currency === 'USD' ? itemPrice : undefined,
@@ -705,8 +711,8 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
         const balance = {
           accountNumber: apiData.resAccount || accountNumber,
           accountName: apiData.resAccount || apiData.resAccountName || accountNumber,
-          totalAmount: apiData.rsTotAmt || apiData.rsTotValAmt || apiData.resAccountTotalAmt || '0',
-          balance: apiData.resDepositReceivedD2 || apiData.resDepositReceived || apiData.resAccountBalance || '0',
+          totalAmount: String(apiData.rsTotAmt || apiData.rsTotValAmt || apiData.resAccountTotalAmt || '0'),
+          balance: String(apiData.resDepositReceivedD2 || apiData.resDepositReceived || apiData.resAccountBalance || '0'),
           stocks
         };
         
@@ -779,7 +785,7 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
   const totalValue = useMemo(() => {
     if (!selectedBalanceInfo) return 0;
     // 콤마 제거 후 숫자로 변환
-    return parseFloat((selectedBalanceInfo.totalAmount || '0').replace(/,/g, ''));
+    return parseAmount(selectedBalanceInfo.totalAmount);
   }, [selectedBalanceInfo]);
 
   const totalValueUSD = useMemo(() => {
@@ -796,8 +802,8 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
     const stocks = selectedBalanceInfo.stocks as EnhancedStockItem[];
     let stockData: StockData[] = stocks.map(stock => {
       const stockValue = stock.currency === 'USD' 
-        ? parseFloat((stock.amount || '0').replace(/,/g, '')) * exchangeRate
-        : parseFloat((stock.amount || '0').replace(/,/g, ''));
+        ? parseAmount(stock.amount) * exchangeRate
+        : parseAmount(stock.amount);
       
       return {
         name: stock.name,
@@ -813,7 +819,7 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
     });
     
     // 원화 현금 자산 추가 (예수금)
-    if (selectedBalanceInfo.balance && parseFloat((selectedBalanceInfo.balance || '0').replace(/,/g, '')) > 0) {
+    if (selectedBalanceInfo.balance && parseAmount(selectedBalanceInfo.balance) > 0) {
       stockData.push({
         name: '원화 현금 (예수금)',
         price: '0',
@@ -845,7 +851,7 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
     }
     
     // 총 자산 가치 계산 (원화 기준)
-    const totalValue: number = stockData.reduce((total, stock) => total + parseFloat((stock.amount || '0').replace(/,/g, '')), 0);
+    const totalValue: number = stockData.reduce((total, stock) => total + parseAmount(stock.amount), 0);
   
     // 색상 배열 정의
     const colors: string[] = [
@@ -871,9 +877,9 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
     return stockData
       .map(stock => ({
         ...stock,
-        value: parseFloat((stock.amount || '0').replace(/,/g, '')),
-        ratio: parseFloat(((parseFloat((stock.amount || '0').replace(/,/g, '')) / totalValue) * 100).toFixed(1)),
-        valueUSD: stock.currency === 'USD' ? parseFloat((stock.originalAmount || stock.amount || '0').replace(/,/g, '')) : undefined
+        value: parseAmount(stock.amount),
+        ratio: parseFloat(((parseAmount(stock.amount) / totalValue) * 100).toFixed(1)),
+        valueUSD: stock.currency === 'USD' ? parseAmount(stock.originalAmount || stock.amount) : undefined
       }))
       .sort((a, b) => b.ratio - a.ratio)
       .map((stock, index) => ({
@@ -979,7 +985,7 @@ const MyStockAccountComponent = ({ theme }: MyStockAccountComponentProps): React
         {/* 보유 종목 리스트 - 통화 형식에 맞게 표시 */}
         <View style={styles.stockList}>
           {stocksWithRatioAndColor
-            .filter(stock => parseFloat((stock.amount || '0').replace(/,/g, '')) > 0)
+            .filter(stock => parseAmount(stock.amount) > 0)
             .map((stock, index) => (
               <View key={index} style={styles.stockItemContainer}>
                 <View style={[styles.colorIndicator, { backgroundColor: stock.color }]} />